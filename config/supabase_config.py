@@ -14,9 +14,17 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 
 # Table names
 COINS_TABLE = "coins"
+QUEUE_TABLE = "tweet_queue"
+DEAD_LETTER_TABLE = "dead_letter"
+PENDING_IMAGES_VIEW = "pending_image_syncs"
 
 # Status values
 STATUS_PENDING = "pending"
 STATUS_PROCESSING = "processing"
 STATUS_COMPLETED = "completed"
-STATUS_FAILED = "failed"
\ No newline at end of file
+STATUS_FAILED = "failed"
+
+# Retry scheduling (exponential backoff with jitter, then dead letter)
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+RETRY_DELAY = int(os.getenv("RETRY_DELAY", "30"))  # Base delay in seconds
+RETRY_MAX_DELAY = int(os.getenv("RETRY_MAX_DELAY", "3600"))  # Backoff cap in seconds
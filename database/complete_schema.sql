@@ -35,8 +35,22 @@ CREATE TABLE IF NOT EXISTS coins (
     -- Profile image support
     profile_image_url VARCHAR(500),
     
-    -- Timestamps
+    -- Perceptual hash ('dhash:<hex>'/'phash:<hex>') and the near duplicate it matched
+    image_hash VARCHAR(24),
+    duplicate_of UUID,
+    
+    -- Downloaded vs normalized (re-encoded JPEG) image size in bytes
+    image_original_bytes INTEGER,
+    image_bytes INTEGER,
+    
+    -- Retry scheduling
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW()),
+    last_error TEXT,
+    
+    -- Timestamps (processing_started_at: when automation claimed the coin, set by trigger)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW()),
+    processing_started_at TIMESTAMP WITH TIME ZONE,
     processed_at TIMESTAMP WITH TIME ZONE,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW())
 );
@@ -59,6 +73,9 @@ CREATE TABLE IF NOT EXISTS tweet_queue (
     followers_count INTEGER DEFAULT 0,
     status VARCHAR(20) DEFAULT 'queued' CHECK (status IN ('queued', 'processing', 'completed', 'failed', 'rejected')),
     error_message TEXT,
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW()),
+    last_error TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW()),
     processed_at TIMESTAMP WITH TIME ZONE
 );
@@ -96,6 +113,21 @@ CREATE TABLE IF NOT EXISTS twitter_reply_queue (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+-- --------------------------------
+-- 1.5 DEAD LETTER TABLE
+-- --------------------------------
+-- Rows that exhausted their retry attempts (inspect/requeue via scripts/dead_letter.py)
+CREATE TABLE IF NOT EXISTS dead_letter (
+    id SERIAL PRIMARY KEY,
+    source_table VARCHAR(50) NOT NULL,
+    source_id UUID NOT NULL,
+    payload JSONB NOT NULL,
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    failed_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW()),
+    requeued_at TIMESTAMP WITH TIME ZONE
+);
+
 -- ================================================
 -- SECTION 2: INDEXES
 -- ================================================
@@ -104,11 +136,19 @@ CREATE TABLE IF NOT EXISTS twitter_reply_queue (
 CREATE INDEX IF NOT EXISTS idx_coins_status ON coins(status);
 CREATE INDEX IF NOT EXISTS idx_coins_created_at ON coins(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_coins_image_synced ON coins(image_synced);
+CREATE INDEX IF NOT EXISTS idx_coins_status_next_attempt ON coins(status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_coins_pending_images ON coins(created_at)
+    WHERE image_url IS NOT NULL AND image_synced = FALSE AND status = 'pending';
 
 -- Tweet queue indexes
 CREATE INDEX IF NOT EXISTS idx_tweet_queue_status ON tweet_queue(status);
 CREATE INDEX IF NOT EXISTS idx_tweet_queue_created ON tweet_queue(created_at);
 CREATE INDEX IF NOT EXISTS idx_tweet_queue_tweet_id ON tweet_queue(tweet_id);
+CREATE INDEX IF NOT EXISTS idx_tweet_queue_status_next_attempt ON tweet_queue(status, next_attempt_at);
+
+-- Dead letter indexes
+CREATE INDEX IF NOT EXISTS idx_dead_letter_source ON dead_letter(source_table, source_id);
+CREATE INDEX IF NOT EXISTS idx_dead_letter_pending ON dead_letter(failed_at DESC) WHERE requeued_at IS NULL;
 
 -- Twitter reply queue indexes
 CREATE INDEX IF NOT EXISTS idx_reply_queue_status ON twitter_reply_queue(status);
@@ -120,7 +160,8 @@ CREATE INDEX IF NOT EXISTS idx_reply_queue_scheduled ON twitter_reply_queue(sche
 
 -- View for pending image syncs
 CREATE OR REPLACE VIEW pending_image_syncs AS
-SELECT id, ticker, name, image_url, image_filename, created_at
+SELECT id, ticker, name, image_url, image_filename, created_at,
+       twitter_user, twitter, website, attempts, next_attempt_at
 FROM coins
 WHERE image_url IS NOT NULL 
   AND image_synced = FALSE
@@ -189,7 +230,115 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- --------------------------------
--- 4.4 TRIGGERS
+-- 4.4 PROMOTE QUEUED TWEETS FUNCTION
+-- --------------------------------
+-- Move up to LEAST(free capacity, batch_size) due tweets from tweet_queue
+-- into coins in one transaction (called by the queue worker via RPC)
+CREATE OR REPLACE FUNCTION promote_queued_tweets(max_active INTEGER DEFAULT 1, batch_size INTEGER DEFAULT 50)
+RETURNS SETOF coins AS $$
+DECLARE
+    free_capacity INTEGER;
+BEGIN
+    -- Serialize promoters so concurrent workers can't both claim the same free capacity
+    PERFORM pg_advisory_xact_lock(hashtext('promote_queued_tweets'));
+    
+    -- Tweets whose ticker/website don't fit the narrower coins columns would
+    -- abort the whole batch insert (22001) - reject them instead
+    UPDATE tweet_queue
+    SET status = 'rejected',
+        error_message = 'Validation failed: ' || CASE
+            WHEN LENGTH(ticker) > 10 THEN 'ticker is ' || LENGTH(ticker) || ' characters (limit 10)'
+            ELSE 'website is ' || LENGTH(website) || ' characters (limit 255)'
+        END,
+        processed_at = NOW()
+    WHERE status = 'queued'
+      AND (LENGTH(ticker) > 10 OR LENGTH(website) > 255);
+    
+    -- Pending coins backing off from a failed attempt don't take capacity
+    SELECT max_active - COUNT(*) INTO free_capacity
+    FROM coins
+    WHERE status = 'processing'
+       OR (status = 'pending' AND (next_attempt_at IS NULL OR next_attempt_at <= NOW()));
+    
+    IF free_capacity <= 0 THEN
+        RETURN;
+    END IF;
+    
+    RETURN QUERY
+    WITH claimed AS (
+        SELECT id
+        FROM tweet_queue
+        WHERE status = 'queued'
+          AND next_attempt_at <= NOW()
+        ORDER BY created_at
+        LIMIT LEAST(free_capacity, batch_size)
+        FOR UPDATE SKIP LOCKED
+    ),
+    promoted AS (
+        UPDATE tweet_queue q
+        SET status = 'completed', processed_at = NOW()
+        FROM claimed
+        WHERE q.id = claimed.id
+        RETURNING q.*
+    )
+    INSERT INTO coins (ticker, name, description, website, twitter, twitter_user, tweet_id, image_url, image_synced, status)
+    SELECT ticker, name, description, website, twitter, twitter_user, tweet_id, image_url, FALSE, 'pending'
+    FROM promoted
+    ORDER BY created_at
+    RETURNING *;
+END;
+$$ LANGUAGE plpgsql;
+
+-- --------------------------------
+-- 4.5 APPLY COIN UPDATES FUNCTION
+-- --------------------------------
+-- Apply a batch of coalesced per-coin updates in one statement (write-behind
+-- flushes from the listener and photo sync). Each element is
+-- {"id": ..., <column>: <value>, ...}; columns an element omits keep their value
+CREATE OR REPLACE FUNCTION apply_coin_updates(updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE coins c SET
+        status = CASE WHEN u ? 'status' THEN u->>'status' ELSE c.status END,
+        error_message = CASE WHEN u ? 'error_message' THEN u->>'error_message' ELSE c.error_message END,
+        processed_at = CASE WHEN u ? 'processed_at' THEN (u->>'processed_at')::TIMESTAMPTZ ELSE c.processed_at END,
+        image_synced = CASE WHEN u ? 'image_synced' THEN (u->>'image_synced')::BOOLEAN ELSE c.image_synced END,
+        image_sync_timestamp = CASE WHEN u ? 'image_sync_timestamp' THEN (u->>'image_sync_timestamp')::TIMESTAMPTZ ELSE c.image_sync_timestamp END,
+        image_filename = CASE WHEN u ? 'image_filename' THEN u->>'image_filename' ELSE c.image_filename END,
+        image_hash = CASE WHEN u ? 'image_hash' THEN u->>'image_hash' ELSE c.image_hash END,
+        duplicate_of = CASE WHEN u ? 'duplicate_of' THEN (u->>'duplicate_of')::UUID ELSE c.duplicate_of END,
+        image_original_bytes = CASE WHEN u ? 'image_original_bytes' THEN (u->>'image_original_bytes')::INTEGER ELSE c.image_original_bytes END,
+        image_bytes = CASE WHEN u ? 'image_bytes' THEN (u->>'image_bytes')::INTEGER ELSE c.image_bytes END,
+        attempts = CASE WHEN u ? 'attempts' THEN (u->>'attempts')::INTEGER ELSE c.attempts END,
+        last_error = CASE WHEN u ? 'last_error' THEN u->>'last_error' ELSE c.last_error END,
+        updated_at = CASE WHEN u ? 'updated_at' THEN (u->>'updated_at')::TIMESTAMPTZ ELSE c.updated_at END
+    FROM jsonb_array_elements(updates) AS e(u)
+    WHERE c.id = (u->>'id')::UUID;
+    
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- --------------------------------
+-- 4.6 PROCESSING START FUNCTION
+-- --------------------------------
+-- Stamp processing_started_at whenever a coin is claimed for automation, so
+-- service time (processed_at - processing_started_at) excludes queueing
+CREATE OR REPLACE FUNCTION set_processing_started_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status = 'processing' AND OLD.status IS DISTINCT FROM 'processing' THEN
+        NEW.processing_started_at = TIMEZONE('utc', NOW());
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE 'plpgsql';
+
+-- --------------------------------
+-- 4.7 TRIGGERS
 -- --------------------------------
 
 -- Update timestamp trigger for coins table
@@ -198,6 +347,12 @@ CREATE TRIGGER update_coins_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Processing start trigger for coins table
+CREATE TRIGGER set_coins_processing_started_at 
+    BEFORE UPDATE ON coins
+    FOR EACH ROW 
+    EXECUTE FUNCTION set_processing_started_at();
+
 -- Update timestamp trigger for twitter_reply_queue table
 CREATE TRIGGER update_twitter_reply_queue_updated_at 
     BEFORE UPDATE ON twitter_reply_queue
@@ -223,6 +378,9 @@ CREATE POLICY "Enable all operations for all users" ON coins
 -- Enable Realtime for coins table
 ALTER PUBLICATION supabase_realtime ADD TABLE coins;
 
+-- Enable Realtime for tweet_queue (photo sync prefetches queued images on insert)
+ALTER PUBLICATION supabase_realtime ADD TABLE tweet_queue;
+
 -- ================================================
 -- SECTION 7: HELPER FUNCTIONS (OPTIONAL)
 -- ================================================
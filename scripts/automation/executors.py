@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Coin Creation Executors for Moonshot Automation
+One create_coin(coin) interface, backed by a single in-process backend or a
+pool of backend processes that each claim coins independently
+"""
+
+import os
+import sys
+import time
+import queue
+import random
+import multiprocessing
+from abc import ABC, abstractmethod
+
+# Add moonshot_automation root directory to path (go up 2 levels from scripts/automation/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+class NoHealthyExecutors(RuntimeError):
+    """Every backend in the pool has been dropped from rotation"""
+
+class CoinExecutor(ABC):
+    """Interface for automation backends"""
+
+    name = 'executor'
+
+    @abstractmethod
+    def create_coin(self, coin):
+        """Create a coin; return True on success (may raise on failure)"""
+
+    def close(self):
+        pass
+
+class MoonshotExecutor(CoinExecutor):
+    """Proprietary Moonshot UI automation, bound to one coordinates file/device"""
+
+    def __init__(self, name, coordinates_file, device=None):
+        from scripts.automation.moonshot_automation import MoonshotAutomation
+
+        self.name = name
+        self.automation = MoonshotAutomation(coordinates_file, device)
+
+    def create_coin(self, coin):
+        return self.automation.create_coin(coin)
+
+class FakeExecutor(CoinExecutor):
+    """Stand-in backend with configurable latency and failure rate"""
+
+    def __init__(self, name='fake', latency=1.0, failure_rate=0.0, jitter=0.1, seed=None):
+        self.name = name
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+    def create_coin(self, coin):
+        time.sleep(max(self.latency * (1 + self.random.uniform(-self.jitter, self.jitter)), 0))
+        if self.random.random() < self.failure_rate:
+            raise RuntimeError(f"{self.name}: simulated automation failure")
+        return True
+
+def build_executor(spec):
+    """Build an executor from a picklable spec dict ({'type': 'moonshot'|'fake', 'name': ..., ...})"""
+    options = {k: v for k, v in spec.items() if k != 'type'}
+    if spec['type'] == 'fake':
+        return FakeExecutor(**options)
+    if spec['type'] == 'moonshot':
+        return MoonshotExecutor(**options)
+    raise ValueError(f"Unknown executor type: {spec['type']}")
+
+def executor_specs_from_env(data_dir):
+    """Backend specs from EXECUTOR_* environment variables"""
+    backend = os.getenv('EXECUTOR_BACKEND', 'moonshot')
+    size = max(int(os.getenv('EXECUTOR_POOL_SIZE', '1')), 1)
+
+    if backend == 'fake':
+        latency = float(os.getenv('FAKE_EXECUTOR_LATENCY', '1'))
+        failure_rate = float(os.getenv('FAKE_EXECUTOR_FAILURE_RATE', '0'))
+        return [
+            {'type': 'fake', 'name': f'fake-{i}', 'latency': latency, 'failure_rate': failure_rate}
+            for i in range(size)
+        ]
+
+    # Each Moonshot backend needs its own coordinates file (and optionally device)
+    coordinates = [c for c in os.getenv('EXECUTOR_COORDINATES', '').split(',') if c]
+    if not coordinates:
+        coord_files = sorted(f for f in os.listdir(data_dir) if f.startswith('moonshot_coordinates_'))
+        coordinates = [os.path.join(data_dir, f) for f in coord_files[-size:]]
+    devices = [d for d in os.getenv('EXECUTOR_DEVICES', '').split(',') if d]
+
+    if len(coordinates) < size:
+        raise ValueError(f"EXECUTOR_POOL_SIZE={size} needs {size} coordinates files, found {len(coordinates)}")
+
+    return [
+        {'type': 'moonshot', 'name': f'moonshot-{i}', 'coordinates_file': coordinates[i],
+         'device': devices[i] if i < len(devices) else None}
+        for i in range(size)
+    ]
+
+def backend_worker(spec, tasks, results, enabled, max_consecutive_failures):
+    """Backend process: claim coins from the shared queue until dropped from rotation
+
+    Stops claiming on its own after max_consecutive_failures, so a broken
+    backend can't drain the queue before the pool hears about it.
+    """
+    try:
+        executor = build_executor(spec)
+    except Exception as e:
+        results.put({'type': 'dead', 'backend': spec['name'], 'error': f"Backend setup failed: {e}"})
+        return
+
+    consecutive_failures = 0
+    while enabled.is_set() and consecutive_failures < max_consecutive_failures:
+        try:
+            coin = tasks.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        if coin is None:
+            break
+
+        results.put({'type': 'claimed', 'backend': spec['name'], 'coin_id': coin['id']})
+        started = time.perf_counter()
+        try:
+            success, error = bool(executor.create_coin(coin)), None
+            if not success:
+                error = "Automation failed"
+        except Exception as e:
+            success, error = False, str(e)
+        consecutive_failures = 0 if success else consecutive_failures + 1
+
+        results.put({
+            'type': 'done',
+            'backend': spec['name'],
+            'coin_id': coin['id'],
+            'success': success,
+            'error': error,
+            'duration': time.perf_counter() - started
+        })
+
+    executor.close()
+
+class ExecutorPool:
+    """N backend processes claiming coins from one queue, with health tracking"""
+
+    def __init__(self, specs, max_consecutive_failures=3, log=print):
+        self.context = multiprocessing.get_context('spawn')
+        self.tasks = self.context.Queue()
+        self.results = self.context.Queue()
+        self.max_consecutive_failures = max_consecutive_failures
+        self.log = log
+
+        self.backends = {}
+        for spec in specs:
+            self.backends[spec['name']] = {
+                'spec': spec,
+                'process': None,
+                'enabled': self.context.Event(),
+                'healthy': True,
+                'consecutive_failures': 0,
+                'completed': 0,
+                'failed': 0,
+                'claimed': None
+            }
+
+        self.in_flight = {}  # coin id -> caller's coin record
+
+    def start(self):
+        for name, backend in self.backends.items():
+            backend['enabled'].set()
+            backend['process'] = self.context.Process(
+                target=backend_worker,
+                args=(backend['spec'], self.tasks, self.results, backend['enabled'], self.max_consecutive_failures),
+                name=name,
+                daemon=True
+            )
+            backend['process'].start()
+        self.log(f"🏭 Started executor pool with {len(self.backends)} backend(s)")
+        return self
+
+    def healthy_backends(self):
+        return [name for name, backend in self.backends.items() if backend['healthy']]
+
+    def has_capacity(self):
+        """A healthy backend is free to claim another coin"""
+        return len(self.in_flight) < len(self.healthy_backends())
+
+    def submit(self, coin, record=None):
+        """Queue an automation-format coin; `record` is returned with its result"""
+        self.in_flight[coin['id']] = record if record is not None else coin
+        self.tasks.put(coin)
+
+    def take_unclaimed(self):
+        """
+        Withdraw queued coins no backend has claimed yet
+
+        Returns:
+            Their records, no longer in flight
+        """
+        while True:
+            try:
+                self.tasks.get_nowait()
+            except queue.Empty:
+                break
+
+        claimed = {backend['claimed'] for backend in self.backends.values() if backend['claimed']}
+        released = [record for coin_id, record in self.in_flight.items() if coin_id not in claimed]
+        self.in_flight = {coin_id: record for coin_id, record in self.in_flight.items() if coin_id in claimed}
+        return released
+
+    def drop(self, name, reason):
+        """Take a backend out of rotation"""
+        backend = self.backends[name]
+        if not backend['healthy']:
+            return
+        backend['healthy'] = False
+        backend['enabled'].clear()
+        self.log(f"🚫 Dropped executor {name} from rotation: {reason}")
+
+        if not self.healthy_backends():
+            self.log("❌ No healthy executors left in the pool")
+
+    def poll_results(self, timeout=0):
+        """
+        Collect finished coins
+
+        Returns:
+            List of dicts with 'record', 'success', 'error', 'backend', 'duration'
+        """
+        finished = []
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                message = self.results.get(timeout=remaining) if remaining > 0 else self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            backend = self.backends[message['backend']]
+
+            if message['type'] == 'claimed':
+                backend['claimed'] = message['coin_id']
+                continue
+
+            if message['type'] == 'dead':
+                self.drop(message['backend'], message['error'])
+                continue
+
+            backend['claimed'] = None
+            if message['success']:
+                backend['completed'] += 1
+                backend['consecutive_failures'] = 0
+            else:
+                backend['failed'] += 1
+                backend['consecutive_failures'] += 1
+                if backend['consecutive_failures'] >= self.max_consecutive_failures:
+                    self.drop(message['backend'], f"{backend['consecutive_failures']} consecutive failures")
+
+            message['record'] = self.in_flight.pop(message['coin_id'], None)
+            finished.append(message)
+
+            # Got something - don't block for the rest of the timeout
+            deadline = 0
+
+        finished.extend(self.reap_crashed())
+        return finished
+
+    def reap_crashed(self):
+        """Fail coins held by backend processes that died mid-run"""
+        finished = []
+        for name, backend in self.backends.items():
+            process = backend['process']
+            if process is None or process.is_alive() or not backend['healthy']:
+                continue
+
+            self.drop(name, f"process exited with code {process.exitcode}")
+            coin_id = backend['claimed']
+            if coin_id and coin_id in self.in_flight:
+                backend['claimed'] = None
+                finished.append({
+                    'type': 'done', 'backend': name, 'coin_id': coin_id, 'success': False,
+                    'error': f"Executor {name} crashed", 'duration': 0,
+                    'record': self.in_flight.pop(coin_id)
+                })
+        return finished
+
+    def health(self):
+        """Per-backend health report"""
+        return {
+            name: {
+                'healthy': backend['healthy'],
+                'alive': bool(backend['process'] and backend['process'].is_alive()),
+                'completed': backend['completed'],
+                'failed': backend['failed'],
+                'consecutive_failures': backend['consecutive_failures']
+            }
+            for name, backend in self.backends.items()
+        }
+
+    def close(self, timeout=5):
+        for backend in self.backends.values():
+            backend['enabled'].clear()
+        for backend in self.backends.values():
+            if backend['process']:
+                backend['process'].join(timeout)
+                if backend['process'].is_alive():
+                    backend['process'].terminate()
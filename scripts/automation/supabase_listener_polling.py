@@ -8,7 +8,9 @@ import os
 import sys
 import time
 import json
-from datetime import datetime
+import threading
+from collections import deque
+from datetime import datetime, timedelta
 from supabase import create_client, Client
 
 # Add moonshot_automation root directory to path (go up 2 levels from scripts/automation/)
@@ -18,6 +20,15 @@ from config.supabase_config import (
     SUPABASE_URL, SUPABASE_KEY, COINS_TABLE,
     STATUS_PENDING, STATUS_PROCESSING, STATUS_COMPLETED, STATUS_FAILED
 )
+from scripts.utils.retry import schedule_retry, utc_now, parse_timestamp
+from scripts.utils.lru import LRUSet
+from scripts.utils.pacing import LaunchPacer
+from scripts.utils.write_behind import WriteBehindBuffer
+from scripts.utils.validation import validate_coin_fields
+from scripts.automation.executors import ExecutorPool, NoHealthyExecutors, build_executor, executor_specs_from_env
+
+# Columns process_coin/schedule_retry need, plus the keyset watermark
+LISTENER_COLUMNS = 'id, ticker, name, description, website, twitter, attempts, updated_at'
 
 # Import the automation module (proprietary in full version)
 try:
@@ -35,95 +46,231 @@ class SupabasePollingListener:
             sys.exit(1)
             
         self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        self.automation = None
-        self.processed_ids = set()
+        self.automation = None  # In-process executor
+        self.pool = None  # Executor pool when EXECUTOR_POOL_SIZE > 1
+        self.executor_backend = os.getenv('EXECUTOR_BACKEND', 'moonshot')
+        
+        # Keyset polling state: only rows past the (updated_at, id) watermark are fetched
+        self.poll_batch = int(os.getenv('LISTENER_POLL_BATCH', '100'))
+        self.watermark_overlap = timedelta(seconds=float(os.getenv('LISTENER_WATERMARK_OVERLAP', '2')))
+        self.watermark = None  # (updated_at, id) to resume after
+        self.newest_seen = None  # Newest (updated_at, id) returned so far
+        self.processed_ids = LRUSet(int(os.getenv('LISTENER_SEEN_LIMIT', '1000')))
+        self.retry_due = {}  # coin id -> next_attempt_at for retries this listener scheduled
+        # Realtime mode touches processed_ids/retry_due from the event loop and worker
+        # threads: state_lock guards them (held briefly, never across I/O), poll_lock
+        # keeps keyset polls (the watermark) one at a time
+        self.state_lock = threading.Lock()
+        self.poll_lock = threading.Lock()
+        # Claiming/submitting a coin and finishing pool results run on different
+        # threads in realtime mode - one at a time
+        self.finish_lock = threading.Lock()
+        
+        # Launch pacing: token bucket + minimum gap, counted from the last launch
+        self.poll_interval = float(os.getenv('LISTENER_POLL_INTERVAL', '5'))
+        self.countdown = float(os.getenv('LISTENER_COUNTDOWN', '5'))  # Time to switch to Moonshot, overlaps queue wait
+        self.pacer = LaunchPacer(
+            launches_per_hour=float(os.getenv('LAUNCHES_PER_HOUR', '120')),
+            burst=int(os.getenv('LAUNCH_BURST', '1')),
+            min_gap=float(os.getenv('MIN_LAUNCH_GAP', '30'))
+        )
+        self.pending = deque()  # (picked_at, coin) waiting for a launch slot
         
-        # Initialize automation if available
-        if AUTOMATION_AVAILABLE:
+        # Status transitions are coalesced and flushed in bulk (processing is written through)
+        self.status_writes = WriteBehindBuffer(
+            self.supabase,
+            COINS_TABLE,
+            flush_interval=float(os.getenv('STATUS_FLUSH_INTERVAL', '2')),
+            max_batch=int(os.getenv('STATUS_FLUSH_BATCH', '50'))
+        ).start()
+        
+        # Initialize automation if available (the fake backend needs no proprietary module)
+        if AUTOMATION_AVAILABLE or self.executor_backend == 'fake':
             self.setup_automation()
         
     def setup_automation(self):
-        """Setup automation with latest coordinates"""
+        """Setup one executor, or a pool of backend processes, from EXECUTOR_* settings"""
         data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
         
-        # Find the latest coordinates file
-        coord_files = [f for f in os.listdir(data_dir) if f.startswith('moonshot_coordinates_')]
-        if not coord_files:
-            print("❌ No coordinates file found! Run coordinate_capture_click.py first.")
+        # Each Moonshot backend gets its own coordinates file (latest ones by default)
+        try:
+            specs = executor_specs_from_env(data_dir)
+        except ValueError as e:
+            print(f"❌ No coordinates file found! Run coordinate_capture_click.py first. ({e})")
             sys.exit(1)
         
-        coord_files.sort()
-        latest_coords = os.path.join(data_dir, coord_files[-1])
-        print(f"Using coordinates file: {latest_coords}")
+        for spec in specs:
+            if spec.get('coordinates_file'):
+                print(f"Using coordinates file: {spec['coordinates_file']}")
+        
+        if len(specs) > 1:
+            self.pool = ExecutorPool(
+                specs,
+                max_consecutive_failures=int(os.getenv('EXECUTOR_MAX_FAILURES', '3'))
+            ).start()
+        else:
+            self.automation = build_executor(specs[0])
+    
+    def prepare_coin(self, coin_data):
+        """Mark a coin processing and convert it to the automation format (None if it can't run)"""
+        # Pre-flight validation - never spend automation time on a coin that can't succeed
+        reason = validate_coin_fields(coin_data)
+        if reason:
+            print(f"🚫 Validation failed for {coin_data['ticker']}: {reason}")
+            self.update_coin_status(
+                coin_data['id'],
+                STATUS_FAILED,
+                error_message=f"Validation failed: {reason}"
+            )
+            return None
+        
+        # Update status to processing - durable before launching, so no other run picks it up
+        self.update_coin_status(coin_data['id'], STATUS_PROCESSING, sync=True)
         
-        # Create automation instance
-        self.automation = MoonshotAutomation(latest_coords, None)
+        if not self.automation and not self.pool:
+            print("⚠️  Cannot create token without proprietary automation module")
+            self.update_coin_status(
+                coin_data['id'], 
+                STATUS_FAILED,
+                error_message="Automation module not available"
+            )
+            return None
+        
+        # Convert Supabase data to expected format
+        return {
+            'id': coin_data['id'],
+            'ticker': coin_data['ticker'],
+            'name': coin_data['name'],
+            'description': coin_data['description'],
+            'website': coin_data['website'],
+            'twitter': coin_data['twitter'],
+            'status': STATUS_PROCESSING
+        }
+    
+    def finish_coin(self, coin_data, success, error="Automation failed"):
+        """Record the automation outcome for a coin"""
+        if success:
+            # Update status to completed
+            self.update_coin_status(
+                coin_data['id'], 
+                STATUS_COMPLETED,
+                processed_at=datetime.now().isoformat()
+            )
+            print(f"✅ Successfully processed: {coin_data['name']}")
+        else:
+            print(f"❌ Failed to process: {coin_data['name']} ({error})")
+            self.schedule_retry(coin_data, error)
     
     def process_coin(self, coin_data):
-        """Process a single coin"""
+        """Process a single coin (handed to a free backend when running a pool)"""
         print(f"\n🔄 Processing coin: {coin_data['name']} ({coin_data['ticker']})")
         
+        with self.finish_lock:
+            try:
+                coin = self.prepare_coin(coin_data)
+                if coin is None:
+                    return
+                
+                if self.pool:
+                    # Finished by collect_results()
+                    self.pool.submit(coin, coin_data)
+                    return
+                
+                # Process the coin
+                self.finish_coin(coin_data, self.automation.create_coin(coin))
+                    
+            except Exception as e:
+                print(f"❌ Error processing coin: {str(e)}")
+                self.schedule_retry(coin_data, e)
+    
+    def collect_results(self, timeout=0):
+        """Finish coins the executor pool is done with"""
+        if not self.pool:
+            return 0
+        
+        with self.finish_lock:
+            results = self.pool.poll_results(timeout)
+            for result in results:
+                try:
+                    self.finish_coin(result['record'], result['success'], result['error'])
+                except Exception as e:
+                    print(f"❌ Error finishing coin: {str(e)}")
+        return len(results)
+    
+    def idle(self, seconds):
+        """Sleep, finishing pool results meanwhile"""
+        if not self.pool:
+            time.sleep(seconds)
+            return
+        
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.collect_results(timeout=deadline - time.monotonic())
+    
+    def wait_for_executor(self):
+        """Wait until a pool backend is free to claim another coin"""
+        while self.pool and not self.pool.has_capacity():
+            if not self.pool.healthy_backends():
+                raise NoHealthyExecutors("No healthy executors left in the pool")
+            self.collect_results(timeout=self.poll_interval)
+    
+    def release_claimed(self, coins=()):
+        """Hand claimed coins back when no executor can run them
+        
+        Coins submitted to the pool but never picked up by a backend were
+        already marked processing - they go back to pending (no attempt
+        counted). `coins` are claimed but not yet started.
+        """
+        stranded = []
+        if self.pool:
+            with self.finish_lock:
+                stranded = self.pool.take_unclaimed()
+        
+        for coin in stranded:
+            self.update_coin_status(coin['id'], STATUS_PENDING)
+        with self.state_lock:
+            for coin in list(coins) + stranded:
+                self.processed_ids.discard(coin['id'])
+        
+        released = len(coins) + len(stranded)
+        if released:
+            print(f"↩️  Released {released} claimed coin(s) back to pending")
+    
+    def report_executors(self):
+        """Print per-backend pool health"""
+        if not self.pool:
+            return
+        
+        for name, health in self.pool.health().items():
+            state = "✅" if health['healthy'] else "🚫"
+            print(f"   {state} {name}: {health['completed']} completed, {health['failed']} failed")
+    
+    def schedule_retry(self, coin_data, error):
+        """Back off a failed coin, or dead-letter it after too many attempts"""
+        # The retry writes the row directly - buffered transitions for it are stale
+        self.status_writes.discard(coin_data['id'])
+        
         try:
-            # Update status to processing
-            self.update_coin_status(coin_data['id'], STATUS_PROCESSING)
-            
-            if not AUTOMATION_AVAILABLE:
-                print("⚠️  Cannot create token without proprietary automation module")
-                self.update_coin_status(
-                    coin_data['id'], 
-                    STATUS_FAILED,
-                    error_message="Automation module not available"
-                )
-                return
-            
-            # Convert Supabase data to expected format
-            coin = {
-                'id': coin_data['id'],
-                'ticker': coin_data['ticker'],
-                'name': coin_data['name'],
-                'description': coin_data['description'],
-                'website': coin_data['website'],
-                'twitter': coin_data['twitter'],
-                'status': STATUS_PROCESSING
-            }
-            
-            # Wait a moment for user to switch to Moonshot
-            print("⏱️  Starting in 5 seconds... (Switch to Moonshot app!)")
-            for i in range(5, 0, -1):
-                print(f"   {i}...", end='', flush=True)
-                time.sleep(1)
-            print("\n")
-            
-            # Process the coin
-            success = self.automation.create_coin(coin)
+            outcome, next_attempt_at = schedule_retry(
+                self.supabase, COINS_TABLE, coin_data, error,
+                retry_status=STATUS_PENDING, failed_status=STATUS_FAILED
+            )
             
-            if success:
-                # Update status to completed
-                self.update_coin_status(
-                    coin_data['id'], 
-                    STATUS_COMPLETED,
-                    processed_at=datetime.now().isoformat()
-                )
-                print(f"✅ Successfully processed: {coin_data['name']}")
+            if outcome == 'dead_letter':
+                print(f"☠️  Dead-lettered {coin_data['ticker']} after repeated failures")
             else:
-                # Update status to failed
-                self.update_coin_status(
-                    coin_data['id'], 
-                    STATUS_FAILED,
-                    error_message="Automation failed"
-                )
-                print(f"❌ Failed to process: {coin_data['name']}")
+                # Allow this session to pick the coin up again once it is due
+                with self.state_lock:
+                    self.processed_ids.discard(coin_data['id'])
+                    self.retry_due[coin_data['id']] = next_attempt_at
+                print(f"🔁 Retry for {coin_data['ticker']} scheduled at {next_attempt_at.strftime('%H:%M:%S')} UTC")
                 
         except Exception as e:
-            print(f"❌ Error processing coin: {str(e)}")
-            self.update_coin_status(
-                coin_data['id'], 
-                STATUS_FAILED,
-                error_message=str(e)
-            )
+            print(f"⚠️  Failed to schedule retry: {str(e)}")
+            self.update_coin_status(coin_data['id'], STATUS_FAILED, error_message=str(error))
     
-    def update_coin_status(self, coin_id, status, **kwargs):
-        """Update coin status in Supabase"""
+    def update_coin_status(self, coin_id, status, sync=False, **kwargs):
+        """Update coin status in Supabase (buffered unless sync=True, which raises on failure)"""
         update_data = {
             'status': status,
             'updated_at': datetime.now().isoformat()
@@ -131,37 +278,160 @@ class SupabasePollingListener:
         update_data.update(kwargs)
         
         try:
-            self.supabase.table(COINS_TABLE).update(update_data).eq('id', coin_id).execute()
+            self.status_writes.stage(coin_id, sync=sync, **update_data)
         except Exception as e:
-            print(f"⚠️  Failed to update status: {str(e)}")
+            if sync:
+                raise  # e.g. the processing claim - the caller must not go ahead
+            print(f"⚠️  Failed to update status (kept for the next flush): {str(e)}")
     
-    def check_for_new_coins(self):
-        """Check for new pending coins"""
+    def pending_coins_query(self):
+        """Base query for pending, image-synced coins that are due"""
+        return self.supabase.table(COINS_TABLE)\
+            .select(LISTENER_COLUMNS)\
+            .eq('status', STATUS_PENDING)\
+            .eq('image_synced', True)\
+            .lte('next_attempt_at', utc_now().isoformat())
+    
+    def poll_new_coins(self):
+        """Fetch coins changed since the watermark (one bounded page)
+        
+        Keyed on updated_at rather than created_at: a coin becomes eligible when
+        photo sync flips image_synced, which can happen after newer coins.
+        """
+        query = self.pending_coins_query()
+        
+        if self.watermark:
+            updated_at, coin_id = self.watermark
+            if coin_id:
+                query = query.or_(f"updated_at.gt.{updated_at},and(updated_at.eq.{updated_at},id.gt.{coin_id})")
+            else:
+                query = query.gt('updated_at', updated_at)
+        
+        rows = query.order('updated_at').order('id').limit(self.poll_batch).execute().data or []
+        
+        if rows:
+            self.newest_seen = (rows[-1]['updated_at'], rows[-1]['id'])
+        
+        if len(rows) >= self.poll_batch:
+            # More to read - continue exactly after the last row
+            self.watermark = self.newest_seen
+        elif self.newest_seen:
+            # Caught up - step back a little so rows committed late by concurrent writers are still seen
+            newest = parse_timestamp(self.newest_seen[0]) - self.watermark_overlap
+            self.watermark = (newest.isoformat(), None)
+        
+        return rows
+    
+    def poll_due_retries(self):
+        """Fetch coins whose retry (scheduled by this listener) is now due"""
+        now = utc_now()
+        with self.state_lock:
+            due_ids = [coin_id for coin_id, due in self.retry_due.items() if due <= now]
+            for coin_id in due_ids:
+                del self.retry_due[coin_id]
+        if not due_ids:
+            return []
+        
+        return self.pending_coins_query().in_('id', due_ids).execute().data or []
+    
+    def load_scheduled_retries(self):
+        """Pick up retries scheduled before a restart (they don't move the watermark when due)"""
         try:
             response = self.supabase.table(COINS_TABLE)\
-                .select("*")\
+                .select('id, next_attempt_at')\
                 .eq('status', STATUS_PENDING)\
-                .eq('image_synced', True)\
-                .order('created_at')\
+                .gt('next_attempt_at', utc_now().isoformat())\
                 .execute()
             
-            pending_coins = response.data
-            new_coins = [coin for coin in pending_coins if coin['id'] not in self.processed_ids]
+            with self.state_lock:
+                for coin in response.data or []:
+                    self.retry_due[coin['id']] = parse_timestamp(coin['next_attempt_at'])
+                waiting = len(self.retry_due)
             
-            if new_coins:
-                print(f"\n🆕 Found {len(new_coins)} new coin(s) to process")
+            if waiting:
+                print(f"🔁 {waiting} coin(s) waiting on a scheduled retry")
                 
-                for i, coin in enumerate(new_coins):
-                    self.processed_ids.add(coin['id'])
-                    self.process_coin(coin)
-                    
-                    # Wait between coins
-                    if i < len(new_coins) - 1:
-                        print("\n⏱️  Waiting 30 seconds before next coin...")
-                        time.sleep(30)
-                        
-            return len(new_coins) > 0
+        except Exception as e:
+            print(f"⚠️  Failed to load scheduled retries: {str(e)}")
+    
+    def fetch_new_coins(self):
+        """Due retries plus coins past the watermark that this session hasn't seen"""
+        with self.poll_lock:
+            pending_coins = {coin['id']: coin for coin in self.poll_due_retries() + self.poll_new_coins()}
+        with self.state_lock:
+            return [coin for coin in pending_coins.values() if coin['id'] not in self.processed_ids]
+    
+    def retry_is_due(self):
+        """A retry this listener scheduled is due"""
+        now = utc_now()
+        with self.state_lock:
+            return any(due <= now for due in self.retry_due.values())
+    
+    def claim(self, coin_id):
+        """Mark a coin as taken by this session; False if it already was"""
+        with self.state_lock:
+            if coin_id in self.processed_ids:
+                return False
+            self.processed_ids.add(coin_id)
+            return True
+    
+    def enqueue_new_coins(self):
+        """Add newly found coins to the local launch queue"""
+        new_coins = [coin for coin in self.fetch_new_coins() if self.claim(coin['id'])]
+        
+        if new_coins:
+            print(f"\n🆕 Found {len(new_coins)} new coin(s) to process")
+        
+        for coin in new_coins:
+            self.pending.append((time.monotonic(), coin))
+        
+        return len(new_coins)
+    
+    def launch_wait(self, picked_at):
+        """Seconds left before a coin picked up at `picked_at` may launch"""
+        countdown_left = self.countdown - (time.monotonic() - picked_at)
+        return max(self.pacer.time_until_ready(), countdown_left, 0)
+    
+    def wait_for_launch_slot(self, picked_at):
+        """Wait only the time actually left, polling for new arrivals meanwhile"""
+        wait = self.launch_wait(picked_at)
+        if wait > 0:
+            print(f"⏱️  Starting in {wait:.0f} seconds... (Switch to Moonshot app!)")
+        
+        while wait > 0:
+            self.idle(min(wait, self.poll_interval))
+            self.enqueue_new_coins()
+            wait = self.launch_wait(picked_at)
+    
+    def check_for_new_coins(self):
+        """Check for new pending coins and launch them as the pacer allows"""
+        try:
+            found = self.enqueue_new_coins()
             
+            while self.pending:
+                picked_at, coin = self.pending[0]
+                self.wait_for_launch_slot(picked_at)
+                self.wait_for_executor()
+                
+                self.pending.popleft()
+                self.pacer.acquire()
+                self.process_coin(coin)
+            
+            self.collect_results()
+            
+            if found:
+                print(f"📈 Pace: {self.pacer.launches_per_hour():.1f} launches/hour")
+                self.report_executors()
+                print(self.status_writes.report())
+            
+            return found > 0
+            
+        except NoHealthyExecutors as e:
+            # Nothing can run them - release and stop rather than strand coins in processing
+            print(f"❌ {e}")
+            self.release_claimed([coin for _, coin in self.pending])
+            self.pending.clear()
+            raise
         except Exception as e:
             print(f"❌ Error checking for coins: {str(e)}")
             return False
@@ -172,33 +442,51 @@ class SupabasePollingListener:
         print("="*60)
         print(f"Connected to: {SUPABASE_URL}")
         print(f"Polling table: {COINS_TABLE}")
-        print(f"Poll interval: 5 seconds")
+        print(f"Poll interval: {self.poll_interval:g} seconds (keyset, {self.poll_batch} rows max)")
+        print(f"Pacing: {self.pacer.rate * 3600:g} launches/hour, burst {self.pacer.capacity}, min gap {self.pacer.min_gap:g}s")
+        if self.pool:
+            print(f"Executors: {len(self.pool.backends)} {self.executor_backend} backends")
         print("="*60)
         
-        # Check for existing pending coins first
-        print("\n📋 Checking for existing pending coins...")
-        self.check_for_new_coins()
-        
-        print("\n👂 Polling for new coins...")
-        print("Press Ctrl+C to stop")
-        
-        # Keep polling
         try:
+            # Check for existing pending coins first
+            print("\n📋 Checking for existing pending coins...")
+            self.load_scheduled_retries()
+            self.check_for_new_coins()
+            
+            print("\n👂 Polling for new coins...")
+            print("Press Ctrl+C to stop")
+            
+            # Keep polling
             while True:
                 # Check for new coins
                 self.check_for_new_coins()
                 
                 # Wait before next poll
-                time.sleep(5)
+                self.idle(self.poll_interval)
                 
         except KeyboardInterrupt:
             print("\n\n👋 Stopping listener...")
+            self.close()
             sys.exit(0)
         except Exception as e:
             print(f"\n❌ Error: {str(e)}")
+            self.close()
             sys.exit(1)
+    
+    def close(self):
+        """Stop executor backends and flush buffered status updates"""
+        if self.pool:
+            self.pool.close()
+        self.status_writes.close()
 
 if __name__ == "__main__":
+    # Realtime mode subscribes to coin changes instead of polling every 5 seconds
+    if os.getenv('LISTENER_MODE', 'polling') == 'realtime':
+        from scripts.automation.supabase_realtime_listener import main
+        main()
+        sys.exit(0)
+    
     # Check if Moonshot app reminder needed
     if AUTOMATION_AVAILABLE:
         print("\n⚠️  IMPORTANT:")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Supabase Realtime Listener for Moonshot Automation
+Subscribes to coin INSERT/UPDATE events and triggers automation as soon as
+image_synced turns true; falls back to keyset polling while disconnected
+"""
+
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime
+
+# Add moonshot_automation root directory to path (go up 2 levels from scripts/automation/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config.supabase_config import SUPABASE_URL, SUPABASE_KEY, COINS_TABLE, STATUS_PENDING
+from scripts.automation.supabase_listener_polling import SupabasePollingListener, AUTOMATION_AVAILABLE
+from scripts.automation.executors import NoHealthyExecutors
+from scripts.utils.realtime import RealtimeChannel, build_realtime_url
+from scripts.utils.retry import utc_now, parse_timestamp
+
+class SupabaseRealtimeListener(SupabasePollingListener):
+    def __init__(self):
+        super().__init__()
+
+        self.realtime_url = build_realtime_url(SUPABASE_URL, SUPABASE_KEY)
+        self.fallback_interval = float(os.getenv('LISTENER_FALLBACK_INTERVAL', str(self.poll_interval)))
+        self.ready = None  # asyncio.Queue of (picked_at, coin) waiting for automation (created on the loop)
+        self.channel = RealtimeChannel(
+            self.realtime_url,
+            COINS_TABLE,
+            on_change=self.on_change,
+            on_subscribed=self.on_subscribed,
+            on_disconnect=self.on_disconnect
+        )
+
+    def is_ready(self, record):
+        """Coin is pending, image-synced and not backing off"""
+        if record.get('status') != STATUS_PENDING or not record.get('image_synced'):
+            return False
+
+        next_attempt_at = record.get('next_attempt_at')
+        return not next_attempt_at or parse_timestamp(next_attempt_at) <= utc_now()
+
+    def enqueue(self, coin):
+        """Queue a coin for automation once per session"""
+        if self.claim(coin['id']):
+            self.ready.put_nowait((time.monotonic(), coin))
+
+    def on_change(self, change_type, record):
+        """Realtime INSERT/UPDATE on coins"""
+        if self.is_ready(record):
+            print(f"\n⚡ {change_type}: {record['ticker']} ready for automation")
+            self.enqueue(record)
+
+    def on_subscribed(self):
+        """(Re)subscribed - resume from the watermark to cover events missed while down"""
+        print(f"📡 Subscribed to realtime changes on {COINS_TABLE}")
+        asyncio.get_running_loop().create_task(self.gap_fill())
+
+    def on_disconnect(self, error):
+        print(f"⚠️  Realtime connection lost, falling back to polling every {self.fallback_interval:g}s")
+
+    async def gap_fill(self):
+        """One keyset poll; enqueues pending coins realtime didn't deliver"""
+        try:
+            coins = await asyncio.to_thread(self.fetch_new_coins)
+            for coin in coins:
+                self.enqueue(coin)
+            if coins:
+                print(f"\n🆕 Found {len(coins)} new coin(s) to process")
+        except Exception as e:
+            print(f"❌ Error checking for coins: {str(e)}")
+
+    async def fallback_poll(self):
+        """Keyset polling while disconnected; due retries either way"""
+        while True:
+            await asyncio.sleep(self.fallback_interval)
+
+            if not self.channel.subscribed:
+                await self.gap_fill()
+            elif self.retry_is_due():
+                for coin in await asyncio.to_thread(self.poll_due_retries):
+                    self.enqueue(coin)
+
+    async def process_ready(self):
+        """Run automation for queued coins off the event loop (one at a time, or one per free executor)"""
+        while True:
+            picked_at, coin = await self.ready.get()
+
+            # Pacing wait - events keep arriving meanwhile
+            wait = self.launch_wait(picked_at)
+            if wait > 0:
+                print(f"⏱️  Starting {coin['ticker']} in {wait:.0f} seconds... (Switch to Moonshot app!)")
+            while wait > 0:
+                await asyncio.sleep(min(wait, 1))
+                wait = self.launch_wait(picked_at)
+
+            # A free backend, or release everything claimed and stop
+            try:
+                await asyncio.to_thread(self.wait_for_executor)
+            except NoHealthyExecutors as e:
+                print(f"❌ {e}")
+                waiting = [coin]
+                while not self.ready.empty():
+                    waiting.append(self.ready.get_nowait()[1])
+                await asyncio.to_thread(self.release_claimed, waiting)
+                raise
+
+            self.pacer.acquire()
+            await asyncio.to_thread(self.process_coin, coin)
+
+    async def collect_loop(self):
+        """Finish coins as executor pool backends report back"""
+        while True:
+            await asyncio.to_thread(self.collect_results, 0.25)
+    
+    async def run(self):
+        self.ready = asyncio.Queue()
+
+        # Existing pending coins first (same as polling mode)
+        print("\n📋 Checking for existing pending coins...")
+        await asyncio.to_thread(self.load_scheduled_retries)
+        await self.gap_fill()
+
+        tasks = [self.channel.run_forever(), self.fallback_poll(), self.process_ready()]
+        if self.pool:
+            tasks.append(self.collect_loop())
+        
+        await asyncio.gather(*tasks)
+
+    def start(self):
+        """Start the realtime subscription"""
+        print("🚀 Moonshot Automation - Supabase Realtime Listener")
+        print("="*60)
+        print(f"Connected to: {SUPABASE_URL}")
+        print(f"Subscribed table: {COINS_TABLE}")
+        print(f"Fallback poll interval: {self.fallback_interval:g} seconds")
+        print("="*60)
+        print("Press Ctrl+C to stop")
+
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            print("\n\n👋 Stopping listener...")
+            self.close()
+            sys.exit(0)
+        except Exception as e:
+            print(f"\n❌ Error: {str(e)}")
+            self.close()
+            sys.exit(1)
+
+def main():
+    if AUTOMATION_AVAILABLE:
+        print("\n⚠️  IMPORTANT:")
+        print("- Make sure Moonshot app is open")
+        print("- The app should be on the main screen")
+        print("- macOS password will be entered automatically")
+
+    print(f"\n🚀 Starting automatically at {datetime.now().strftime('%H:%M:%S')}...")
+
+    listener = SupabaseRealtimeListener()
+    listener.start()
+
+if __name__ == "__main__":
+    main()
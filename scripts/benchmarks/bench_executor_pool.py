@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Executor Pool Benchmark
+Pushes a backlog of coins through ExecutorPool with fake backends and compares
+throughput against a single in-process executor
+
+Usage:
+    python3 scripts/benchmarks/bench_executor_pool.py --coins 80 --pool-sizes 1,2,4,8 --latency 0.5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.automation.executors import ExecutorPool, FakeExecutor
+
+def make_coins(count):
+    return [{'id': f'bench-{i}', 'ticker': f'B{i}', 'name': f'Bench {i}'} for i in range(count)]
+
+def run_serial(coins, latency, failure_rate):
+    """Baseline: one executor, one coin at a time (the pre-pool listener)"""
+    executor = FakeExecutor('serial', latency=latency, failure_rate=failure_rate, seed=1)
+    completed = 0
+
+    started = time.perf_counter()
+    for coin in coins:
+        try:
+            completed += bool(executor.create_coin(coin))
+        except RuntimeError:
+            pass
+    return time.perf_counter() - started, completed, {}
+
+def warm_up(pool):
+    """
+    Run warmup coins until every backend has finished one, then drain them
+
+    Backend processes are spawned lazily, so this keeps every backend's start
+    time out of the measured run, not just the first one's.
+    """
+    warm = set()
+    submitted = 0
+    while not set(pool.healthy_backends()) <= warm:
+        while pool.has_capacity():
+            pool.submit({'id': f'warmup-{submitted}'})
+            submitted += 1
+        for result in pool.poll_results(timeout=5):
+            warm.add(result['backend'])
+    while pool.in_flight and pool.healthy_backends():
+        pool.poll_results(timeout=5)
+
+def run_pool(coins, size, latency, failure_rate, max_failures):
+    """Keep every healthy backend busy until the backlog is drained"""
+    specs = [
+        {'type': 'fake', 'name': f'fake-{i}', 'latency': latency, 'failure_rate': failure_rate, 'seed': i}
+        for i in range(size)
+    ]
+    pool = ExecutorPool(specs, max_consecutive_failures=max_failures, log=lambda message: None).start()
+
+    # Measure steady-state throughput only
+    warm_up(pool)
+
+    backlog = list(coins)
+    finished = 0
+    completed = 0
+
+    started = time.perf_counter()
+    while finished < len(coins):
+        while backlog and pool.has_capacity():
+            pool.submit(backlog.pop(0))
+        if not pool.healthy_backends():
+            break
+        for result in pool.poll_results(timeout=1):
+            finished += 1
+            completed += result['success']
+    elapsed = time.perf_counter() - started
+
+    health = pool.health()
+    pool.close()
+    return elapsed, completed, health
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel coin creation with fake executors')
+    parser.add_argument('--coins', type=int, default=80, help='Backlog size')
+    parser.add_argument('--pool-sizes', default='1,2,4,8', help='Comma-separated pool sizes')
+    parser.add_argument('--latency', type=float, default=0.5, help='Fake create_coin latency (seconds)')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Fake failure probability')
+    parser.add_argument('--max-failures', type=int, default=3, help='Consecutive failures before a backend is dropped')
+    args = parser.parse_args()
+
+    coins = make_coins(args.coins)
+
+    print("🚀 EXECUTOR POOL BENCHMARK")
+    print("="*60)
+    print(f"Backlog: {args.coins} coins, latency: {args.latency:g}s, failure rate: {args.failure_rate:g}")
+
+    results = [('serial', *run_serial(coins, args.latency, args.failure_rate))]
+    for size in [int(s) for s in args.pool_sizes.split(',')]:
+        results.append((f'pool={size}', *run_pool(coins, size, args.latency, args.failure_rate, args.max_failures)))
+
+    baseline = results[0][1]
+
+    print("\n📊 RESULTS")
+    print("="*60)
+    print(f"{'path':<10}{'time':>10}{'coins/s':>10}{'coins/hour':>12}{'speedup':>10}{'completed':>11}{'dropped':>9}")
+    for name, elapsed, completed, health in results:
+        dropped = sum(1 for backend in health.values() if not backend['healthy'])
+        print(f"{name:<10}{elapsed:>9.2f}s{completed / elapsed:>10.2f}{completed * 3600 / elapsed:>12.0f}"
+              f"{baseline / elapsed:>9.1f}x{completed:>11}{dropped:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Image Download Benchmark
+Fetches a batch of images from a local HTTP stand-in, comparing the old
+per-request requests.get() path with the pooled, streaming DownloadEngine
+
+Usage:
+    python3 scripts/benchmarks/bench_image_downloads.py --fetches 1000 --size 200000 --latency 0.02
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import requests
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT_DIR)
+
+from scripts.utils.downloads import DownloadEngine
+from tests.http_standin import ImageStandIn
+
+def run_baseline(urls, directory):
+    """Old AutoPhotoSync path: new connection per request, whole body buffered, one at a time"""
+    started = time.perf_counter()
+    for i, url in enumerate(urls):
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(directory, f'baseline_{i}.jpg'), 'wb') as f:
+            f.write(response.content)
+    return time.perf_counter() - started
+
+def run_engine(urls, directory, workers):
+    engine = DownloadEngine(max_workers=workers, log=lambda message: None)
+    started = time.perf_counter()
+    results = engine.download_many([(url, os.path.join(directory, f'engine_{i}.jpg')) for i, url in enumerate(urls)])
+    elapsed = time.perf_counter() - started
+    engine.close()
+
+    failed = [r for r in results if not r['ok']]
+    if failed:
+        print(f"⚠️  {len(failed)} downloads failed, e.g. {failed[0]['error']}")
+
+    ttfbs = sorted(r['ttfb'] for r in results if r['ttfb'] is not None)
+    return elapsed, ttfbs
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark image downloads against a local stand-in')
+    parser.add_argument('--fetches', type=int, default=1000, help='Number of image fetches')
+    parser.add_argument('--size', type=int, default=200 * 1024, help='Image size in bytes')
+    parser.add_argument('--latency', type=float, default=0.02, help='Simulated server latency per request (seconds)')
+    parser.add_argument('--workers', default='1,4,8', help='Comma-separated engine concurrency levels')
+    parser.add_argument('--skip-baseline', action='store_true', help='Skip the requests.get() baseline')
+    args = parser.parse_args()
+
+    print("🚀 IMAGE DOWNLOAD BENCHMARK")
+    print("="*60)
+    print(f"Fetches: {args.fetches}, size: {args.size} bytes, latency: {args.latency * 1000:.0f} ms")
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.skip_baseline:
+            standin = ImageStandIn(image_bytes=args.size, latency=args.latency).start()
+            urls = [standin.url(f'/img/{i}.jpg') for i in range(args.fetches)]
+            elapsed = run_baseline(urls, directory)
+            results.append(('requests.get', elapsed, None, standin.connections))
+            standin.stop()
+
+        for workers in [int(w) for w in args.workers.split(',')]:
+            standin = ImageStandIn(image_bytes=args.size, latency=args.latency).start()
+            urls = [standin.url(f'/img/{i}.jpg') for i in range(args.fetches)]
+            elapsed, ttfbs = run_engine(urls, directory, workers)
+            results.append((f'engine x{workers}', elapsed, ttfbs, standin.connections))
+            standin.stop()
+
+    megabytes = args.fetches * args.size / 1024 / 1024
+
+    print("\n📊 RESULTS")
+    print("="*60)
+    print(f"{'path':<14}{'time':>9}{'fetch/s':>10}{'MB/s':>8}{'TTFB p50':>10}{'TTFB p95':>10}{'conns':>7}")
+    for name, elapsed, ttfbs, connections in results:
+        p50 = f"{ttfbs[len(ttfbs) // 2] * 1000:.1f}ms" if ttfbs else '-'
+        p95 = f"{ttfbs[int(len(ttfbs) * 0.95)] * 1000:.1f}ms" if ttfbs else '-'
+        print(f"{name:<14}{elapsed:>8.2f}s{args.fetches / elapsed:>10.0f}{megabytes / elapsed:>8.1f}{p50:>10}{p95:>10}{connections:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Dead Letter Viewer for MemeXshot Automation
+Inspect rows that exhausted their retries and requeue them
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Add moonshot_automation root directory to path (go up 1 level from scripts/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supabase import create_client
+from config.supabase_config import (
+    SUPABASE_URL, SUPABASE_KEY, COINS_TABLE, QUEUE_TABLE, DEAD_LETTER_TABLE,
+    STATUS_PENDING
+)
+from scripts.utils.retry import requeue_dead_letter
+
+# Status each source table is put back in when requeued
+REQUEUE_STATUSES = {
+    QUEUE_TABLE: 'queued',
+    COINS_TABLE: STATUS_PENDING
+}
+
+def list_dead_letters(supabase, source=None, include_requeued=False, limit=50):
+    """List dead-lettered rows, newest first"""
+    query = supabase.table(DEAD_LETTER_TABLE)\
+        .select('id, source_table, source_id, attempts, last_error, failed_at, requeued_at, payload')\
+        .order('failed_at', desc=True)\
+        .limit(limit)
+
+    if source:
+        query = query.eq('source_table', source)
+    if not include_requeued:
+        query = query.is_('requeued_at', 'null')
+
+    result = query.execute()
+
+    print("\n☠️  DEAD LETTER")
+    print("="*80)
+
+    if not result.data:
+        print("✅ Dead letter is empty")
+        return
+
+    for entry in result.data:
+        ticker = entry['payload'].get('ticker', '?')
+        requeued = f" (requeued {entry['requeued_at']})" if entry['requeued_at'] else ""
+        print(f"[{entry['id']}] {entry['source_table']} {ticker} - {entry['attempts']} attempts - {entry['failed_at']}{requeued}")
+        print(f"     Last error: {(entry['last_error'] or '')[:100]}")
+
+def show_dead_letter(supabase, dead_letter_id):
+    """Show the full payload of a dead-lettered row"""
+    result = supabase.table(DEAD_LETTER_TABLE)\
+        .select('*')\
+        .eq('id', dead_letter_id)\
+        .limit(1)\
+        .execute()
+
+    if not result.data:
+        print(f"❌ Dead letter {dead_letter_id} not found")
+        return
+
+    print(json.dumps(result.data[0], indent=2, ensure_ascii=False))
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and requeue dead-lettered rows')
+    parser.add_argument('--list', action='store_true', help='List dead-lettered rows')
+    parser.add_argument('--source', type=str, choices=list(REQUEUE_STATUSES), help='Filter by source table')
+    parser.add_argument('--all', action='store_true', help='Include rows that were already requeued')
+    parser.add_argument('--show', type=int, metavar='ID', help='Show full payload of a dead letter')
+    parser.add_argument('--requeue', type=int, nargs='+', metavar='ID', help='Requeue dead letters by ID')
+    parser.add_argument('--limit', type=int, default=50, help='Number of rows to list')
+
+    args = parser.parse_args()
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("❌ Missing Supabase credentials!")
+        sys.exit(1)
+
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+    if args.show is not None:
+        show_dead_letter(supabase, args.show)
+    elif args.requeue:
+        for dead_letter_id in args.requeue:
+            entry = requeue_dead_letter(supabase, dead_letter_id, REQUEUE_STATUSES)
+            if entry:
+                print(f"🔁 Requeued {entry['source_table']} row {entry['source_id']}")
+            else:
+                print(f"❌ Dead letter {dead_letter_id} not found")
+    else:
+        list_dead_letters(supabase, args.source, args.all, args.limit)
+
+        if not args.list:
+            print("\n💡 Usage:")
+            print("  python3 scripts/dead_letter.py --list              # List dead letters")
+            print("  python3 scripts/dead_letter.py --show 12           # Show full payload")
+            print("  python3 scripts/dead_letter.py --requeue 12 13     # Requeue with fresh attempts")
+
+if __name__ == "__main__":
+    main()
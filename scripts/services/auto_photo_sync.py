@@ -7,18 +7,57 @@ Syncs images from Supabase to macOS Photos Library
 import os
 import sys
 import time
-import requests
-import subprocess
+import argparse
+import tempfile
+import threading
 from datetime import datetime
 
 # Add moonshot_automation root directory to path (go up 2 levels from scripts/services/)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from supabase import create_client
-from config.supabase_config import SUPABASE_URL, SUPABASE_KEY, COINS_TABLE
+from config.supabase_config import (
+    SUPABASE_URL, SUPABASE_KEY, COINS_TABLE, QUEUE_TABLE, PENDING_IMAGES_VIEW, STATUS_PENDING, MAX_RETRIES
+)
+from scripts.utils.write_behind import WriteBehindBuffer
+from scripts.utils.validation import validate_coin_fields, validate_image
+from scripts.utils.downloads import DownloadEngine
+from scripts.utils.image_cache import ImageCache
+from scripts.utils.importers import build_importer
+from scripts.utils.pipeline import Pipeline, Stage, BatchStage
+from scripts.utils.retry import schedule_retry, utc_now, parse_timestamp
+
+# Perceptual hashing needs Pillow + numpy
+try:
+    from scripts.utils.image_hash import ImageHashIndex
+    IMAGE_HASH_AVAILABLE = True
+except ImportError:
+    IMAGE_HASH_AVAILABLE = False
+
+# Realtime wakeups need websockets
+try:
+    from scripts.utils.realtime import RealtimeWakeup, build_realtime_url
+    REALTIME_AVAILABLE = True
+except ImportError:
+    REALTIME_AVAILABLE = False
+
+# Normalization (re-encoding to JPEG) needs Pillow
+try:
+    from scripts.utils.normalize import ImageNormalizer
+    NORMALIZE_AVAILABLE = True
+except ImportError:
+    NORMALIZE_AVAILABLE = False
+
+def needs_image_sync(record):
+    """Row belongs in pending_image_syncs"""
+    return bool(record.get('image_url')) and not record.get('image_synced') and record.get('status') == STATUS_PENDING
+
+def needs_prefetch(record):
+    """Queued tweet whose image can be fetched before promotion"""
+    return record.get('status') == 'queued' and (record.get('image_url') or '').startswith(('http://', 'https://'))
 
 class AutoPhotoSync:
-    def __init__(self):
+    def __init__(self, debug=False):
         # Initialize Supabase client
         if not SUPABASE_URL or not SUPABASE_KEY:
             print("❌ Missing Supabase credentials!")
@@ -33,8 +72,11 @@ class AutoPhotoSync:
         
         # Track coins currently being processed to avoid duplicates
         self.processing_coins = set()
-        # Track processed image URLs to avoid downloading same image multiple times
-        self.processed_image_urls = set()
+        self.retry_due = {}  # coin id -> next_attempt_at for image syncs backing off
+        
+        # Pooled keep-alive downloads, several images at a time
+        self.fetch_workers = int(os.getenv('DOWNLOAD_CONCURRENCY', '4'))
+        self.downloads = DownloadEngine(max_workers=self.fetch_workers, timeout=30)
         
         # Log file
         self.log_file = os.path.join(
@@ -43,6 +85,71 @@ class AutoPhotoSync:
             'photo_sync.log'
         )
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        
+        # Persistent content-addressed cache - survives restarts, so the same image
+        # is neither downloaded nor imported twice
+        self.image_cache = ImageCache(
+            os.path.expanduser(os.getenv('IMAGE_CACHE_DIR', '~/Pictures/MoonshotImageCache')),
+            max_bytes=int(os.getenv('IMAGE_CACHE_MAX_MB', '500')) * 1024 * 1024,
+            log=self.log
+        )
+        
+        # Near-duplicate detection across the whole image history (flag, reject or off)
+        self.duplicate_action = os.getenv('IMAGE_DUPLICATE_ACTION', 'flag')
+        self.hash_index = None
+        if IMAGE_HASH_AVAILABLE and self.duplicate_action != 'off':
+            self.hash_index = ImageHashIndex(
+                algorithm=os.getenv('IMAGE_HASH_ALGORITHM', 'dhash'),
+                max_distance=int(os.getenv('IMAGE_DUPLICATE_DISTANCE', '6')),
+                log=self.log
+            )
+        self.hash_lock = threading.Lock()
+        
+        # Downloaded images are re-encoded to uniform, metadata-free JPEGs in a process pool
+        self.normalizer = None
+        self.prepare_workers = int(os.getenv('NORMALIZE_WORKERS', '2'))
+        if NORMALIZE_AVAILABLE and os.getenv('IMAGE_NORMALIZE', 'true').lower() == 'true':
+            self.normalizer = ImageNormalizer(
+                workers=self.prepare_workers,
+                max_side=int(os.getenv('IMAGE_TARGET_SIDE', '1024')),
+                quality=int(os.getenv('IMAGE_JPEG_QUALITY', '85')),
+                log=self.log
+            )
+        
+        # Woken by realtime coin changes; polling is the fallback while disconnected
+        self.debug = debug or os.getenv('PHOTO_SYNC_DEBUG', 'false').lower() == 'true'
+        self.poll_interval = float(os.getenv('PHOTO_SYNC_POLL_INTERVAL', '30'))
+        self.sweep_interval = float(os.getenv('PHOTO_SYNC_SWEEP_INTERVAL', '300'))
+        
+        # Images of queued tweets are downloaded and normalized into the cache while they wait
+        self.queue_prefetch = os.getenv('QUEUE_PREFETCH', 'true').lower() == 'true'
+        self.queue_prefetch_limit = int(os.getenv('QUEUE_PREFETCH_LIMIT', '50'))
+        self.queue_prefetch_chunk = int(os.getenv('QUEUE_PREFETCH_CHUNK', '5'))
+        self.prefetch_thread = None  # Prefetch runs off the main loop, one pass at a time
+        
+        self.wake = threading.Event()
+        self.wakeups = []
+        if REALTIME_AVAILABLE and os.getenv('PHOTO_SYNC_REALTIME', 'true').lower() == 'true':
+            realtime_url = build_realtime_url(SUPABASE_URL, SUPABASE_KEY)
+            self.wakeups.append(RealtimeWakeup(realtime_url, COINS_TABLE, needs_image_sync, event=self.wake, log=self.log))
+            if self.queue_prefetch:
+                self.wakeups.append(RealtimeWakeup(realtime_url, QUEUE_TABLE, needs_prefetch, event=self.wake, log=self.log))
+        
+        # Photos import backend; images are imported in batches
+        self.importer = build_importer(log=self.log)
+        self.import_batch_size = int(os.getenv('IMPORT_BATCH_SIZE', '10'))
+        self.import_flush_interval = float(os.getenv('IMPORT_FLUSH_INTERVAL', '30'))
+        
+        # image_synced updates are coalesced and flushed in bulk
+        self.sync_writes = WriteBehindBuffer(
+            self.supabase,
+            COINS_TABLE,
+            flush_interval=float(os.getenv('STATUS_FLUSH_INTERVAL', '2')),
+            max_batch=int(os.getenv('STATUS_FLUSH_BATCH', '50')),
+            log=self.log
+        ).start()
+        
+        self.pipeline = self.build_pipeline()
     
     def log(self, message):
         """Log message with timestamp"""
@@ -54,125 +161,321 @@ class AutoPhotoSync:
             f.write(log_message + '\n')
     
     def download_image(self, url, filepath):
-        """Download image from URL"""
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            return True
-        except Exception as e:
-            self.log(f"❌ Failed to download image: {e}")
-            return False
+        """Download image from URL (streamed to a temp file, renamed into place); returns the download result"""
+        result = self.downloads.download(url, filepath)
+        if not result['ok']:
+            kind = "permanent" if result['permanent'] else "transient"
+            self.log(f"❌ Failed to download image ({kind}): {result['error']}")
+            return result
+        
+        self.log(f"📥 {result['bytes']} bytes, TTFB {result['ttfb'] * 1000:.0f} ms, {result['bytes_per_sec'] / 1024:.0f} KB/s")
+        return result
+    
+    def image_filename(self, coin):
+        """Local filename for a coin's image"""
+        if coin['image_filename']:
+            return coin['image_filename']
+        
+        # Create filename from twitter_user_ticker_timestamp
+        timestamp = int(time.time())
+        twitter_user = coin.get('twitter_user', 'user').replace('@', '')
+        return f"{twitter_user}_{coin['ticker']}_{timestamp}.jpg"
+    
+    def cached_image(self, url, local_path):
+        """
+        Copy a cached image to local_path
+        
+        Returns:
+            None on a miss, else the normalization result the cached copy stands for
+            (result['cached'] is False when it is a raw download still to normalize)
+        """
+        if not self.image_cache.fetch(url, local_path):
+            return None
+        
+        original_bytes = self.image_cache.original_bytes(url)
+        return {
+            'path': local_path,
+            'ok': original_bytes is not None,
+            'cached': original_bytes is not None,
+            'reason': None,
+            'error': None,
+            'original_bytes': original_bytes,
+            'normalized_bytes': os.path.getsize(local_path)
+        }
     
-    def import_to_photos(self, image_path):
-        """Import image to Photos using AppleScript"""
+    def build_pipeline(self):
+        """
+        fetch -> prepare -> import (batched) -> ack
+        
+        Each stage has its own worker count and bounded queue, so downloads,
+        normalization and Photos imports overlap and the slowest stage sets throughput
+        """
+        capacity = int(os.getenv('PIPELINE_QUEUE_SIZE', '16'))
+        return Pipeline([
+            Stage('fetch', self.fetch_stage, workers=self.fetch_workers, capacity=capacity),
+            Stage('prepare', self.prepare_stage, workers=self.prepare_workers, capacity=capacity),
+            BatchStage('import', self.import_stage, batch_size=self.import_batch_size,
+                       flush_interval=self.import_flush_interval, capacity=capacity),
+            Stage('ack', self.ack_stage, workers=1, capacity=capacity)
+        ], on_error=self.pipeline_error, log=self.log).start()
+    
+    def fetch_stage(self, item):
+        """Check the coin, then copy the image from the cache or download it"""
+        coin = item['coin']
+        self.log(f"🖼️  Syncing image for {coin['ticker']} - {coin['name']}")
+        
+        # Don't download/import for a coin the listener would reject anyway
+        reason = validate_coin_fields(coin)
+        if reason:
+            self.reject_coin(coin, reason)
+            return None
+        
+        # Check if this image URL was already processed
+        image_url = coin.get('image_url')
+        if self.image_cache.was_imported(image_url):
+            self.log(f"⚠️  Image URL already processed: {image_url[:50]}...")
+            # Still mark as synced in database
+            self.mark_shared_image(coin)
+            return None
+        
+        # Known-bad URL (deleted tweet, not an image...) - fail without touching the network
+        failure = self.image_cache.failure_for(image_url)
+        if failure:
+            self.reject_image(coin, failure)
+            return None
+        
+        item['filename'] = self.image_filename(coin)
+        item['path'] = os.path.join(self.import_folder, item['filename'])
+        
+        # Cache first - only go to the network on a miss
+        cached = self.cached_image(image_url, item['path'])
+        if cached:
+            self.log(f"🗄️  Cache hit for {image_url[:50]}...")
+            item['normalized'] = cached if cached['cached'] else None
+        else:
+            result = self.download_image(image_url, item['path'])
+            if result['permanent']:
+                self.reject_image(coin, f"Image unavailable: {result['error']}")
+                return None
+            if not result['ok']:
+                self.retry_image_sync(coin, result['error'])
+                return None
+        
+        self.log(f"✅ Downloaded to: {item['path']}")
+        return item
+    
+    def prepare_stage(self, item):
+        """Validate/normalize, cache the import-ready copy and check for duplicates"""
+        coin, local_path = item['coin'], item['path']
+        image_url = coin.get('image_url')
+        
+        # Broken or oversized images would only fail minutes into the UI automation;
+        # usable ones are re-encoded to the target size/quality
+        reason, fields = self.prepare_image(local_path, item['normalized'])
+        if reason:
+            os.remove(local_path)
+            self.reject_image(coin, f"Validation failed: {reason}")
+            return None
+        
+        # Cache the import-ready copy - the next coin with this URL skips download and normalization
+        if not (item['normalized'] and item['normalized'].get('cached')):
+            self.image_cache.put(image_url, local_path, original_bytes=fields.get('image_original_bytes'))
+        
+        # Identical content already imported under a different URL
+        if self.image_cache.was_imported(image_url):
+            self.log(f"⚠️  Identical image already in Photos: {image_url[:50]}...")
+            os.remove(local_path)
+            self.mark_shared_image(coin)
+            return None
+        
+        # Near duplicates (same meme, new URL) are caught before the Photos import
+        image_hash, duplicate = self.find_near_duplicate(coin, local_path)
+        if duplicate:
+            distance, duplicate_id, duplicate_ticker = duplicate
+            reason = f"near-duplicate of {duplicate_ticker} ({duplicate_id}), distance {distance}"
+            if self.duplicate_action == 'reject':
+                os.remove(local_path)
+                self.reject_coin(coin, reason)
+                return None
+            self.log(f"🔁 Flagged {coin['ticker']} as {reason}")
+        
+        if image_hash:
+            fields['image_hash'] = image_hash
+        if duplicate:
+            fields['duplicate_of'] = duplicate[1]
+        item['fields'] = fields
+        return item
+    
+    def import_stage(self, items):
+        """Import a batch of prepared images into Photos in one go"""
+        imported, elapsed = self.importer.import_batch([item['path'] for item in items])
+        self.log(f"✅ Imported {len(imported)}/{len(items)} image(s) in {elapsed:.1f}s ({elapsed / len(items):.2f}s per image)")
+        for item in items:
+            item['imported'] = item['path'] in imported
+        return items
+    
+    def ack_stage(self, item):
+        """Clean up and mark the coin synced (or release it for a retry)"""
+        coin = item['coin']
+        
+        # Cleanup local file
+        if os.path.exists(item['path']):
+            os.remove(item['path'])
+        
+        if not item['imported']:
+            # Back off like any other transient failure (dead-lettered after MAX_RETRIES)
+            self.retry_image_sync(coin, f"{self.importer.name}: Photos import failed")
+            return None
+        
+        # Remember the import (persists across restarts, keyed by content)
+        self.image_cache.mark_imported(coin.get('image_url'))
+        
+        # Update Supabase - mark as synced but keep status as pending
+        # (don't change status - let Supabase Listener handle that)
+        # Fresh attempt budget for the automation that follows
+        self.sync_writes.stage(
+            coin['id'],
+            image_synced=True,
+            image_sync_timestamp=datetime.now().isoformat(),
+            image_filename=item['filename'],
+            attempts=0,
+            last_error=None,
+            **item['fields']
+        )
+        
+        self.log(f"✅ Sync completed for {coin['ticker']}")
+        return None
+    
+    def pipeline_error(self, stage, item, error):
+        """A stage raised - drop the local file and retry the coin with backoff"""
+        if item.get('path') and os.path.exists(item['path']):
+            os.remove(item['path'])
+        self.retry_image_sync(item['coin'], f"{stage.name}: {error}")
+    
+    def retry_image_sync(self, coin, error):
+        """Transient failure - back off exponentially, dead-letter after MAX_RETRIES attempts"""
+        self.sync_writes.discard(coin['id'])
         try:
-            # AppleScript to import image
-            script = f'''
-            tell application "Photos"
-                activate
-                delay 1
-                import POSIX file "{image_path}"
-                delay 3
-            end tell
-            '''
-            
-            # Run AppleScript
-            process = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True
+            outcome, next_attempt_at = schedule_retry(
+                self.supabase, COINS_TABLE, coin, error, retry_status=STATUS_PENDING
             )
-            
-            if process.returncode != 0:
-                self.log(f"⚠️  AppleScript error: {process.stderr}")
-                return False
-            
-            return True
-            
         except Exception as e:
-            self.log(f"❌ Failed to import to Photos: {e}")
-            return False
+            self.log(f"⚠️  Could not schedule retry for {coin['ticker']}: {e}")
+            outcome, next_attempt_at = 'retry', None
+        
+        if outcome == 'retry' and next_attempt_at:
+            self.retry_due[coin['id']] = next_attempt_at
+            self.log(f"🔁 Image retry {(coin.get('attempts') or 0) + 1}/{MAX_RETRIES} for {coin['ticker']} "
+                     f"scheduled at {next_attempt_at.strftime('%H:%M:%S')} UTC")
+        elif outcome == 'dead_letter':
+            self.log(f"☠️  Gave up on the image for {coin['ticker']} after {MAX_RETRIES} attempts")
+        
+        # Due again (or dead-lettered): next query decides
+        self.processing_coins.discard(coin['id'])
+    
+    def reject_coin(self, coin, reason):
+        """Mark a coin that can never be created as failed (the listener won't pick it up)"""
+        self.log(f"🚫 Validation failed for {coin['ticker']}: {reason}")
+        self.sync_writes.stage(
+            coin['id'],
+            status='failed',
+            error_message=f"Validation failed: {reason}",
+            updated_at=datetime.now().isoformat()
+        )
+    
+    def reject_image(self, coin, error_message):
+        """Permanent image failure - remember the URL (negative cache) and fail the coin"""
+        self.image_cache.mark_failed(coin.get('image_url'), error_message)
+        self.log(f"🚫 {coin['ticker']}: {error_message}")
+        self.sync_writes.stage(
+            coin['id'],
+            status='failed',
+            error_message=error_message,
+            updated_at=datetime.now().isoformat()
+        )
     
-    def sync_image(self, coin):
-        """Sync a single image from Supabase to Photos"""
+    def mark_shared_image(self, coin):
+        """Mark synced without importing - the same image is already in Photos"""
+        self.sync_writes.stage(
+            coin['id'],
+            image_synced=True,
+            image_sync_timestamp=datetime.now().isoformat(),
+            image_filename=f"shared_image_{coin['ticker']}_{int(time.time())}.jpg"
+        )
+    
+    def find_near_duplicate(self, coin, local_path):
+        """
+        Perceptual-hash an image, look it up in the history index and add it
+        (unless it is about to be rejected as a duplicate)
+        
+        Returns:
+            (image_hash, duplicate) - duplicate is (distance, coin_id, ticker) or None
+        """
+        if not self.hash_index:
+            return None, None
+        
         try:
-            self.log(f"🖼️  Syncing image for {coin['ticker']} - {coin['name']}")
-            
-            # Check if this image URL was already processed
-            image_url = coin.get('image_url')
-            if image_url in self.processed_image_urls:
-                self.log(f"⚠️  Image URL already processed: {image_url[:50]}...")
-                # Still mark as synced in database
-                self.supabase.table(COINS_TABLE).update({
-                    'image_synced': True,
-                    'image_sync_timestamp': datetime.now().isoformat(),
-                    'image_filename': f"shared_image_{coin['ticker']}_{int(time.time())}.jpg"
-                }).eq('id', coin['id']).execute()
-                return True
-            
-            # Generate filename
-            if coin['image_filename']:
-                filename = coin['image_filename']
-            else:
-                # Create filename from twitter_user_ticker_timestamp
-                timestamp = int(time.time())
-                twitter_user = coin.get('twitter_user', 'user').replace('@', '')
-                filename = f"{twitter_user}_{coin['ticker']}_{timestamp}.jpg"
-            
-            # Download image
-            local_path = os.path.join(self.import_folder, filename)
-            if not self.download_image(coin['image_url'], local_path):
-                return False
-            
-            self.log(f"✅ Downloaded to: {local_path}")
-            
-            # Import to Photos
-            if not self.import_to_photos(local_path):
-                # Cleanup on failure
-                if os.path.exists(local_path):
-                    os.remove(local_path)
-                return False
-            
-            self.log(f"✅ Imported to Photos")
-            
-            # Wait a bit for Photos to process
-            time.sleep(5)
-            
-            # Cleanup local file
-            if os.path.exists(local_path):
-                os.remove(local_path)
-            
-            # Add to processed URLs
-            self.processed_image_urls.add(image_url)
-            
-            # Update Supabase - mark as synced but keep status as pending
-            self.supabase.table(COINS_TABLE).update({
-                'image_synced': True,
-                'image_sync_timestamp': datetime.now().isoformat(),
-                'image_filename': filename
-                # Don't change status - let Supabase Listener handle that
-            }).eq('id', coin['id']).execute()
-            
-            self.log(f"✅ Sync completed for {coin['ticker']}")
-            return True
-            
+            image_hash = self.hash_index.compute(local_path)
         except Exception as e:
-            self.log(f"❌ Error syncing image: {e}")
-            return False
+            self.log(f"⚠️  Could not hash image: {e}")
+            return None, None
+        
+        # Lookup and insert together, so two copies prepared at once still match
+        with self.hash_lock:
+            duplicate = self.hash_index.find_duplicate(image_hash, exclude_id=coin['id'])
+            if not (duplicate and self.duplicate_action == 'reject'):
+                self.hash_index.add(image_hash, coin['id'], coin['ticker'])
+        return image_hash, duplicate
+    
+    def prepare_image(self, local_path, normalized=None):
+        """
+        Validate and normalize a downloaded image
+        
+        Args:
+            normalized: Normalization result already available (e.g. from the cache), if any
+        
+        Returns:
+            (reason the coin should be rejected or None, extra columns to store)
+        """
+        if normalized and normalized.get('cached'):
+            self.log(f"🗄️  Normalized copy from cache ({normalized['original_bytes']} -> {normalized['normalized_bytes']} bytes)")
+            return None, {
+                'image_original_bytes': normalized['original_bytes'],
+                'image_bytes': normalized['normalized_bytes']
+            }
+        
+        if not self.normalizer:
+            return validate_image(local_path), {}
+        
+        result = normalized or self.normalizer.normalize(local_path)
+        if result['reason']:
+            return result['reason'], {}
+        if not result['ok']:
+            # Passed validation but couldn't be re-encoded - import the original
+            self.log(f"⚠️  Normalization failed, importing original: {result['error']}")
+            return validate_image(local_path), {}
+        
+        self.log(f"🪄 {result['format']} {result['original_size'][0]}x{result['original_size'][1]} "
+                 f"{result['original_bytes']} bytes -> JPEG {result['normalized_size'][0]}x{result['normalized_size'][1]} "
+                 f"{result['normalized_bytes']} bytes")
+        return None, {
+            'image_original_bytes': result['original_bytes'],
+            'image_bytes': result['normalized_bytes']
+        }
     
     def check_pending_images(self):
-        """Check for images that need syncing"""
+        """Feed coins that need their image synced into the pipeline"""
         try:
-            # Query for unsynced images - include all active statuses
-            result = self.supabase.table(COINS_TABLE)\
+            # Due retries are picked up by this query
+            now = utc_now()
+            for coin_id, due in list(self.retry_due.items()):
+                if due <= now:
+                    self.retry_due.pop(coin_id, None)
+            
+            # Pending, unsynced coins with an image that aren't backing off (narrow view, partial index)
+            result = self.supabase.table(PENDING_IMAGES_VIEW)\
                 .select('*')\
-                .eq('image_synced', False)\
-                .not_.is_('image_url', 'null')\
-                .eq('status', 'pending')\
+                .lte('next_attempt_at', now.isoformat())\
                 .order('created_at')\
                 .execute()
             
@@ -183,30 +486,16 @@ class AutoPhotoSync:
                     self.log(f"  [{i+1}] {coin['ticker']} - ID: {coin['id'][:8]}... - URL: {coin.get('image_url', '')[:40]}...")
                 
                 for coin in result.data:
-                    # Skip if already processing
+                    # Skip if already processing (or synced earlier this session)
                     if coin['id'] in self.processing_coins:
                         self.log(f"  ⏭️  Skipping {coin['ticker']} - Already being processed")
                         continue
-                        
-                    self.log(f"  🪙 {coin['ticker']} - Status: {coin.get('status')} - Image URL: {coin.get('image_url', 'None')[:50]}...")
                     
-                    # Add to processing set
                     self.processing_coins.add(coin['id'])
                     
-                    # Sync the image
-                    success = self.sync_image(coin)
-                    
-                    # Remove from processing set after completion
-                    if success:
-                        # Keep in set to avoid re-processing in same session
-                        pass
-                    else:
-                        # Remove on failure to allow retry
-                        self.processing_coins.discard(coin['id'])
-                    
-                    # Wait between syncs
-                    time.sleep(10)
-            else:
+                    # Blocks while the fetch stage is full
+                    self.pipeline.submit({'coin': coin, 'path': None, 'filename': None, 'normalized': None, 'fields': {}})
+            elif self.debug:
                 # Debug: Show recent coins
                 debug_result = self.supabase.table(COINS_TABLE)\
                     .select('ticker, status, image_url, image_synced')\
@@ -222,11 +511,141 @@ class AutoPhotoSync:
         except Exception as e:
             self.log(f"❌ Error checking pending images: {e}")
     
+    def start_prefetch(self):
+        """Run a prefetch pass on a background thread unless one is still running; returns whether it started"""
+        if self.prefetch_thread and self.prefetch_thread.is_alive():
+            return False
+        self.prefetch_thread = threading.Thread(target=self.prefetch_in_background, name='queue-prefetch', daemon=True)
+        self.prefetch_thread.start()
+        return True
+    
+    def prefetch_in_background(self):
+        try:
+            self.prefetch_queued()
+        except Exception as e:
+            self.log(f"⚠️  Queue prefetch failed: {e}")
+    
+    def prefetch_queued(self):
+        """
+        Download and normalize images of queued tweets into the cache ahead of promotion,
+        so syncing the promoted coin is a cache hit plus import
+        
+        Images go through in chunks of queue_prefetch_chunk, so a promoted coin's
+        download never waits behind more than one chunk in the download pool.
+        
+        Returns:
+            Number of images cached
+        """
+        try:
+            rows = self.supabase.table(QUEUE_TABLE)\
+                .select('image_url')\
+                .eq('status', 'queued')\
+                .not_.is_('image_url', 'null')\
+                .order('created_at')\
+                .limit(self.queue_prefetch_limit)\
+                .execute().data or []
+        except Exception as e:
+            self.log(f"⚠️  Could not read queued tweets: {e}")
+            return 0
+        
+        urls = []
+        for row in rows:
+            url = row['image_url']
+            if (url.startswith(('http://', 'https://')) and url not in urls and not self.image_cache.contains(url)
+                    and not self.image_cache.was_imported(url) and not self.image_cache.failure_for(url)):
+                urls.append(url)
+        if not urls:
+            return 0
+        
+        cached = 0
+        with tempfile.TemporaryDirectory(prefix='queue_prefetch_') as directory:
+            for start in range(0, len(urls), self.queue_prefetch_chunk):
+                chunk = urls[start:start + self.queue_prefetch_chunk]
+                jobs = [(url, os.path.join(directory, f'{start + i}.img')) for i, url in enumerate(chunk)]
+                results = self.downloads.download_many(jobs)
+                downloaded = [(url, path) for (url, path), result in zip(jobs, results) if result['ok']]
+                
+                # Dead URLs fail the coin as soon as it is promoted; transient failures retry next pass
+                for url, result in zip(chunk, results):
+                    if result['permanent']:
+                        self.image_cache.mark_failed(url, f"Image unavailable: {result['error']}")
+                
+                normalized = {}
+                if self.normalizer and downloaded:
+                    normalized = self.normalizer.normalize_many(path for _, path in downloaded)
+                
+                for url, path in downloaded:
+                    result = normalized.get(path)
+                    if result and result['reason']:
+                        self.image_cache.mark_failed(url, f"Validation failed: {result['reason']}")
+                        continue
+                    original_bytes = result['original_bytes'] if result and result['ok'] else None
+                    self.image_cache.put(url, path, original_bytes=original_bytes)
+                    cached += 1
+        
+        self.log(f"📦 Prefetched {cached}/{len(urls)} queued image(s) into the cache")
+        return cached
+    
+    def load_scheduled_retries(self):
+        """Pick up image retries scheduled before a restart, so they run on time"""
+        try:
+            rows = self.supabase.table(PENDING_IMAGES_VIEW)\
+                .select('id, next_attempt_at')\
+                .gt('next_attempt_at', utc_now().isoformat())\
+                .execute().data or []
+        except Exception as e:
+            self.log(f"⚠️  Could not load scheduled image retries: {e}")
+            return
+        
+        for row in rows:
+            self.retry_due[row['id']] = parse_timestamp(row['next_attempt_at'])
+        if self.retry_due:
+            self.log(f"🔁 {len(self.retry_due)} image sync(s) waiting on a scheduled retry")
+    
+    def next_retry_in(self):
+        """Seconds until the earliest scheduled image retry, or None"""
+        due = min(list(self.retry_due.values()), default=None)
+        return max((due - utc_now()).total_seconds(), 0) if due else None
+    
+    def wait_for_work(self):
+        """Sleep until a realtime change needs syncing or prefetching, a retry is due, or the poll/sweep interval passes"""
+        retry_in = self.next_retry_in()
+        
+        if not self.wakeups:
+            time.sleep(min(self.poll_interval, retry_in if retry_in is not None else self.poll_interval))
+            return
+        
+        # Subscribed: events drive syncing, with an occasional safety sweep
+        subscribed = all(wakeup.subscribed for wakeup in self.wakeups)
+        timeout = self.sweep_interval if subscribed else self.poll_interval
+        if retry_in is not None:
+            timeout = min(timeout, retry_in)
+        woken = self.wake.wait(timeout)
+        self.wake.clear()
+        
+        woken_at = max((wakeup.woken_at for wakeup in self.wakeups if wakeup.woken_at), default=None)
+        if woken and woken_at:
+            self.log(f"⚡ Woken by realtime event ({(time.monotonic() - woken_at) * 1000:.1f} ms ago)")
+    
     def run(self):
         """Main service loop"""
         self.log("🚀 Starting Auto Photo Sync Service")
         self.log(f"📡 Connected to: {SUPABASE_URL}")
-        self.log("👂 Monitoring for new images...")
+        
+        if self.hash_index:
+            try:
+                self.hash_index.rebuild(self.supabase, COINS_TABLE)
+            except Exception as e:
+                self.log(f"⚠️  Could not load image hashes: {e}")
+        
+        self.load_scheduled_retries()
+        
+        if self.wakeups:
+            for wakeup in self.wakeups:
+                wakeup.start()
+            self.log("👂 Monitoring for new images (realtime)...")
+        else:
+            self.log(f"👂 Monitoring for new images (polling every {self.poll_interval:g}s)...")
         
         check_count = 0
         while True:
@@ -234,19 +653,45 @@ class AutoPhotoSync:
                 check_count += 1
                 if check_count % 10 == 1:  # Log every 10th check
                     self.log(f"🔄 Check #{check_count} for pending images...")
+                    if self.sync_writes.flushes:
+                        self.log(self.sync_writes.report())
+                    if self.image_cache.lookups:
+                        self.log(self.image_cache.report())
+                    if self.importer.batches:
+                        self.log(self.importer.report())
+                    if self.pipeline.stages[0].processed:
+                        self.log(self.pipeline.report())
                 
                 self.check_pending_images()
                 
-                # Wait before next check
-                time.sleep(30)
+                # Promoted coins first, then get ahead on the queue in the background
+                if self.queue_prefetch:
+                    self.start_prefetch()
+                
+                # Wait for the next realtime event (or poll interval)
+                self.wait_for_work()
                 
             except KeyboardInterrupt:
                 self.log("👋 Stopping service...")
+                self.pipeline.close(timeout=60)
+                if self.prefetch_thread:
+                    self.prefetch_thread.join(timeout=60)
+                for wakeup in self.wakeups:
+                    wakeup.stop()
+                self.sync_writes.close()
+                self.downloads.close()
+                self.image_cache.close()
+                if self.normalizer:
+                    self.normalizer.close()
                 break
             except Exception as e:
                 self.log(f"❌ Unexpected error: {e}")
                 time.sleep(60)  # Wait longer on error
 
 if __name__ == "__main__":
-    service = AutoPhotoSync()
+    parser = argparse.ArgumentParser(description='Sync coin images from Supabase to Photos')
+    parser.add_argument('--debug', action='store_true', help='List recent coins when nothing is pending')
+    args = parser.parse_args()
+    
+    service = AutoPhotoSync(debug=args.debug)
     service.run()
\ No newline at end of file
@@ -13,13 +13,21 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from supabase import create_client
-from config.supabase_config import SUPABASE_URL, SUPABASE_KEY
+from config.supabase_config import SUPABASE_URL, SUPABASE_KEY, QUEUE_TABLE
+from scripts.utils.retry import schedule_retry, utc_now, is_missing_function
+from scripts.utils.admission import AdmissionController
+from scripts.utils.validation import oversized_field
 
 class QueueWorker:
     def __init__(self):
         # Initialize Supabase
         self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
         
+        # Promotion config
+        self.batch_size = int(os.getenv('QUEUE_BATCH_SIZE', '50'))  # Max tweets promoted per cycle
+        self.max_active_coins = int(os.getenv('MAX_ACTIVE_COINS', '1'))  # Downstream capacity (pending + processing)
+        self.batch_promotion = True  # Disabled if promote_queued_tweets() is not installed
+        
         # Log file
         self.log_file = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), 
@@ -27,6 +35,9 @@ class QueueWorker:
             'queue_worker.log'
         )
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        
+        # Shared queue wait estimates (same controller the Twitter bot admits with)
+        self.admission = AdmissionController(self.supabase, log=self.log)
     
     def log(self, message):
         """Log with timestamp"""
@@ -38,11 +49,17 @@ class QueueWorker:
             f.write(log_message + '\n')
     
     def has_active_processing(self):
-        """Check if there's an active coin being processed"""
+        """Check if there's an active coin being processed
+        
+        Pending coins still backing off (next_attempt_at in the future) don't
+        count, so a failing coin doesn't hold up the queue behind it.
+        """
         try:
+            now = utc_now().isoformat()
             result = self.supabase.table('coins')\
                 .select('id')\
-                .in_('status', ['pending', 'processing'])\
+                .or_(f'status.eq.processing,and(status.eq.pending,or(next_attempt_at.is.null,next_attempt_at.lte."{now}"))')\
+                .limit(1)\
                 .execute()
             
             return len(result.data) > 0 if result.data else False
@@ -54,9 +71,11 @@ class QueueWorker:
     def get_next_tweet(self):
         """Get next tweet from queue"""
         try:
+            # Skip rows still backing off from a failed attempt
             result = self.supabase.table('tweet_queue')\
                 .select('*')\
                 .eq('status', 'queued')\
+                .lte('next_attempt_at', utc_now().isoformat())\
                 .order('created_at')\
                 .limit(1)\
                 .execute()
@@ -69,6 +88,12 @@ class QueueWorker:
     
     def move_to_coins(self, tweet):
         """Move tweet from queue to coins table"""
+        # Won't fit the coins columns - retrying can't help
+        reason = oversized_field(tweet)
+        if reason:
+            self.reject_tweet(tweet, f"Validation failed: {reason}")
+            return False
+        
         try:
             # Prepare coin data
             coin_data = {
@@ -107,16 +132,122 @@ class QueueWorker:
                 self.log(f"✅ Moved to processing: {tweet['ticker']} from @{tweet['twitter_user']}")
                 return True
             
+            raise Exception("Insert into coins returned no data")
+            
         except Exception as e:
             self.log(f"❌ Error moving tweet: {e}")
-            
-            # Revert queue status
+            self.schedule_retry(tweet, e)
+            return False
+    
+    def reject_tweet(self, tweet, error_message):
+        """Mark a queued tweet that can never become a coin as rejected"""
+        try:
             self.supabase.table('tweet_queue')\
-                .update({'status': 'queued'})\
+                .update({
+                    'status': 'rejected',
+                    'error_message': error_message,
+                    'processed_at': utc_now().isoformat()
+                })\
                 .eq('id', tweet['id'])\
                 .execute()
             
-            return False
+            self.log(f"🚫 Rejected {tweet['ticker']}: {error_message}")
+            
+        except Exception as e:
+            self.log(f"❌ Error rejecting tweet: {e}")
+    
+    def schedule_retry(self, tweet, error):
+        """Back off a failed tweet, or dead-letter it after too many attempts"""
+        try:
+            outcome, next_attempt_at = schedule_retry(
+                self.supabase, QUEUE_TABLE, tweet, error, retry_status='queued'
+            )
+            
+            if outcome == 'dead_letter':
+                self.log(f"☠️  Dead-lettered {tweet['ticker']} after repeated failures")
+            else:
+                self.log(f"🔁 Retry for {tweet['ticker']} scheduled at {next_attempt_at.strftime('%H:%M:%S')} UTC")
+                
+        except Exception as e:
+            self.log(f"❌ Error scheduling retry: {e}")
+    
+    def promote_batch(self):
+        """Promote up to min(free capacity, batch size) tweets in one transaction
+        
+        Returns:
+            Number of tweets promoted, or None if the batch RPC is not installed
+        """
+        try:
+            result = self.supabase.rpc('promote_queued_tweets', {
+                'max_active': self.max_active_coins,
+                'batch_size': self.batch_size
+            }).execute()
+            
+        except Exception as e:
+            if is_missing_function(e):
+                self.log(f"⚠️  Batch promotion unavailable, using single-row path: {e}")
+                self.batch_promotion = False
+                return None
+            
+            # Network blip, timeout, ... - try the RPC again next loop
+            self.log(f"❌ Error promoting batch: {e}")
+            return 0
+        
+        coins = result.data or []
+        for coin in coins:
+            self.log(f"✅ Moved to processing: {coin['ticker']} from @{coin['twitter_user']}")
+        
+        return len(coins)
+    
+    def promote_single(self):
+        """Promote the next queued tweet (legacy path, one row per cycle)"""
+        # Check if system is busy
+        if self.has_active_processing():
+            self.log("⏳ System busy with active processing...")
+            return 0
+        
+        # Get next tweet from queue
+        next_tweet = self.get_next_tweet()
+        
+        if next_tweet:
+            self.log(f"📨 Processing queued tweet: {next_tweet['ticker']}")
+            return 1 if self.move_to_coins(next_tweet) else 0
+        
+        return 0
+    
+    def shed_stale_tweets(self):
+        """Reject queued tweets that have waited longer than ADMISSION_MAX_QUEUE_AGE"""
+        cutoff = self.admission.stale_cutoff()
+        if not cutoff:
+            return
+        
+        try:
+            result = self.supabase.table('tweet_queue')\
+                .update({
+                    'status': 'rejected',
+                    'error_message': f'Expired in queue after {int(self.admission.max_queue_age // 60)} min (overloaded)',
+                    'processed_at': utc_now().isoformat()
+                })\
+                .eq('status', 'queued')\
+                .lt('created_at', cutoff)\
+                .execute()
+            
+            if result.data:
+                self.log(f"🚦 Shed {len(result.data)} stale queue items")
+                
+        except Exception as e:
+            self.log(f"⚠️  Error shedding stale queue items: {e}")
+    
+    def report_admission(self):
+        """Refresh cached wait estimates and log when over the SLO"""
+        if not self.admission.enabled:
+            return
+        
+        self.admission.refresh()
+        wait = self.admission.expected_wait()
+        if wait > self.admission.slo_seconds:
+            self.log(f"🚦 Expected wait {int(wait // 60)} min over SLO ({int(self.admission.slo_seconds // 60)} min), "
+                     f"depth {self.admission.queue_depth}, service time {int(self.admission.service_time)}s")
     
     def cleanup_old_queue(self):
         """Clean up old completed queue items (older than 24 hours)"""
@@ -142,34 +273,34 @@ class QueueWorker:
         """Main worker loop"""
         self.log("🚀 Starting Queue Worker")
         self.log("Processing tweets from queue to coins table...")
+        self.log(f"📦 Batch size: {self.batch_size}, max active coins: {self.max_active_coins}")
         
         # Cleanup counter
         cleanup_counter = 0
         
         while True:
             try:
-                # Check if system is busy
-                if self.has_active_processing():
-                    self.log("⏳ System busy with active processing...")
-                else:
-                    # Get next tweet from queue
-                    next_tweet = self.get_next_tweet()
-                    
-                    if next_tweet:
-                        self.log(f"📨 Processing queued tweet: {next_tweet['ticker']}")
-                        self.move_to_coins(next_tweet)
-                    else:
-                        # No tweets in queue
-                        pass
+                promoted = None
+                if self.batch_promotion:
+                    promoted = self.promote_batch()
+                
+                if promoted is None:
+                    promoted = self.promote_single()
+                
+                # Cached estimates - only hits the DB once per refresh interval
+                self.report_admission()
                 
                 # Cleanup old items every 100 iterations
                 cleanup_counter += 1
+                if cleanup_counter % 10 == 0:
+                    self.shed_stale_tweets()
                 if cleanup_counter >= 100:
                     self.cleanup_old_queue()
                     cleanup_counter = 0
                 
-                # Wait before next check
-                time.sleep(10)
+                # Full batch means backlog and capacity remain - go again right away
+                if not (self.batch_promotion and promoted >= self.batch_size):
+                    time.sleep(10)
                 
             except KeyboardInterrupt:
                 self.log("👋 Stopping queue worker...")
@@ -9,7 +9,7 @@ import sys
 import time
 import re
 import tweepy
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 # Add moonshot_automation root directory to path (go up 2 levels from scripts/services/)
@@ -17,6 +17,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from supabase import create_client
 from config.supabase_config import SUPABASE_URL, SUPABASE_KEY
+from scripts.utils.admission import AdmissionController
+from scripts.utils.retry import utc_now
 
 # Load environment variables
 load_dotenv()
@@ -43,6 +45,9 @@ class TwitterBot:
         self.coin_twitter_handle = os.getenv('COIN_TWITTER_HANDLE', '@memexshot')
         self.coin_website_type = os.getenv('COIN_WEBSITE_URL', 'tweet_url')
         
+        # Load shedding when the expected queue wait exceeds the SLO
+        self.admission = AdmissionController(self.supabase, log=self.log)
+        
         # Initialize Twitter client
         self.client = self.setup_twitter_client()
         
@@ -171,7 +176,25 @@ class TwitterBot:
             self.log(f"⚠️  Error checking rate limit: {e}")
             return False
     
-    def add_to_queue(self, tweet, ticker, author=None, followers_count=0, includes=None, profile_image_url=None, name=None):
+    def check_reduced_quota(self, username, daily_quota):
+        """Check user's daily count against a quota lowered by admission control"""
+        try:
+            result = self.supabase.table('twitter_rate_limits')\
+                .select('daily_count, last_reset')\
+                .eq('twitter_user', username)\
+                .limit(1)\
+                .execute()
+            
+            if not result.data or result.data[0]['last_reset'] != datetime.now().date().isoformat():
+                return True
+            
+            return result.data[0]['daily_count'] < daily_quota
+            
+        except Exception as e:
+            self.log(f"⚠️  Error checking reduced quota: {e}")
+            return True
+    
+    def add_to_queue(self, tweet, ticker, author=None, followers_count=0, includes=None, profile_image_url=None, name=None, defer_seconds=0):
         """Add tweet to processing queue"""
         try:
             # Get tweet URL
@@ -199,12 +222,17 @@ class TwitterBot:
                 'status': 'queued'
             }
             
+            # Deferred by admission control - worker skips it until due
+            if defer_seconds > 0:
+                queue_data['next_attempt_at'] = (utc_now() + timedelta(seconds=defer_seconds)).isoformat()
+            
             # Insert to queue
             result = self.supabase.table('tweet_queue').insert(queue_data).execute()
             
             if result.data:
                 self.log(f"✅ Added to queue: {ticker} from tweet {tweet.id}")
                 self.processed_tweets.add(str(tweet.id))
+                self.admission.record_admitted()
                 
                 # Update rate limit
                 self.supabase.table('twitter_rate_limits')\
@@ -221,8 +249,8 @@ class TwitterBot:
             self.log(f"❌ Error adding to queue: {e}")
             return False
     
-    def add_to_queue_rejected(self, tweet, ticker, author, followers_count, profile_image_url=None, name=None):
-        """Add tweet to queue with rejected status (insufficient followers)"""
+    def add_to_queue_rejected(self, tweet, ticker, author, followers_count, profile_image_url=None, name=None, error_message=None):
+        """Add tweet to queue with rejected status (insufficient followers or load shedding)"""
         try:
             tweet_url = f"https://twitter.com/{author}/status/{tweet.id}"
             image_url = self.get_tweet_image(tweet, None)
@@ -240,7 +268,7 @@ class TwitterBot:
                 'profile_image_url': profile_image_url,
                 'followers_count': followers_count,
                 'status': 'rejected',
-                'error_message': f'Insufficient followers: {followers_count} (min: {self.min_followers})'
+                'error_message': error_message or f'Insufficient followers: {followers_count} (min: {self.min_followers})'
             }
             
             self.supabase.table('tweet_queue').insert(queue_data).execute()
@@ -330,10 +358,32 @@ class TwitterBot:
                     self.processed_tweets.add(str(tweet.id))
                     continue
                 
+                # Admission control (cached queue wait estimate, no per-tweet DB scan)
+                decision = self.admission.admit(followers_count)
+                wait_minutes = int(decision['expected_wait'] // 60)
+                
+                if decision['action'] == 'reject':
+                    self.log(f"🚦 Queue overloaded (~{wait_minutes} min wait), rejecting {ticker} from @{author}")
+                    self.processed_tweets.add(str(tweet.id))
+                    self.add_to_queue_rejected(tweet, ticker, author, followers_count, profile_image_url, name,
+                                               error_message=decision['error_message'])
+                    continue
+                
+                if decision['action'] == 'quota':
+                    daily_quota = self.admission.daily_quota(self.max_daily_per_user)
+                    if not self.check_reduced_quota(author, daily_quota):
+                        self.log(f"⏳ Reduced quota ({daily_quota}/day, ~{wait_minutes} min wait) reached for @{author}")
+                        self.processed_tweets.add(str(tweet.id))
+                        continue
+                
+                defer_seconds = decision.get('defer_seconds', 0)
+                if defer_seconds:
+                    self.log(f"🐢 Deferring {ticker} from @{author} by {int(defer_seconds // 60)} min (low priority)")
+                
                 # Add to queue with user info and includes
                 self.add_to_queue(tweet, ticker, author, followers_count, 
                                 tweets.includes if hasattr(tweets, 'includes') else None,
-                                profile_image_url, name)
+                                profile_image_url, name, defer_seconds=defer_seconds)
                 
         except Exception as e:
             self.log(f"❌ Error searching tweets: {e}")
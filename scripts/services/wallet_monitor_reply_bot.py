@@ -1,33 +1,52 @@
 import os
-import json
+import sys
 import time
 import asyncio
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-from solana.rpc.api import Client
-from solders.pubkey import Pubkey
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed, Finalized
 import tweepy
-from supabase import create_client, Client as SupabaseClient
+from supabase import acreate_client, AsyncClient as SupabaseClient
 from dotenv import load_dotenv
 
+# Add moonshot_automation root directory to path (go up 2 levels from scripts/services/)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT_DIR)
+
+from scripts.utils.solana_ws import WalletSubscription, build_ws_url
+from scripts.utils.signatures import fetch_signatures_since
+from scripts.utils.signature_store import SignatureStore
+from scripts.utils.rpc import TransactionFetcher, RPCError
+from scripts.utils.swap_classifier import classify_transaction
+from scripts.utils.token_metadata import TokenMetadataService, helius_metadata_url
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
 WALLET_ADDRESS = os.getenv("MONITOR_WALLET_ADDRESS")
 HELIUS_RPC = os.getenv("HELIUS_RPC_URL")
-METEORA_DBC_PROGRAM = "dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN"
-USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
 
-# Supabase setup
-supabase: SupabaseClient = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_KEY")
-)
+# Push (logs/account websocket subscription) or poll ("off")
+WALLET_SUBSCRIPTION = os.getenv("WALLET_SUBSCRIPTION", "logs")
+WALLET_POLL_INTERVAL = float(os.getenv("WALLET_POLL_INTERVAL", "30"))
+WALLET_SWEEP_INTERVAL = float(os.getenv("WALLET_SWEEP_INTERVAL", "300"))
+TX_FETCH_ATTEMPTS = 3
+TX_FETCH_RETRY_DELAY = 0.5
+TX_FOLLOW_UP_POLL_DELAY = 2  # Poll again this long after a pushed transaction couldn't be fetched
+RECENT_WINDOW_SECONDS = 30 * 60  # Older transactions are never replied to
+WALLET_MAX_CONCURRENT_SWAPS = int(os.getenv("WALLET_MAX_CONCURRENT_SWAPS", "8"))
+
+# Supabase setup (async client, created in main())
+supabase: Optional[SupabaseClient] = None
 
 # Solana connection
-solana_client = Client(HELIUS_RPC)
+solana_client = AsyncClient(HELIUS_RPC)
+
+# getTransaction in concurrent JSON-RPC batches (created in main(), on the
+# running event loop)
+transaction_fetcher: Optional[TransactionFetcher] = None
 
 # Twitter accounts configuration
 TWITTER_ACCOUNTS = []
@@ -76,184 +95,24 @@ for i in range(1, 3):
             "last_tweet_time": None
         })
 
-# Track processed signatures
-processed_signatures = set()
+# Processed signatures and their classification (ordered, time-bounded, survives
+# restarts; opened in main())
+signature_store: Optional[SignatureStore] = None
 
-def check_if_meteora_swap(tx_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Check if transaction is a Meteora swap with 5 USDC"""
-    try:
-        # Check if Meteora program is involved
-        has_meteora = False
-        if 'transaction' in tx_dict and 'message' in tx_dict['transaction']:
-            # Check account keys
-            account_keys = tx_dict['transaction']['message'].get('accountKeys', [])
-            for key in account_keys:
-                if isinstance(key, str) and key == METEORA_DBC_PROGRAM:
-                    has_meteora = True
-                    break
-                elif isinstance(key, dict) and key.get('pubkey') == METEORA_DBC_PROGRAM:
-                    has_meteora = True
-                    break
-            
-            # Check instructions
-            instructions = tx_dict['transaction']['message'].get('instructions', [])
-            for inst in instructions:
-                if isinstance(inst, dict) and inst.get('programId') == METEORA_DBC_PROGRAM:
-                    has_meteora = True
-                    break
-        
-        if not has_meteora:
-            return None
-        
-        # Check for 5 USDC swap in inner instructions
-        swap_info = None
-        if 'meta' in tx_dict and 'innerInstructions' in tx_dict['meta']:
-            for inner_group in tx_dict['meta']['innerInstructions']:
-                if isinstance(inner_group, dict) and 'instructions' in inner_group:
-                    for inner_inst in inner_group['instructions']:
-                        if isinstance(inner_inst, dict) and 'parsed' in inner_inst:
-                            parsed = inner_inst['parsed']
-                            if isinstance(parsed, dict) and parsed.get('type') == 'transferChecked':
-                                info = parsed.get('info', {})
-                                amount = info.get('tokenAmount', {}).get('uiAmount')
-                                mint = info.get('mint')
-                                
-                                if mint == USDC_MINT and amount and 4.9 < float(amount) < 5.1:
-                                    swap_info = {
-                                        'usdc_amount': float(amount),
-                                        'has_5_usdc': True
-                                    }
-        
-        return swap_info
-    except Exception as e:
-        print(f"Error checking Meteora swap: {e}")
-        return None
+# Mint -> symbol through Helius, cached and batched (opened in main(); None
+# without a Helius API key)
+token_metadata: Optional[TokenMetadataService] = None
 
-def extract_moon_token_from_swap(tx_dict: Dict[str, Any], block_time: int) -> Optional[Dict[str, Any]]:
-    """Extract moon token information from Meteora swap transaction"""
-    try:
-        # Get timestamp
-        timestamp = datetime.fromtimestamp(block_time) if block_time else None
-        
-        # Look for moon tokens in post balances
-        moon_tokens = []
-        if 'meta' in tx_dict and 'postTokenBalances' in tx_dict['meta']:
-            for balance in tx_dict['meta']['postTokenBalances']:
-                if balance.get('owner') == WALLET_ADDRESS:
-                    mint = balance.get('mint', '')
-                    # Check if mint ends with 'moon'
-                    if mint.endswith('moon'):
-                        amount = balance.get('uiTokenAmount', {}).get('uiAmount', 0)
-                        if amount > 0:
-                            # Extract ticker from mint address
-                            # Mint format: XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXmoon
-                            # We need to get the token metadata to find the ticker
-                            ticker = extract_ticker_from_metadata(tx_dict, mint)
-                            
-                            moon_tokens.append({
-                                'mint': mint,
-                                'amount': amount,
-                                'timestamp': timestamp,
-                                'ticker': ticker
-                            })
-        
-        # Return the first moon token found
-        if moon_tokens:
-            return moon_tokens[0]
-        
-        return None
-    except Exception as e:
-        print(f"Error extracting moon token: {e}")
-        return None
+# Newest signature every earlier one has been handled up to (polling cursor)
+last_processed_signature = None
 
-def extract_ticker_from_metadata(tx_dict: Dict[str, Any], mint_address: str) -> Optional[str]:
-    """Extract ticker from transaction metadata"""
-    try:
-        # Look in innerInstructions for metadata
-        if 'meta' in tx_dict and 'innerInstructions' in tx_dict['meta']:
-            for inner_group in tx_dict['meta']['innerInstructions']:
-                if isinstance(inner_group, dict) and 'instructions' in inner_group:
-                    for inst in inner_group['instructions']:
-                        # Look for metadata in logs
-                        if 'data' in inst and isinstance(inst['data'], str):
-                            # Try to decode base58 data for metadata
-                            continue
-        
-        # Look in logs for ticker information
-        if 'meta' in tx_dict and 'logMessages' in tx_dict['meta']:
-            for log in tx_dict['meta']['logMessages']:
-                # Meteora logs often contain token info
-                if 'Token:' in log or 'Symbol:' in log:
-                    # Extract ticker from log
-                    parts = log.split()
-                    for i, part in enumerate(parts):
-                        if part in ['Symbol:', 'Ticker:', 'Token:'] and i + 1 < len(parts):
-                            ticker = parts[i + 1].strip(',').strip('"').strip("'")
-                            if ticker and len(ticker) <= 10:  # Reasonable ticker length
-                                return ticker.upper()
-        
-        # If not found in logs, try to parse from transaction data
-        # Look for CreateMetadata instruction
-        if 'transaction' in tx_dict and 'message' in tx_dict['transaction']:
-            instructions = tx_dict['transaction']['message'].get('instructions', [])
-            for inst in instructions:
-                if isinstance(inst, dict) and 'parsed' in inst:
-                    parsed = inst['parsed']
-                    if isinstance(parsed, dict) and parsed.get('type') == 'createMetadataAccounts':
-                        info = parsed.get('info', {})
-                        symbol = info.get('symbol')
-                        if symbol:
-                            return symbol.upper()
-        
-        # If still not found, use Helius API to get metadata
-        ticker = get_token_metadata_from_helius(mint_address)
-        if ticker:
-            return ticker.upper()
-        
-        return None
-    except Exception as e:
-        print(f"Error extracting ticker: {e}")
-        return None
-
-def get_token_metadata_from_helius(mint_address: str) -> Optional[str]:
-    """Get token metadata from Helius API"""
-    try:
-        api_key = HELIUS_RPC.split('api-key=')[-1] if 'api-key=' in HELIUS_RPC else None
-        if not api_key:
-            return None
-        
-        url = f"https://api.helius.xyz/v0/token-metadata?api-key={api_key}"
-        
-        payload = {
-            "mintAccounts": [mint_address],
-            "includeOffChain": True,
-            "disableCache": False
-        }
-        
-        response = requests.post(url, json=payload, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0:
-                metadata = data[0]
-                # First try onChainMetadata
-                on_chain = metadata.get('onChainMetadata', {})
-                if on_chain:
-                    symbol = on_chain.get('metadata', {}).get('data', {}).get('symbol')
-                    if symbol:
-                        return symbol.strip()
-                
-                # Then try offChainMetadata
-                off_chain = metadata.get('offChainMetadata', {})
-                if off_chain:
-                    symbol = off_chain.get('metadata', {}).get('symbol')
-                    if symbol:
-                        return symbol.strip()
-        
-        return None
-    except Exception as e:
-        print(f"Error getting metadata from Helius: {e}")
-        return None
+# Swaps are handled concurrently; these keep overlapping work apart (the
+# semaphore and lock are created in main(), on the running event loop)
+swap_slots: Optional[asyncio.Semaphore] = None
+poll_lock: Optional[asyncio.Lock] = None
+handling_signatures = set()
+replying_tweet_ids = set()
+background_tasks = set()
 
 def reset_daily_counters():
     """Reset daily counters for all accounts"""
@@ -266,7 +125,12 @@ def reset_daily_counters():
             print(f"📅 Reset daily counter for {account['name']}")
 
 def get_available_account() -> Optional[Dict]:
-    """Get an available Twitter account that hasn't reached daily limit and waited 1 minute"""
+    """
+    Get an available Twitter account that hasn't reached daily limit and waited 1 minute
+    
+    The account is reserved (counted and its cooldown started) before returning,
+    so concurrent replies never pick the same one; release_account undoes it.
+    """
     reset_daily_counters()
     
     now = datetime.now()
@@ -282,10 +146,18 @@ def get_available_account() -> Optional[Dict]:
             if time_since_last < timedelta(minutes=1):
                 continue
         
+        account["previous_tweet_time"] = account["last_tweet_time"]
+        account["daily_count"] += 1
+        account["last_tweet_time"] = now
         return account
     
     return None
 
+def release_account(account: Dict):
+    """Give back a reservation whose tweet wasn't sent"""
+    account["daily_count"] -= 1
+    account["last_tweet_time"] = account.get("previous_tweet_time")
+
 def build_reply_text(ticker: str, tx_signature: str) -> str:
     """Build the reply text for the tweet"""
     
@@ -335,20 +207,22 @@ async def send_twitter_reply(coin_data: Dict[str, Any], tx_signature: str):
         print(f"🔗 Replying to tweet ID: {tweet_id_str}")
         
         # Create tweet with reply - Basic plan doesn't need to read the original tweet
-        response = account["client"].create_tweet(
-            text=reply_text,
-            in_reply_to_tweet_id=tweet_id_str
-        )
+        # (tweepy blocks, so it runs in a worker thread)
+        try:
+            response = await asyncio.to_thread(
+                account["client"].create_tweet,
+                text=reply_text,
+                in_reply_to_tweet_id=tweet_id_str
+            )
+        except Exception:
+            release_account(account)
+            raise
         
         if response.data:
             print(f"✅ Reply sent successfully! Tweet ID: {response.data['id']}")
-            
-            # Update account counters
-            account["daily_count"] += 1
-            account["last_tweet_time"] = datetime.now()
-            
             return True, None
         else:
+            release_account(account)
             error_msg = "No response data from Twitter API"
             print(f"❌ Failed to send reply: {error_msg}")
             return False, error_msg
@@ -374,7 +248,7 @@ async def process_moon_token_swap(tx_signature: str, moon_token: Dict[str, Any])
         # Look for coin by ticker
         print(f"  🔍 Looking for coin with ticker: {ticker}")
         
-        result = supabase.table("coins").select("*").eq(
+        result = await supabase.table("coins").select("*").eq(
             "ticker", ticker
         ).order("created_at", desc=True).limit(1).execute()
         
@@ -387,62 +261,217 @@ async def process_moon_token_swap(tx_signature: str, moon_token: Dict[str, Any])
         print(f"     Status: {coin['status']}")
         print(f"     Tweet: @{coin['twitter_user']} - {coin['tweet_id']}")
         
-        # Check if already replied
-        existing_reply = supabase.table("twitter_reply_queue").select("*").eq(
-            "tweet_id", coin['tweet_id']
-        ).execute()
-        
-        if existing_reply.data:
-            print("  ⚠️ Already replied to this tweet")
+        # Another swap for the same coin is being replied to right now
+        if coin['tweet_id'] in replying_tweet_ids:
+            print("  ⚠️ Already replying to this tweet")
             return
-        
-        # Add to reply queue for tracking
-        queue_data = {
-            "coin_id": coin["id"],
-            "tweet_id": coin["tweet_id"],
-            "twitter_user": coin["twitter_user"],
-            "ticker": coin["ticker"],
-            "tx_signature": tx_signature,
-            "token_mint": moon_token['mint'],
-            "scheduled_at": datetime.now().isoformat(),
-            "status": "sending"
-        }
-        
-        queue_result = supabase.table("twitter_reply_queue").insert(queue_data).execute()
-        
-        # Send reply immediately
-        success, error_msg = await send_twitter_reply(coin, tx_signature)
-        
-        if success:
-            # Update queue status
-            if queue_result.data:
-                supabase.table("twitter_reply_queue").update({
-                    "status": "sent",
-                    "replied_at": datetime.now().isoformat()
-                }).eq("id", queue_result.data[0]["id"]).execute()
-        else:
-            # Update queue status
-            if queue_result.data:
-                supabase.table("twitter_reply_queue").update({
-                    "status": "failed",
-                    "error_message": error_msg or "Failed to send tweet"
-                }).eq("id", queue_result.data[0]["id"]).execute()
+        replying_tweet_ids.add(coin['tweet_id'])
+        try:
+            await reply_to_coin(coin, tx_signature, moon_token)
+        finally:
+            replying_tweet_ids.discard(coin['tweet_id'])
             
     except Exception as e:
         print(f"❌ Error processing moon token swap: {e}")
 
-async def monitor_wallet():
-    """Monitor wallet for Meteora swaps and process them"""
+async def reply_to_coin(coin: Dict[str, Any], tx_signature: str, moon_token: Dict[str, Any]):
+    """Reply to the coin's tweet once, tracked in twitter_reply_queue"""
+    # Check if already replied
+    existing_reply = await supabase.table("twitter_reply_queue").select("*").eq(
+        "tweet_id", coin['tweet_id']
+    ).execute()
+    
+    if existing_reply.data:
+        print("  ⚠️ Already replied to this tweet")
+        return
+    
+    # Add to reply queue for tracking
+    queue_data = {
+        "coin_id": coin["id"],
+        "tweet_id": coin["tweet_id"],
+        "twitter_user": coin["twitter_user"],
+        "ticker": coin["ticker"],
+        "tx_signature": tx_signature,
+        "token_mint": moon_token['mint'],
+        "scheduled_at": datetime.now().isoformat(),
+        "status": "sending"
+    }
+    
+    queue_result = await supabase.table("twitter_reply_queue").insert(queue_data).execute()
+    
+    # Send reply immediately
+    success, error_msg = await send_twitter_reply(coin, tx_signature)
+    
+    if success:
+        # Update queue status
+        if queue_result.data:
+            await supabase.table("twitter_reply_queue").update({
+                "status": "sent",
+                "replied_at": datetime.now().isoformat()
+            }).eq("id", queue_result.data[0]["id"]).execute()
+    else:
+        # Update queue status
+        if queue_result.data:
+            await supabase.table("twitter_reply_queue").update({
+                "status": "failed",
+                "error_message": error_msg or "Failed to send tweet"
+            }).eq("id", queue_result.data[0]["id"]).execute()
+
+def print_startup(mode):
     print(f"🔍 Starting Wallet Monitor & Reply Bot")
     print(f"📍 Monitoring wallet: {WALLET_ADDRESS}")
+    print(f"📡 Mode: {mode}")
     print(f"🐦 Twitter accounts loaded: {len(TWITTER_ACCOUNTS)}")
     
     for acc in TWITTER_ACCOUNTS:
         print(f"   ✓ {acc['name']}")
     
     print("\n" + "="*60 + "\n")
+
+def spawn(coroutine):
+    """Run a coroutine in the background, keeping a reference until it finishes"""
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(task_finished)
+    return task
+
+def task_finished(task):
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        print(f"Error in monitoring loop: {task.exception()}")
+
+async def handle_transaction(signature: str, tx_dict: Dict[str, Any], block_time: Optional[int] = None):
+    """Classify a fetched transaction, reply if it is a 5 USDC Meteora swap and remember it"""
+    if signature in handling_signatures or signature_store.get(signature) is not None:
+        return  # Pushed and polled at the same time
+    handling_signatures.add(signature)
+    
+    try:
+        async with swap_slots:
+            print(f"\n🔄 Checking transaction: {signature[:40]}...")
+            
+            try:
+                # One pass: Meteora program, 5 USDC leg, moon-token delta, ticker
+                swap = classify_transaction(tx_dict, WALLET_ADDRESS)
+                if block_time and not swap.block_time:
+                    swap.block_time = block_time
+                if swap.is_swap:
+                    print(f"🎯 5 USDC Meteora swap detected!")
+                    
+                    if swap.moon_mint:
+                        if not swap.ticker and token_metadata:
+                            ticker = await token_metadata.lookup(swap.moon_mint)
+                            swap.ticker = ticker.upper() if ticker else None
+                        
+                        print(f"🌙 Moon token found: {swap.moon_mint}")
+                        moon_token = {
+                            'mint': swap.moon_mint,
+                            'amount': swap.moon_amount,
+                            'timestamp': datetime.fromtimestamp(swap.block_time) if swap.block_time else None,
+                            'ticker': swap.ticker
+                        }
+                        await process_moon_token_swap(signature, moon_token)
+                    else:
+                        print("❌ No moon token found in swap")
+                classification = swap.as_dict()
+            except Exception as e:
+                print(f"Error processing transaction: {e}")
+                classification = {'error': str(e)}
+            
+            # Mark as processed
+            signature_store.add(signature, classification)
+    finally:
+        handling_signatures.discard(signature)
+
+async def process_signature(signature: str, block_time: Optional[int] = None, commitment=None) -> bool:
+    """
+    Fetch and handle one pushed signature
+    
+    Returns False when the RPC node can't return the transaction yet; it is
+    left unprocessed so the next poll picks it up.
+    """
+    tx_dict = None
+    try:
+        # Pushed signatures can be a few hundred ms ahead of getTransaction
+        for attempt in range(TX_FETCH_ATTEMPTS):
+            tx_dict = await transaction_fetcher.fetch_one(signature, commitment or Finalized)
+            if tx_dict:
+                break
+            if attempt + 1 < TX_FETCH_ATTEMPTS:
+                await asyncio.sleep(TX_FETCH_RETRY_DELAY)
+    except RPCError as e:
+        print(f"⚠️  Could not fetch {signature[:40]}...: {e}")
+    
+    if not tx_dict:
+        print("⏳ Transaction not available yet, leaving it for the next poll")
+        return False
+    
+    await handle_transaction(signature, tx_dict, block_time)
+    return True
+
+async def process_pushed_signature(signature: str, received_at: float, events: asyncio.Queue):
+    if await process_signature(signature, commitment=Confirmed):
+        print(f"⚡ Handled {time.monotonic() - received_at:.2f}s after notification")
+        return
+    
+    # Don't leave it for the safety sweep - poll again once the node has caught up
+    await asyncio.sleep(TX_FOLLOW_UP_POLL_DELAY)
+    events.put_nowait((None, time.monotonic()))
+
+async def poll_signatures(commitment=None):
+    """
+    Process every wallet transaction since last_processed_signature
+    
+    Pages backward at the RPC maximum page size until the cursor, so a burst of
+    any size between polls is drained completely. The transactions are fetched
+    in concurrent getTransaction batches (oldest batches first), and each one
+    is handled as its batch lands, up to WALLET_MAX_CONCURRENT_SWAPS at a time.
+    """
+    global last_processed_signature
+    
+    async with poll_lock:
+        signatures, pages = await fetch_signatures_since(
+            solana_client,
+            WALLET_ADDRESS,
+            until=last_processed_signature,
+            max_age=RECENT_WINDOW_SECONDS,
+            commitment=commitment
+        )
+        
+        if pages > 1:
+            print(f"📚 Drained {len(signatures)} signatures in {pages} pages")
+        
+        # Only process recent transactions (last 30 minutes) not seen yet
+        block_times = {}
+        for sig_info in signatures:
+            signature = str(sig_info.signature)
+            block_time = sig_info.block_time if hasattr(sig_info, 'block_time') else None
+            is_recent = not block_time or time.time() - block_time <= RECENT_WINDOW_SECONDS
+            if is_recent and signature_store.get(signature) is None:
+                block_times[signature] = block_time
+        
+        waiting = set(block_times)
+        handlers = []
+        async for signature, tx_dict in transaction_fetcher.fetch(block_times, commitment or Finalized):
+            if not tx_dict:
+                print(f"⏳ {signature[:40]}... not available yet, leaving it for the next poll")
+                continue
+            handlers.append(asyncio.create_task(handle_transaction(signature, tx_dict, block_times[signature])))
+            waiting.discard(signature)
+        await asyncio.gather(*handlers)
+        
+        # The cursor only moves past transactions that were handled, so one the
+        # node couldn't return is listed again next time
+        for sig_info in signatures:
+            signature = str(sig_info.signature)
+            if signature in waiting:
+                break
+            last_processed_signature = signature
+
+async def monitor_wallet():
+    """Monitor wallet for Meteora swaps by polling"""
+    print_startup(f"polling every {WALLET_POLL_INTERVAL}s")
     
-    global processed_signatures
     check_count = 0
     
     while True:
@@ -450,79 +479,64 @@ async def monitor_wallet():
             check_count += 1
             if check_count % 10 == 1:  # Log every 10th check
                 print(f"\n⏰ Check #{check_count} at {datetime.now().strftime('%H:%M:%S')}")
+                print(signature_store.report())
+                print(transaction_fetcher.report())
+                if token_metadata:
+                    print(token_metadata.report())
             
-            # Get recent signatures for the wallet
-            pubkey = Pubkey.from_string(WALLET_ADDRESS)
-            
-            # Get last 10 transactions
-            signatures_resp = solana_client.get_signatures_for_address(
-                pubkey,
-                limit=10
-            )
-            
-            # Handle new response format
-            signatures = signatures_resp.value if hasattr(signatures_resp, 'value') else signatures_resp
-            
-            if signatures:
-                # Process each transaction (reversed - oldest first)
-                for sig_info in reversed(signatures):
-                    signature = str(sig_info.signature)
-                    
-                    # Skip if already processed
-                    if signature in processed_signatures:
-                        continue
-                    
-                    # Only process recent transactions (last 30 minutes)
-                    if hasattr(sig_info, 'block_time') and sig_info.block_time:
-                        tx_time = datetime.fromtimestamp(sig_info.block_time)
-                        if datetime.now() - tx_time > timedelta(minutes=30):
-                            continue
-                    
-                    print(f"\n🔄 Checking transaction: {signature[:40]}...")
-                    
-                    # Get transaction details
-                    try:
-                        tx_resp = solana_client.get_transaction(
-                            sig_info.signature,
-                            encoding="jsonParsed",
-                            max_supported_transaction_version=0
-                        )
-                        
-                        if tx_resp and tx_resp.value:
-                            # Convert to JSON
-                            tx_json = tx_resp.value.to_json()
-                            tx_dict = json.loads(tx_json)
-                            
-                            # Check if this is a Meteora swap
-                            swap_info = check_if_meteora_swap(tx_dict)
-                            if swap_info and swap_info.get('has_5_usdc'):
-                                print(f"🎯 5 USDC Meteora swap detected!")
-                                
-                                # Extract moon token
-                                block_time = sig_info.block_time if hasattr(sig_info, 'block_time') else None
-                                moon_token = extract_moon_token_from_swap(tx_dict, block_time)
-                                
-                                if moon_token:
-                                    print(f"🌙 Moon token found: {moon_token['mint']}")
-                                    await process_moon_token_swap(signature, moon_token)
-                                else:
-                                    print("❌ No moon token found in swap")
-                    except Exception as e:
-                        print(f"Error processing transaction: {e}")
-                    
-                    # Mark as processed
-                    processed_signatures.add(signature)
-                
-                # Memory optimization
-                if len(processed_signatures) > 100:
-                    processed_signatures = set(list(processed_signatures)[-50:])
+            await poll_signatures()
             
             # Wait before next check
-            await asyncio.sleep(30)  # Check every 30 seconds
+            await asyncio.sleep(WALLET_POLL_INTERVAL)
             
         except Exception as e:
             print(f"Error in monitoring loop: {e}")
-            await asyncio.sleep(30)
+            await asyncio.sleep(WALLET_POLL_INTERVAL)
+
+async def monitor_wallet_subscription():
+    """
+    Monitor wallet for Meteora swaps via RPC websocket notifications
+    
+    Each pushed signature is fetched and handled in its own task, so swaps
+    arriving together overlap. After every (re)subscribe, on accountSubscribe
+    notifications, shortly after a pushed transaction the node couldn't return
+    yet and on a slow safety sweep, the recent signatures are polled instead,
+    which fills any gap left by a disconnect. While the socket is down
+    it falls back to polling every WALLET_POLL_INTERVAL.
+    """
+    print_startup(f"{WALLET_SUBSCRIPTION}Subscribe (sweep every {WALLET_SWEEP_INTERVAL}s)")
+    
+    # (signature, received_at); a None signature means "poll for what's new"
+    events = asyncio.Queue()
+    
+    subscription = WalletSubscription(
+        build_ws_url(HELIUS_RPC),
+        WALLET_ADDRESS,
+        on_signature=lambda signature, slot: events.put_nowait((signature, time.monotonic())),
+        on_subscribed=lambda: events.put_nowait((None, time.monotonic())),
+        on_disconnect=lambda error: print(f"⚠️  Wallet subscription lost ({error}), polling until it is back"),
+        mode=WALLET_SUBSCRIPTION
+    )
+    subscription_task = asyncio.create_task(subscription.run_forever())
+    
+    try:
+        while True:
+            timeout = WALLET_SWEEP_INTERVAL if subscription.subscribed else WALLET_POLL_INTERVAL
+            try:
+                signature, received_at = await asyncio.wait_for(events.get(), timeout)
+            except asyncio.TimeoutError:
+                signature, received_at = None, None
+                print(signature_store.report())
+                print(transaction_fetcher.report())
+                if token_metadata:
+                    print(token_metadata.report())
+            
+            if signature is None:
+                spawn(poll_signatures(Confirmed))
+            elif signature_store.get(signature) is None:
+                spawn(process_pushed_signature(signature, received_at, events))
+    finally:
+        subscription_task.cancel()
 
 async def create_reply_queue_table():
     """Create reply queue table if not exists"""
@@ -531,11 +545,50 @@ async def create_reply_queue_table():
 
 async def main():
     """Main function"""
+    global supabase, signature_store, token_metadata, transaction_fetcher, swap_slots, poll_lock
+    
+    # asyncio primitives bind to the loop they are first used on (3.10+) or
+    # created on (3.9), so none of them are made at import time
+    swap_slots = asyncio.Semaphore(WALLET_MAX_CONCURRENT_SWAPS)
+    poll_lock = asyncio.Lock()
+    transaction_fetcher = TransactionFetcher(
+        HELIUS_RPC,
+        concurrency=int(os.getenv("WALLET_RPC_CONCURRENCY", "4")),
+        batch_size=int(os.getenv("WALLET_RPC_BATCH_SIZE", "10")),
+        timeout=float(os.getenv("WALLET_RPC_TIMEOUT", "10"))
+    )
+    
+    state_db = os.getenv("WALLET_STATE_DB", os.path.join(ROOT_DIR, "data", "wallet_monitor.sqlite"))
+    supabase = await acreate_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    signature_store = SignatureStore(
+        state_db,
+        window_seconds=float(os.getenv("SIGNATURE_WINDOW", str(2 * RECENT_WINDOW_SECONDS)))
+    )
+    metadata_url = helius_metadata_url(HELIUS_RPC)
+    if metadata_url:
+        token_metadata = TokenMetadataService(
+            metadata_url,
+            state_db,
+            ttl=float(os.getenv("METADATA_CACHE_TTL", str(7 * 24 * 3600))),
+            maxsize=int(os.getenv("METADATA_CACHE_SIZE", "10000")),
+            batch_window=float(os.getenv("METADATA_BATCH_WINDOW", "0.05"))
+        )
+    
     # Ensure reply queue table exists
     await create_reply_queue_table()
     
     # Start monitoring
-    await monitor_wallet()
+    try:
+        if WALLET_SUBSCRIPTION == 'off':
+            await monitor_wallet()
+        else:
+            await monitor_wallet_subscription()
+    finally:
+        await transaction_fetcher.close()
+        if token_metadata:
+            await token_metadata.close()
+        await solana_client.close()
+        signature_store.close()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Admission Control for MemeXshot Automation
+Estimates queue wait from cached queue depth and an EWMA of per-coin service
+time, and sheds load when the expected wait exceeds the configured SLO
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from scripts.utils.retry import parse_timestamp
+
+# Actions taken when the expected wait exceeds the SLO
+ACTION_REJECT = 'reject'  # Reject new requests with an error_message
+ACTION_DEFER = 'defer'    # Push low-priority requests back via next_attempt_at
+ACTION_QUOTA = 'quota'    # Lower the per-user daily quota
+
+class AdmissionController:
+    def __init__(self, supabase, log=print):
+        self.supabase = supabase
+        self.log = log
+
+        # Config (SLO of 0 disables admission control)
+        self.slo_seconds = float(os.getenv('ADMISSION_SLO_SECONDS', '0'))
+        self.action = os.getenv('ADMISSION_ACTION', ACTION_REJECT)
+        self.priority_followers = int(os.getenv('ADMISSION_PRIORITY_FOLLOWERS', '1000'))  # At or above: never deferred
+        self.refresh_interval = float(os.getenv('ADMISSION_REFRESH_SECONDS', '60'))
+        self.alpha = float(os.getenv('ADMISSION_EWMA_ALPHA', '0.2'))
+        self.max_active = max(int(os.getenv('MAX_ACTIVE_COINS', '1')), 1)
+        self.max_queue_age = float(os.getenv('ADMISSION_MAX_QUEUE_AGE', '0'))  # Seconds, 0 = never expire
+
+        # Cached estimates
+        self.service_time = float(os.getenv('ADMISSION_DEFAULT_SERVICE_SECONDS', '300'))  # EWMA seed
+        self.queue_depth = 0
+        self.last_refresh = 0
+        self.last_completion = None  # processed_at watermark of the last completion fed to the EWMA
+
+    @property
+    def enabled(self):
+        return self.slo_seconds > 0
+
+    def observe_service_time(self, seconds):
+        """Feed one completion duration into the EWMA"""
+        if seconds <= 0:
+            return
+        self.service_time = self.alpha * seconds + (1 - self.alpha) * self.service_time
+
+    def expected_wait(self):
+        """Expected seconds a newly queued request waits before its coin completes"""
+        return (self.queue_depth + 1) * self.service_time / self.max_active
+
+    def refresh(self, force=False):
+        """Refresh queue depth and service time from the DB at most once per refresh interval"""
+        if not self.enabled:
+            return
+        if not force and time.time() - self.last_refresh < self.refresh_interval:
+            return
+
+        self.last_refresh = time.time()
+
+        try:
+            depth = self.supabase.table('tweet_queue')\
+                .select('id', count='exact')\
+                .eq('status', 'queued')\
+                .limit(1)\
+                .execute()
+            self.queue_depth = depth.count or 0
+
+            # Only completions we haven't seen yet
+            query = self.supabase.table('coins')\
+                .select('created_at, processing_started_at, processed_at')\
+                .eq('status', 'completed')\
+                .not_.is_('processed_at', 'null')\
+                .order('processed_at')\
+                .limit(100)
+            if self.last_completion:
+                query = query.gt('processed_at', self.last_completion)
+
+            for coin in query.execute().data or []:
+                # Service time runs from the processing claim. Rows completed before
+                # processing_started_at existed fall back to created_at, which also
+                # counts time spent waiting (only exact when MAX_ACTIVE_COINS=1)
+                started = parse_timestamp(coin.get('processing_started_at') or coin['created_at'])
+                finished = parse_timestamp(coin['processed_at'])
+                self.observe_service_time((finished - started).total_seconds())
+                self.last_completion = coin['processed_at']
+
+        except Exception as e:
+            self.log(f"⚠️  Error refreshing admission estimates: {e}")
+
+    def record_admitted(self):
+        """Account for a newly queued request without re-reading the queue"""
+        self.queue_depth += 1
+
+    def daily_quota(self, max_daily_per_user):
+        """Per-user daily quota scaled down by how far the expected wait is over the SLO"""
+        wait = self.expected_wait()
+        if not self.enabled or wait <= self.slo_seconds:
+            return max_daily_per_user
+        return max(1, int(max_daily_per_user * self.slo_seconds / wait))
+
+    def admit(self, followers_count=0):
+        """
+        Decide whether a new request may join the queue
+
+        Args:
+            followers_count: Requester's follower count (priority for deferral)
+
+        Returns:
+            Dict with 'action' ('admit', 'reject', 'defer' or 'quota'), 'expected_wait',
+            and 'error_message' / 'defer_seconds' when relevant
+        """
+        self.refresh()
+
+        wait = self.expected_wait()
+        decision = {'action': 'admit', 'expected_wait': wait}
+
+        if not self.enabled or wait <= self.slo_seconds:
+            return decision
+
+        if self.action == ACTION_REJECT:
+            decision['action'] = ACTION_REJECT
+            decision['error_message'] = (
+                f"Queue overloaded: expected wait {int(wait // 60)} min exceeds "
+                f"{int(self.slo_seconds // 60)} min limit, please try again later"
+            )
+        elif self.action == ACTION_DEFER and followers_count < self.priority_followers:
+            decision['action'] = ACTION_DEFER
+            decision['defer_seconds'] = wait - self.slo_seconds
+        elif self.action == ACTION_QUOTA:
+            decision['action'] = ACTION_QUOTA
+
+        return decision
+
+    def stale_cutoff(self):
+        """ISO timestamp before which queued requests are considered expired, or None"""
+        if not self.enabled or self.max_queue_age <= 0:
+            return None
+        return (datetime.now(timezone.utc) - timedelta(seconds=self.max_queue_age)).isoformat()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Image Download Engine for MemeXshot Automation
+Keep-alive connection pool, chunked streaming to a temp file with atomic
+rename, max-bytes guard, bounded concurrency and transient/permanent failure
+classification
+"""
+
+import os
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scripts.utils.validation import IMAGE_MAX_BYTES
+
+# HTTP statuses that retrying the same URL won't fix (deleted tweet media is 404)
+PERMANENT_STATUSES = {400, 404, 410, 414, 451}
+
+class PermanentDownloadError(Exception):
+    """The URL will never yield a usable image"""
+
+class DownloadTooLarge(PermanentDownloadError):
+    pass
+
+class NotAnImage(PermanentDownloadError):
+    pass
+
+class DownloadEngine:
+    def __init__(self, max_workers=4, max_bytes=IMAGE_MAX_BYTES, timeout=30, chunk_size=64 * 1024, log=print):
+        """
+        Args:
+            max_workers: Concurrent downloads (and pooled connections per host)
+            max_bytes: Abort downloads larger than this
+            timeout: Connect/read timeout in seconds
+            chunk_size: Streaming chunk size in bytes
+            log: Logger callable
+        """
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.log = log
+
+        # One session - connections (and TLS sessions) are reused across downloads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='download')
+
+        self.downloads = 0
+        self.failures = 0
+        self.bytes_downloaded = 0
+        self.total_ttfb = 0.0
+        self.total_elapsed = 0.0
+
+    def download(self, url, filepath):
+        """
+        Stream one URL to filepath (replaced atomically, never left half-written)
+
+        Returns:
+            Dict with ok, status, bytes, ttfb, elapsed, bytes_per_sec, error and
+            permanent (failure that retrying won't fix: 404/410, too large, not an image)
+        """
+        result = {'url': url, 'path': filepath, 'ok': False, 'status': None, 'bytes': 0, 'ttfb': None,
+                  'elapsed': 0.0, 'bytes_per_sec': 0.0, 'error': None, 'permanent': False}
+        started = time.perf_counter()
+        temp_path = None
+
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                result['ttfb'] = time.perf_counter() - started
+                result['status'] = response.status_code
+                response.raise_for_status()
+
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and not content_type.startswith(('image/', 'application/octet-stream')):
+                    raise NotAnImage(f"content-type {content_type}")
+
+                declared = int(response.headers.get('Content-Length') or 0)
+                if declared > self.max_bytes:
+                    raise DownloadTooLarge(f"{declared} bytes declared (limit {self.max_bytes})")
+
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or '.', suffix='.part')
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        result['bytes'] += len(chunk)
+                        if result['bytes'] > self.max_bytes:
+                            raise DownloadTooLarge(f"over {self.max_bytes} bytes")
+                        f.write(chunk)
+
+            os.replace(temp_path, filepath)
+            temp_path = None
+            result['ok'] = True
+
+        except Exception as e:
+            result['error'] = str(e)
+            # Timeouts, connection errors, 5xx and 429 are worth retrying
+            result['permanent'] = isinstance(e, PermanentDownloadError) or result['status'] in PERMANENT_STATUSES
+
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        result['elapsed'] = time.perf_counter() - started
+        if result['elapsed'] > 0:
+            result['bytes_per_sec'] = result['bytes'] / result['elapsed']
+        self.record(result)
+        return result
+
+    def download_many(self, jobs):
+        """Download (url, filepath) pairs concurrently; results in job order"""
+        return list(self.executor.map(lambda job: self.download(*job), jobs))
+
+    def record(self, result):
+        self.downloads += 1
+        if not result['ok']:
+            self.failures += 1
+        self.bytes_downloaded += result['bytes']
+        self.total_ttfb += result['ttfb'] or 0
+        self.total_elapsed += result['elapsed']
+
+    def report(self):
+        if not self.downloads:
+            return "📥 No downloads yet"
+        return (f"📥 {self.downloads} download(s), {self.failures} failed, "
+                f"{self.bytes_downloaded / 1024 / 1024:.1f} MB, "
+                f"avg TTFB {self.total_ttfb / self.downloads * 1000:.0f} ms, "
+                f"avg {self.bytes_downloaded / max(self.total_elapsed, 1e-9) / 1024:.0f} KB/s per request")
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
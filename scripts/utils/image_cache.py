@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Image Cache for MemeXshot Automation
+Image files keyed by sha256 on disk, a persistent SQLite index from URL to
+digest, and LRU eviction under a disk budget (evicted images keep their index
+rows, so "already imported" survives eviction). Images may be stored already
+normalized, with the size of the original download kept alongside. URLs that
+can never yield an image are remembered too (negative cache)
+"""
+
+import os
+import time
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+class ImageCache:
+    def __init__(self, directory, max_bytes=500 * 1024 * 1024, log=print):
+        """
+        Args:
+            directory: Cache root (blobs under <digest[:2]>/<digest>, index in index.sqlite)
+            max_bytes: Disk budget; least recently used blobs are evicted past it
+            log: Logger callable
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.log = log
+        os.makedirs(directory, exist_ok=True)
+
+        # Shared by photo sync's pipeline threads - every access holds the lock
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                cached INTEGER NOT NULL DEFAULT 1,
+                last_used REAL NOT NULL,
+                imported_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                original_bytes INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS failed_urls (
+                url TEXT PRIMARY KEY,
+                reason TEXT NOT NULL,
+                failed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_blobs_last_used ON blobs(cached, last_used);
+            CREATE INDEX IF NOT EXISTS idx_urls_digest ON urls(digest);
+        ''')
+        # Caches created before normalized entries existed
+        columns = [row[1] for row in self.db.execute('PRAGMA table_info(urls)')]
+        if 'original_bytes' not in columns:
+            self.db.execute('ALTER TABLE urls ADD COLUMN original_bytes INTEGER')
+        self.db.commit()
+
+        self.lookups = 0
+        self.hits = 0
+        self.bytes_saved = 0
+        self.negative_hits = 0
+
+    def blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def digest_for(self, url):
+        """Digest of a cached URL whose blob is still on disk, or None"""
+        with self.lock:
+            row = self.db.execute(
+                'SELECT u.digest, b.size FROM urls u JOIN blobs b ON b.digest = u.digest '
+                'WHERE u.url = ? AND b.cached = 1', (url,)
+            ).fetchone()
+            if row and os.path.exists(self.blob_path(row[0])):
+                return row
+            return None
+
+    def fetch(self, url, filepath):
+        """Copy a cached image for url to filepath; returns True on a hit"""
+        with self.lock:
+            self.lookups += 1
+            row = self.digest_for(url)
+            if not row:
+                return False
+
+            digest, size = row
+            shutil.copyfile(self.blob_path(digest), filepath)
+            self.db.execute('UPDATE blobs SET last_used = ? WHERE digest = ?', (time.time(), digest))
+            self.db.commit()
+
+            self.hits += 1
+            self.bytes_saved += size
+            return True
+
+    def put(self, url, filepath, original_bytes=None):
+        """
+        Store a file (left in place) under its sha256; returns the digest
+
+        Args:
+            original_bytes: Size of the original download when filepath is a normalized copy
+        """
+        sha = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        size = os.path.getsize(filepath)
+
+        with self.lock:
+            path = self.blob_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+                os.close(fd)
+                shutil.copyfile(filepath, temp_path)
+                os.replace(temp_path, path)
+
+            now = time.time()
+            self.db.execute(
+                'INSERT INTO blobs (digest, size, last_used) VALUES (?, ?, ?) '
+                'ON CONFLICT(digest) DO UPDATE SET cached = 1, last_used = excluded.last_used',
+                (digest, size, now)
+            )
+            self.db.execute(
+                'INSERT OR REPLACE INTO urls (url, digest, fetched_at, original_bytes) VALUES (?, ?, ?, ?)',
+                (url, digest, now, original_bytes)
+            )
+            self.db.commit()
+
+            self.evict()
+            return digest
+
+    def contains(self, url):
+        with self.lock:
+            return self.digest_for(url) is not None
+
+    def original_bytes(self, url):
+        """Original download size if url is cached as a normalized copy, else None"""
+        with self.lock:
+            row = self.db.execute('SELECT original_bytes FROM urls WHERE url = ?', (url,)).fetchone()
+            return row[0] if row else None
+
+    def was_imported(self, url):
+        """The image behind url (or identical content under another URL) is already in Photos"""
+        with self.lock:
+            row = self.db.execute(
+                'SELECT b.imported_at FROM urls u JOIN blobs b ON b.digest = u.digest WHERE u.url = ?', (url,)
+            ).fetchone()
+            return bool(row and row[0])
+
+    def mark_imported(self, url):
+        with self.lock:
+            self.db.execute(
+                'UPDATE blobs SET imported_at = ? WHERE digest = (SELECT digest FROM urls WHERE url = ?)',
+                (time.time(), url)
+            )
+            self.db.commit()
+
+    def mark_failed(self, url, reason):
+        """Remember that url permanently fails (404, not an image, invalid image...)"""
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO failed_urls (url, reason, failed_at) VALUES (?, ?, ?)',
+                (url, reason, time.time())
+            )
+            self.db.commit()
+
+    def failure_for(self, url):
+        """Reason url is known bad, or None"""
+        with self.lock:
+            row = self.db.execute('SELECT reason FROM failed_urls WHERE url = ?', (url,)).fetchone()
+            if row:
+                self.negative_hits += 1
+            return row[0] if row else None
+
+    def total_bytes(self):
+        with self.lock:
+            return self.db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs WHERE cached = 1').fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used blobs until the cache fits its budget"""
+        with self.lock:
+            total = self.total_bytes()
+            if total <= self.max_bytes:
+                return 0
+
+            evicted = 0
+            for digest, size in self.db.execute(
+                    'SELECT digest, size FROM blobs WHERE cached = 1 ORDER BY last_used').fetchall():
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self.blob_path(digest))
+                except FileNotFoundError:
+                    pass
+                self.db.execute('UPDATE blobs SET cached = 0 WHERE digest = ?', (digest,))
+                total -= size
+                evicted += 1
+
+            self.db.commit()
+            self.log(f"🧹 Evicted {evicted} cached image(s), cache now {total / 1024 / 1024:.1f} MB")
+            return evicted
+
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def report(self):
+        return (f"🗄️  Image cache: {self.hits}/{self.lookups} hits ({self.hit_rate():.0%}), "
+                f"{self.bytes_saved / 1024 / 1024:.1f} MB saved, "
+                f"{self.total_bytes() / 1024 / 1024:.1f}/{self.max_bytes / 1024 / 1024:.0f} MB used, "
+                f"{self.negative_hits} known-bad URL(s) skipped")
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Perceptual Image Hashing for MemeXshot Automation
+64-bit dHash/pHash computed with numpy, plus a multi-index hash table for
+finding near-duplicate launch images within a Hamming distance
+"""
+
+import time
+from itertools import combinations
+
+import numpy as np
+from PIL import Image
+
+HASH_SIZE = 8  # 8x8 bits = 64-bit hashes
+
+def bits_to_int(bits):
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), 'big')
+
+def dhash(path, hash_size=HASH_SIZE):
+    """Difference hash: is each pixel brighter than its left neighbour (9x8 grayscale)"""
+    with Image.open(path) as img:
+        pixels = np.asarray(img.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS), dtype=np.int16)
+    return bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+def dct_matrix(n):
+    """Orthonormal DCT-II basis"""
+    k = np.arange(n)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+def phash(path, hash_size=HASH_SIZE, highfreq_factor=4):
+    """DCT hash: low-frequency 8x8 DCT coefficients of a 32x32 grayscale versus their median"""
+    size = hash_size * highfreq_factor
+    with Image.open(path) as img:
+        pixels = np.asarray(img.convert('L').resize((size, size), Image.LANCZOS), dtype=np.float64)
+    dct = dct_matrix(size)
+    low = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    return bits_to_int(low > np.median(low))
+
+ALGORITHMS = {'dhash': dhash, 'phash': phash}
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+def format_hash(algorithm, value):
+    """Stored form, e.g. 'dhash:8f3c...' (hashes from different algorithms never compare)"""
+    return f"{algorithm}:{value:016x}"
+
+def parse_hash(stored):
+    algorithm, _, value = stored.partition(':')
+    return algorithm, int(value, 16)
+
+class MultiIndexHash:
+    """
+    Multi-index hashing over Hamming distance
+
+    Hashes are split into m = max_distance // 2 + 1 chunks, each indexed in its
+    own table. Anything within max_distance of a query is within
+    max_distance // m of it in at least one chunk (pigeonhole), so a lookup
+    only probes chunk values one bit-flip away instead of scanning the history.
+    """
+
+    def __init__(self, max_distance, bits=64):
+        chunks = max_distance // 2 + 1
+        self.max_distance = max_distance
+        self.chunk_radius = max_distance // chunks  # 0 or 1
+
+        self.spans = []  # (shift, width) per chunk
+        shift = 0
+        for i in range(chunks):
+            width = bits // chunks + (1 if i < bits % chunks else 0)
+            self.spans.append((shift, width))
+            shift += width
+
+        self.tables = [{} for _ in self.spans]  # chunk value -> [(value, item)]
+        self.size = 0
+
+    def add(self, value, item):
+        entry = (value, item)
+        for table, (shift, width) in zip(self.tables, self.spans):
+            table.setdefault((value >> shift) & ((1 << width) - 1), []).append(entry)
+        self.size += 1
+
+    def probes(self, key, width):
+        """Chunk values within chunk_radius of key"""
+        keys = [key]
+        for radius in range(1, self.chunk_radius + 1):
+            for flipped in combinations(range(width), radius):
+                probe = key
+                for bit in flipped:
+                    probe ^= 1 << bit
+                keys.append(probe)
+        return keys
+
+    def search(self, value):
+        """All (distance, item) within max_distance, nearest first"""
+        found = []
+        seen = set()
+        for table, (shift, width) in zip(self.tables, self.spans):
+            for probe in self.probes((value >> shift) & ((1 << width) - 1), width):
+                for entry in table.get(probe, ()):
+                    if id(entry) in seen:
+                        continue
+                    seen.add(id(entry))
+                    distance = hamming(value, entry[0])
+                    if distance <= self.max_distance:
+                        found.append((distance, entry[1]))
+
+        found.sort(key=lambda match: match[0])
+        return found
+
+class ImageHashIndex:
+    def __init__(self, algorithm='dhash', max_distance=6, log=print):
+        """
+        Args:
+            algorithm: 'dhash' or 'phash'
+            max_distance: Hamming distance (of 64 bits) that counts as a near duplicate
+            log: Logger callable
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown image hash algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.max_distance = max_distance
+        self.log = log
+        self.table = MultiIndexHash(max_distance)
+
+    def compute(self, path):
+        """Stored-form hash of an image file"""
+        return format_hash(self.algorithm, ALGORITHMS[self.algorithm](path))
+
+    def add(self, stored_hash, coin_id, ticker):
+        algorithm, value = parse_hash(stored_hash)
+        if algorithm == self.algorithm:
+            self.table.add(value, (coin_id, ticker))
+
+    def find_duplicate(self, stored_hash, exclude_id=None):
+        """
+        Nearest indexed image within max_distance
+
+        Returns:
+            (distance, coin_id, ticker) or None
+        """
+        algorithm, value = parse_hash(stored_hash)
+        if algorithm != self.algorithm:
+            return None
+
+        for distance, (coin_id, ticker) in self.table.search(value):
+            if coin_id != exclude_id:
+                return distance, coin_id, ticker
+        return None
+
+    def rebuild(self, supabase, table, page_size=1000):
+        """Load every stored hash from the database"""
+        started = time.perf_counter()
+        self.table = MultiIndexHash(self.max_distance)
+        offset = 0
+
+        while True:
+            rows = supabase.table(table)\
+                .select('id, ticker, image_hash')\
+                .like('image_hash', f'{self.algorithm}:%')\
+                .order('created_at')\
+                .range(offset, offset + page_size - 1)\
+                .execute().data or []
+
+            for row in rows:
+                self.add(row['image_hash'], row['id'], row['ticker'])
+
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        self.log(f"🧬 Indexed {self.table.size} image hash(es) in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return self.table.size
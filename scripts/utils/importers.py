@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Photo Importers for MemeXshot Automation
+One import_batch(paths) interface: AppleScript into macOS Photos (a whole
+batch per osascript run) or a watched drop folder (Linux/testing)
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+from abc import ABC, abstractmethod
+
+class Importer(ABC):
+    """Interface for photo library backends"""
+
+    name = 'importer'
+
+    def __init__(self):
+        self.batches = 0
+        self.images = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+
+    @abstractmethod
+    def import_files(self, paths):
+        """Import files; return the set of paths that made it into the library"""
+
+    def import_batch(self, paths):
+        """Import a batch, recording per-batch/per-image timing"""
+        started = time.perf_counter()
+        imported = self.import_files(paths)
+        elapsed = time.perf_counter() - started
+
+        self.batches += 1
+        self.images += len(paths)
+        self.failures += len(paths) - len(imported)
+        self.total_seconds += elapsed
+        return imported, elapsed
+
+    def report(self):
+        if not self.batches:
+            return f"🖼️  {self.name}: no imports yet"
+        return (f"🖼️  {self.name}: {self.images} image(s) in {self.batches} batch(es), "
+                f"{self.total_seconds / self.batches:.2f}s per batch, "
+                f"{self.total_seconds / self.images:.2f}s per image, {self.failures} failed")
+
+class AppleScriptImporter(Importer):
+    """Import into macOS Photos with one osascript run per batch"""
+
+    name = 'applescript'
+
+    def __init__(self, settle_seconds=3, log=print):
+        """
+        Args:
+            settle_seconds: Delay after the import so Photos finishes processing (once per batch,
+                as is bringing Photos to the front)
+            log: Logger callable
+        """
+        super().__init__()
+        self.settle_seconds = settle_seconds
+        self.log = log
+
+    def build_script(self, paths):
+        files = ', '.join(f'POSIX file "{path}"' for path in paths)
+        return f'''
+        tell application "Photos"
+            activate
+            delay 1
+            import {{{files}}} skip check duplicates true
+            delay {self.settle_seconds}
+        end tell
+        '''
+
+    def import_files(self, paths):
+        try:
+            process = subprocess.run(
+                ['osascript', '-e', self.build_script(paths)],
+                capture_output=True,
+                text=True
+            )
+        except Exception as e:
+            self.log(f"❌ Failed to import to Photos: {e}")
+            return set()
+
+        if process.returncode != 0:
+            self.log(f"⚠️  AppleScript error: {process.stderr}")
+            return set()
+
+        return set(paths)
+
+class DropFolderImporter(Importer):
+    """Hand files to whatever watches a drop folder (atomic rename, so watchers never see partial files)"""
+
+    name = 'drop-folder'
+
+    def __init__(self, folder, log=print):
+        super().__init__()
+        self.folder = folder
+        self.log = log
+        os.makedirs(folder, exist_ok=True)
+
+    def import_files(self, paths):
+        imported = set()
+        for path in paths:
+            fd, temp_path = tempfile.mkstemp(dir=self.folder, prefix='.', suffix='.part')
+            os.close(fd)
+            try:
+                shutil.copyfile(path, temp_path)
+                os.replace(temp_path, os.path.join(self.folder, os.path.basename(path)))
+                imported.add(path)
+            except Exception as e:
+                self.log(f"❌ Failed to drop {os.path.basename(path)}: {e}")
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return imported
+
+def build_importer(log=print):
+    """Importer from PHOTO_IMPORTER (applescript on macOS, drop folder elsewhere)"""
+    backend = os.getenv('PHOTO_IMPORTER', 'applescript' if sys.platform == 'darwin' else 'folder')
+
+    if backend == 'applescript':
+        return AppleScriptImporter(settle_seconds=float(os.getenv('PHOTOS_SETTLE_SECONDS', '3')), log=log)
+    if backend == 'folder':
+        folder = os.path.expanduser(os.getenv('PHOTO_DROP_FOLDER', '~/Pictures/MoonshotDropFolder'))
+        return DropFolderImporter(folder, log=log)
+    raise ValueError(f"Unknown PHOTO_IMPORTER: {backend}")
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Bounded LRU Containers for MemeXshot Automation
+Keep long-running services at constant memory
+"""
+
+from collections import OrderedDict
+
+class LRUSet:
+    """Set that forgets its least recently added/touched members beyond maxsize"""
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def add(self, item):
+        self._items[item] = None
+        self._items.move_to_end(item)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def discard(self, item):
+        self._items.pop(item, None)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Image Normalization for MemeXshot Automation
+Validate, strip metadata, downscale and re-encode downloaded images to one
+JPEG format in a process pool, so Photos and the launch UI get small, uniform files
+"""
+
+import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image, ImageOps
+
+from scripts.utils.validation import sniff_image_format, validate_image
+
+def empty_result(path, error=None):
+    return {
+        'path': path,
+        'ok': False,
+        'reason': None,
+        'error': error,
+        'format': None,
+        'original_bytes': None,
+        'normalized_bytes': None,
+        'original_size': None,
+        'normalized_size': None,
+        'seconds': 0.0
+    }
+
+def normalize_image(path, max_side=1024, quality=85):
+    """
+    Rewrite an image in place as a metadata-free RGB JPEG no larger than max_side
+
+    Runs in pool workers, so it only takes and returns plain values.
+
+    Returns:
+        Dict with ok, reason (validation failure - reject the coin), error
+        (normalization failed - the original is left in place), original/normalized
+        bytes and dimensions, source format and seconds spent
+    """
+    started = time.perf_counter()
+    result = empty_result(path)
+
+    try:
+        result['original_bytes'] = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            result['format'] = sniff_image_format(f.read(16))
+
+        # Magic bytes, limits and a full decode - same rules the listener relies on
+        result['reason'] = validate_image(path)
+        if result['reason']:
+            return result
+
+        with Image.open(path) as img:
+            result['original_size'] = img.size
+            img = ImageOps.exif_transpose(img)  # Keep the orientation once EXIF is gone
+
+            if img.mode in ('RGBA', 'LA', 'P'):
+                # Flatten transparency onto white (JPEG has no alpha)
+                img = img.convert('RGBA')
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel('A'))
+                img = background
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            img.thumbnail((max_side, max_side), Image.LANCZOS)
+            result['normalized_size'] = img.size
+
+            # Fresh pixel copy: no EXIF, ICC, XMP or text chunks carried over
+            clean = Image.new('RGB', img.size)
+            clean.paste(img)
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.part')
+        os.close(fd)
+        try:
+            clean.save(temp_path, 'JPEG', quality=quality, optimize=True)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        result['normalized_bytes'] = os.path.getsize(path)
+        result['ok'] = True
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    finally:
+        result['seconds'] = time.perf_counter() - started
+
+    return result
+
+class ImageNormalizer:
+    def __init__(self, workers=2, max_side=1024, quality=85, log=print):
+        """
+        Args:
+            workers: Worker processes (0 normalizes in the calling process)
+            max_side: Longest side of normalized images in pixels
+            quality: JPEG quality of normalized images
+            log: Logger callable
+        """
+        self.workers = workers
+        self.max_side = max_side
+        self.quality = quality
+        self.log = log
+        self.pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+
+        self.lock = threading.Lock()  # Stats are updated from several pipeline threads
+        self.normalized = 0
+        self.failed = 0
+        self.original_bytes = 0
+        self.normalized_bytes = 0
+        self.total_seconds = 0.0
+
+    def record(self, result):
+        with self.lock:
+            if result['ok']:
+                self.normalized += 1
+                self.original_bytes += result['original_bytes']
+                self.normalized_bytes += result['normalized_bytes']
+                self.total_seconds += result['seconds']
+            elif result['error']:
+                self.failed += 1
+        return result
+
+    def normalize(self, path):
+        """Normalize one image (in the pool when there is one)"""
+        if self.pool:
+            return self.normalize_many([path])[path]
+        return self.record(normalize_image(path, self.max_side, self.quality))
+
+    def normalize_many(self, paths):
+        """
+        Normalize a batch of images in parallel
+
+        Returns:
+            Dict of path -> result (see normalize_image)
+        """
+        paths = list(paths)
+        if not self.pool:
+            return {path: self.normalize(path) for path in paths}
+
+        futures = {path: self.pool.submit(normalize_image, path, self.max_side, self.quality) for path in paths}
+        results = {}
+        broken = False
+        for path, future in futures.items():
+            try:
+                results[path] = self.record(future.result())
+            except Exception as e:
+                # Worker died (e.g. killed decoding a hostile file) - original stays in place
+                broken = broken or isinstance(e, BrokenProcessPool)
+                results[path] = self.record(empty_result(path, f"worker failed: {e}"))
+
+        if broken:
+            self.log("⚠️  Normalizer pool broke, starting a new one")
+            self.pool.shutdown(wait=False)
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return results
+
+    def report(self):
+        if not self.normalized:
+            return f"🪄 Normalizer: no images yet ({self.failed} failed)"
+        return (f"🪄 Normalizer: {self.normalized} image(s), "
+                f"{self.original_bytes / 1024 / 1024:.1f} MB -> {self.normalized_bytes / 1024 / 1024:.1f} MB "
+                f"({1 - self.normalized_bytes / self.original_bytes:.0%} smaller), "
+                f"{self.total_seconds / self.normalized * 1000:.0f} ms per image, {self.failed} failed")
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Launch Pacing for MemeXshot Automation
+Token bucket plus minimum inter-launch gap, measured from the last launch
+instead of fixed sleeps after it
+"""
+
+import time
+
+class LaunchPacer:
+    def __init__(self, launches_per_hour, burst=1, min_gap=0, clock=time.monotonic):
+        """
+        Args:
+            launches_per_hour: Sustained launch cap (0 = no cap)
+            burst: Bucket size - launches allowed back to back after an idle period
+            min_gap: Minimum seconds between the starts of two launches
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.rate = launches_per_hour / 3600.0
+        self.capacity = max(burst, 1)
+        self.min_gap = min_gap
+        self.clock = clock
+
+        self.tokens = float(self.capacity)
+        self.updated = clock()
+        self.last_launch = None
+        self.launches = 0
+        self.started = clock()
+
+    def refill(self):
+        now = self.clock()
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def time_until_ready(self):
+        """Seconds left before the next launch may start (0 if it may start now)"""
+        now = self.refill()
+
+        token_wait = 0
+        if self.rate > 0 and self.tokens < 1:
+            token_wait = (1 - self.tokens) / self.rate
+
+        gap_wait = 0
+        if self.last_launch is not None:
+            gap_wait = max(0, self.min_gap - (now - self.last_launch))
+
+        return max(token_wait, gap_wait)
+
+    def acquire(self):
+        """Record a launch starting now (call once time_until_ready() is 0)"""
+        now = self.refill()
+        if self.rate > 0:
+            self.tokens = max(self.tokens - 1, 0)
+        self.last_launch = now
+        self.launches += 1
+
+    def launches_per_hour(self):
+        """Observed launch rate since the pacer was created"""
+        elapsed = self.clock() - self.started
+        return self.launches * 3600 / elapsed if elapsed > 0 else 0
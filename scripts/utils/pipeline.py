@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Staged Pipeline for MemeXshot Automation
+Thread-pool stages connected by bounded queues: a full queue blocks the stage
+feeding it, so the slowest stage sets throughput and nothing piles up unbounded
+"""
+
+import time
+import queue
+import threading
+
+STOP = object()  # Worker shutdown sentinel
+
+class Stage:
+    """One step of the pipeline: handler(item) -> item for the next stage, or None when finished"""
+
+    def __init__(self, name, handler, workers=1, capacity=16):
+        """
+        Args:
+            name: Label for metrics
+            handler: Called on a worker thread per item
+            workers: Concurrency limit for this stage
+            capacity: Queue depth before upstream blocks (backpressure)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.capacity = capacity
+        self.queue = queue.Queue(maxsize=capacity)
+        self.next = None
+        self.pipeline = None
+        self.threads = []
+
+        self.lock = threading.Lock()
+        self.in_flight = 0  # Queued or being handled
+        self.calls = 0
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_depth = 0
+
+    def put(self, item):
+        """Enqueue an item, blocking while the stage is full"""
+        with self.lock:
+            self.in_flight += 1
+        self.queue.put((time.monotonic(), item))
+        with self.lock:
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self.work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def work(self):
+        while True:
+            entry = self.queue.get()
+            if entry is STOP:
+                return
+            self.handle([entry])
+
+    def run(self, items):
+        """Handle items one by one; a failing item doesn't take the others with it"""
+        outputs = []
+        for item in items:
+            try:
+                outputs.append(self.handler(item))
+            except Exception as e:
+                with self.lock:
+                    self.errors += 1
+                self.pipeline.fail(self, item, e)
+        return outputs
+
+    def handle(self, entries):
+        started = time.monotonic()
+        outputs = self.run([item for _, item in entries])
+        finished = time.monotonic()
+
+        with self.lock:
+            self.calls += 1
+            self.processed += len(entries)
+            self.busy_seconds += finished - started
+            self.wait_seconds += sum(started - queued_at for queued_at, _ in entries)
+
+        # Hand on before leaving in_flight, so the pipeline never looks idle in between
+        for output in outputs:
+            if output is not None and self.next:
+                self.next.put(output)
+
+        with self.lock:
+            self.in_flight -= len(entries)
+        self.pipeline.notify()
+
+    def stop(self):
+        for _ in self.threads:
+            self.queue.put(STOP)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def report(self):
+        calls = self.calls or 1
+        processed = self.processed or 1
+        return (f"{self.name}: depth {self.queue.qsize()}/{self.capacity} (max {self.max_depth}), "
+                f"{self.processed} done, {self.errors} failed, "
+                f"wait {self.wait_seconds / processed * 1000:.0f} ms, "
+                f"{self.busy_seconds / calls * 1000:.0f} ms per call, {self.workers} worker(s)")
+
+class BatchStage(Stage):
+    """
+    Stage whose handler takes a list: handler(items) -> items for the next stage
+
+    A batch is handed over when it reaches batch_size, when the first item has
+    waited flush_interval, or as soon as every upstream stage is idle.
+    """
+
+    def __init__(self, name, handler, batch_size=10, flush_interval=30, capacity=16, linger=0.05):
+        super().__init__(name, handler, workers=1, capacity=capacity)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.linger = linger
+        self.upstream_idle = lambda: True
+
+    def work(self):
+        batch = []
+        first_at = None
+        while True:
+            try:
+                entry = self.queue.get(timeout=self.linger if batch else None)
+            except queue.Empty:
+                entry = None
+
+            if entry is STOP:
+                if batch:
+                    self.handle(batch)
+                return
+
+            if entry is not None:
+                batch.append(entry)
+                first_at = first_at or time.monotonic()
+
+            if batch and (len(batch) >= self.batch_size
+                          or time.monotonic() - first_at >= self.flush_interval
+                          or (entry is None and self.upstream_idle())):
+                self.handle(batch)
+                batch, first_at = [], None
+
+    def run(self, items):
+        try:
+            return self.handler(items)
+        except Exception as e:
+            with self.lock:
+                self.errors += len(items)
+            for item in items:
+                self.pipeline.fail(self, item, e)
+            return []
+
+class Pipeline:
+    def __init__(self, stages, on_error=None, log=print):
+        """
+        Args:
+            stages: Stages in order; each one's output feeds the next
+            on_error: on_error(stage, item, error) when a handler raises (the item is dropped)
+            log: Logger callable
+        """
+        self.stages = stages
+        self.on_error = on_error
+        self.log = log
+        self.condition = threading.Condition()
+
+        for i, stage in enumerate(stages):
+            stage.pipeline = self
+            stage.next = stages[i + 1] if i + 1 < len(stages) else None
+            if isinstance(stage, BatchStage):
+                upstream = stages[:i]
+                stage.upstream_idle = lambda upstream=upstream: all(s.in_flight == 0 for s in upstream)
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def submit(self, item):
+        """Feed an item in (blocks while the first stage is full)"""
+        self.stages[0].put(item)
+
+    def in_flight(self):
+        return sum(stage.in_flight for stage in self.stages)
+
+    def notify(self):
+        with self.condition:
+            self.condition.notify_all()
+
+    def fail(self, stage, item, error):
+        self.log(f"❌ {stage.name} failed: {error}")
+        if self.on_error:
+            self.on_error(stage, item, error)
+
+    def drain(self, timeout=None):
+        """Wait until every submitted item has left the pipeline; returns False on timeout"""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.in_flight() == 0, timeout)
+
+    def report(self):
+        return "\n".join(f"🔧 {stage.report()}" for stage in self.stages)
+
+    def close(self, timeout=None):
+        """Finish in-flight items, then stop the workers"""
+        self.drain(timeout)
+        for stage in self.stages:
+            stage.stop()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Supabase Realtime Client for MemeXshot Automation
+Minimal Phoenix-channel client for postgres_changes over websockets, plus a
+thread-backed wakeup for synchronous service loops
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+import websockets
+
+from scripts.utils.retry import compute_backoff
+
+def build_realtime_url(supabase_url, supabase_key):
+    """Websocket endpoint for a Supabase project (SUPABASE_REALTIME_URL overrides)"""
+    override = os.getenv('SUPABASE_REALTIME_URL')
+    if override:
+        return override
+
+    parsed = urlparse(supabase_url)
+    scheme = 'wss' if parsed.scheme == 'https' else 'ws'
+    return f"{scheme}://{parsed.netloc}/realtime/v1/websocket?apikey={supabase_key}&vsn=1.0.0"
+
+class RealtimeChannel:
+    """
+    Subscribe to INSERT/UPDATE changes on one table, reconnecting forever
+
+    Callbacks run on the event loop and must not block:
+        on_change(change_type, record) - for every INSERT/UPDATE
+        on_subscribed()                - after every successful (re)join, to gap-fill
+        on_disconnect(error)           - when the socket drops
+    """
+
+    def __init__(self, url, table, on_change, on_subscribed=None, on_disconnect=None,
+                 schema='public', log=print, heartbeat_interval=25,
+                 reconnect_base_delay=1, reconnect_max_delay=30):
+        self.url = url
+        self.table = table
+        self.schema = schema
+        self.topic = f"realtime:{schema}:{table}"
+        self.on_change = on_change
+        self.on_subscribed = on_subscribed
+        self.on_disconnect = on_disconnect
+        self.log = log
+        self.heartbeat_interval = heartbeat_interval
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+
+        self.subscribed = False
+        self.ref = 0
+        self.join_ref = None
+        self.last_event_at = None
+
+    def next_ref(self):
+        self.ref += 1
+        return str(self.ref)
+
+    async def send(self, ws, topic, event, payload):
+        ref = self.next_ref()
+        await ws.send(json.dumps({'topic': topic, 'event': event, 'payload': payload, 'ref': ref}))
+        return ref
+
+    async def join(self, ws):
+        """Join the table channel for INSERT and UPDATE changes"""
+        self.join_ref = await self.send(ws, self.topic, 'phx_join', {
+            'config': {
+                'postgres_changes': [
+                    {'event': 'INSERT', 'schema': self.schema, 'table': self.table},
+                    {'event': 'UPDATE', 'schema': self.schema, 'table': self.table}
+                ]
+            }
+        })
+
+    async def heartbeat(self, ws):
+        """Keep the Phoenix socket alive"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self.send(ws, 'phoenix', 'heartbeat', {})
+
+    def handle_message(self, message):
+        """Dispatch one server message"""
+        event = message.get('event')
+        payload = message.get('payload') or {}
+
+        if event == 'phx_reply' and message.get('ref') == self.join_ref:
+            if payload.get('status') != 'ok':
+                raise ConnectionError(f"Realtime join rejected: {payload.get('response')}")
+            self.subscribed = True
+            if self.on_subscribed:
+                self.on_subscribed()
+            return
+
+        if event == 'postgres_changes':
+            data = payload.get('data') or {}
+            change_type = data.get('type')
+            record = data.get('record')
+        elif event in ('INSERT', 'UPDATE'):
+            # Legacy realtime payload format
+            change_type = event
+            record = payload.get('record')
+        else:
+            return
+
+        if change_type in ('INSERT', 'UPDATE') and record:
+            self.last_event_at = time.time()
+            self.on_change(change_type, record)
+
+    async def run_once(self):
+        """Connect, join and dispatch until the socket closes"""
+        async with websockets.connect(self.url, ping_interval=None) as ws:
+            await self.join(ws)
+            heartbeat = asyncio.create_task(self.heartbeat(ws))
+            try:
+                async for raw in ws:
+                    self.handle_message(json.loads(raw))
+            finally:
+                heartbeat.cancel()
+
+    async def run_forever(self):
+        """Keep the subscription up, backing off between reconnect attempts"""
+        failures = 0
+        while True:
+            try:
+                await self.run_once()
+                error = ConnectionError("Realtime socket closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+
+            was_subscribed = self.subscribed
+            self.subscribed = False
+            if self.on_disconnect:
+                self.on_disconnect(error)
+
+            failures = 1 if was_subscribed else failures + 1
+            delay = compute_backoff(failures, self.reconnect_base_delay, self.reconnect_max_delay)
+            self.log(f"🔌 Realtime disconnected ({error}), reconnecting in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+
+class RealtimeWakeup:
+    """
+    Run a RealtimeChannel on a background thread and wake a synchronous loop
+
+    wait() returns as soon as a change matching predicate(record) arrives, or
+    after every (re)subscribe so the loop re-reads anything missed while down.
+    Pass a shared event to wake one loop from several tables.
+    """
+
+    def __init__(self, url, table, predicate, event=None, log=print, **channel_options):
+        self.predicate = predicate
+        self.log = log
+        self.event = event or threading.Event()
+        self.events = 0
+        self.woken_at = None
+        self.channel = RealtimeChannel(
+            url,
+            table,
+            on_change=self.on_change,
+            on_subscribed=self.on_subscribed,
+            on_disconnect=self.on_disconnect,
+            log=log,
+            **channel_options
+        )
+        self.loop = None
+        self.task = None
+        self.thread = None
+
+    @property
+    def subscribed(self):
+        return self.channel.subscribed
+
+    def on_change(self, change_type, record):
+        if self.predicate(record):
+            self.events += 1
+            self.woken_at = time.monotonic()
+            self.event.set()
+
+    def on_subscribed(self):
+        self.log(f"📡 Subscribed to realtime changes on {self.channel.table}")
+        self.event.set()
+
+    def on_disconnect(self, error):
+        self.log(f"⚠️  Realtime connection lost ({error}), polling until it is back")
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        self.task = self.loop.create_task(self.channel.run_forever())
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def wait(self, timeout):
+        """Block until woken or timeout; returns True if woken"""
+        woken = self.event.wait(timeout)
+        self.event.clear()
+        return woken
+
+    def stop(self):
+        if self.loop and self.task:
+            self.loop.call_soon_threadsafe(self.task.cancel)
+            self.thread.join(timeout=5)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Retry Scheduling for MemeXshot Automation
+Exponential backoff with jitter, then dead letter after MAX_RETRIES attempts
+"""
+
+import re
+import random
+from datetime import datetime, timedelta, timezone
+
+from config.supabase_config import (
+    DEAD_LETTER_TABLE, MAX_RETRIES, RETRY_DELAY, RETRY_MAX_DELAY
+)
+
+def utc_now():
+    """Current time as an aware UTC datetime (matches TIMESTAMPTZ columns)"""
+    return datetime.now(timezone.utc)
+
+def parse_timestamp(value):
+    """Parse a PostgREST timestamp (variable fraction digits, 'Z' or offset suffix)"""
+    value = value.replace('Z', '+00:00')
+    match = re.match(r'^(.*?T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(.*)$', value)
+    if match:
+        base, fraction, offset = match.groups()
+        value = base + ('.' + (fraction + '000000')[:6] if fraction else '') + offset
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def is_missing_function(error):
+    """True when PostgREST reports that an RPC function isn't installed (PGRST202 / 404)"""
+    code = str(getattr(error, 'code', '') or '')
+    return code in ('PGRST202', '404', '42883')
+
+def compute_backoff(attempts, base_delay=RETRY_DELAY, max_delay=RETRY_MAX_DELAY):
+    """
+    Compute the delay before the next attempt (exponential, jittered)
+
+    Args:
+        attempts: Number of attempts already made (1 after the first failure)
+        base_delay: Delay in seconds for the first retry
+        max_delay: Upper bound for the exponential delay
+
+    Returns:
+        Delay in seconds, uniformly drawn from [base_delay / 2, min(max_delay, base_delay * 2^(attempts-1))]
+    """
+    exponent = max(attempts - 1, 0)
+    ceiling = min(max_delay, base_delay * (2 ** exponent))
+    floor = min(base_delay / 2, ceiling)
+    return random.uniform(floor, ceiling)
+
+def schedule_retry(supabase, table, row, error, retry_status, failed_status='failed',
+                   max_attempts=MAX_RETRIES):
+    """
+    Record a failed attempt and either reschedule the row or dead-letter it
+
+    Args:
+        supabase: Supabase client
+        table: Source table name ('tweet_queue' or 'coins')
+        row: Row dict as read from the source table (must include 'id')
+        error: Error message or exception from the failed attempt
+        retry_status: Status to put the row back in when retrying
+        failed_status: Status for rows that exhausted their attempts
+        max_attempts: Attempts allowed before the row is dead-lettered
+
+    Returns:
+        Tuple (outcome, next_attempt_at) where outcome is 'retry' or 'dead_letter'
+    """
+    attempts = (row.get('attempts') or 0) + 1
+    error_message = str(error)
+
+    if attempts >= max_attempts:
+        move_to_dead_letter(supabase, table, row, error_message, attempts)
+        supabase.table(table).update({
+            'status': failed_status,
+            'attempts': attempts,
+            'last_error': error_message,
+            'error_message': f"Gave up after {attempts} attempts: {error_message}"
+        }).eq('id', row['id']).execute()
+        return 'dead_letter', None
+
+    next_attempt_at = utc_now() + timedelta(seconds=compute_backoff(attempts))
+    supabase.table(table).update({
+        'status': retry_status,
+        'attempts': attempts,
+        'next_attempt_at': next_attempt_at.isoformat(),
+        'last_error': error_message
+    }).eq('id', row['id']).execute()
+    return 'retry', next_attempt_at
+
+def move_to_dead_letter(supabase, table, row, error_message, attempts):
+    """
+    Copy a poison row into the dead_letter table
+
+    Callers often hold only the columns they work with, and requeueing a row
+    that was cleaned up restores it from the payload, so the full row is read
+    back first (the partial one is kept if that read fails).
+    """
+    payload = row
+    try:
+        result = supabase.table(table).select('*').eq('id', row['id']).limit(1).execute()
+        if result.data:
+            payload = result.data[0]
+    except Exception:
+        pass
+
+    supabase.table(DEAD_LETTER_TABLE).insert({
+        'source_table': table,
+        'source_id': row['id'],
+        'payload': payload,
+        'attempts': attempts,
+        'last_error': error_message
+    }).execute()
+
+def requeue_dead_letter(supabase, dead_letter_id, retry_statuses):
+    """
+    Put a dead-lettered row back into its source table with a fresh attempt budget
+
+    Args:
+        supabase: Supabase client
+        dead_letter_id: ID of the dead_letter row
+        retry_statuses: Mapping of source table -> status to requeue with
+
+    Returns:
+        The dead_letter row that was requeued, or None if not found
+    """
+    result = supabase.table(DEAD_LETTER_TABLE)\
+        .select('*')\
+        .eq('id', dead_letter_id)\
+        .limit(1)\
+        .execute()
+
+    if not result.data:
+        return None
+
+    entry = result.data[0]
+    table = entry['source_table']
+    reset = {
+        'status': retry_statuses[table],
+        'attempts': 0,
+        'next_attempt_at': utc_now().isoformat(),
+        'last_error': None,
+        'error_message': None
+    }
+
+    updated = supabase.table(table).update(reset).eq('id', entry['source_id']).execute()
+    if not updated.data:
+        # Source row is gone (e.g. cleaned up) - restore it from the payload
+        restored = dict(entry['payload'])
+        restored.update(reset)
+        supabase.table(table).insert(restored).execute()
+
+    supabase.table(DEAD_LETTER_TABLE).update({
+        'requeued_at': utc_now().isoformat()
+    }).eq('id', dead_letter_id).execute()
+
+    return entry
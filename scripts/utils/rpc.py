@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Solana RPC Transaction Fetching for MemeXshot Automation
+getTransaction as JSON-RPC batches sent concurrently over an async keep-alive
+pool, with per-call timeouts and backoff on 429/5xx, yielding results as they arrive
+"""
+
+import time
+import asyncio
+
+import httpx
+
+from scripts.utils.retry import compute_backoff
+
+# Worth retrying: rate limited or the provider is having a moment
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class RPCError(Exception):
+    """An RPC call failed for good (after retries, or with a non-retryable status)"""
+
+class TransactionFetcher:
+    def __init__(self, url, concurrency=4, batch_size=10, timeout=10, max_retries=3,
+                 retry_base_delay=0.25, retry_max_delay=4, log=print):
+        """
+        Args:
+            url: RPC HTTP endpoint
+            concurrency: Requests in flight at once (and pooled connections)
+            batch_size: getTransaction calls per JSON-RPC batch (1 sends single calls)
+            timeout: Connect/read timeout per request in seconds
+            max_retries: Retries per request on 429/5xx, timeouts and connection errors
+            retry_base_delay: First backoff delay (Retry-After wins when the server sends one)
+            retry_max_delay: Backoff cap
+            log: Logger callable
+        """
+        self.url = url
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.log = log
+
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        )
+        self.slots = asyncio.Semaphore(concurrency)
+
+        self.requests = 0
+        self.retries = 0
+        self.transactions = 0
+        self.total_seconds = 0.0
+
+    async def call(self, payload):
+        """POST one JSON-RPC request or batch, retrying transient failures"""
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.perf_counter()
+            try:
+                async with self.slots:
+                    response = await self.client.post(self.url, json=payload)
+                self.requests += 1
+                self.total_seconds += time.perf_counter() - started
+
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code != 200:
+                        raise RPCError(f"HTTP {response.status_code}")
+                    return response.json()
+
+                error = RPCError(f"HTTP {response.status_code}")
+                retry_after = response.headers.get('Retry-After')
+            except httpx.TransportError as e:
+                error = RPCError(f"{type(e).__name__}: {e}")
+                retry_after = None
+
+            if attempt > self.max_retries:
+                raise error
+
+            self.retries += 1
+            delay = compute_backoff(attempt, self.retry_base_delay, self.retry_max_delay)
+            if retry_after and retry_after.isdigit():
+                delay = min(float(retry_after), self.retry_max_delay)
+            await asyncio.sleep(delay)
+
+    async def fetch_batch(self, signatures, commitment='finalized'):
+        """
+        getTransaction for several signatures in one request
+
+        Returns:
+            Dict of signature -> jsonParsed transaction (None when the node doesn't have it)
+        """
+        config = {'encoding': 'jsonParsed', 'maxSupportedTransactionVersion': 0, 'commitment': commitment}
+        calls = [
+            {'jsonrpc': '2.0', 'id': i, 'method': 'getTransaction', 'params': [signature, config]}
+            for i, signature in enumerate(signatures)
+        ]
+
+        replies = await self.call(calls if len(calls) > 1 else calls[0])
+        if isinstance(replies, dict):
+            replies = [replies]
+
+        results = {signature: None for signature in signatures}
+        for reply in replies:
+            if reply.get('id') is None:
+                raise RPCError(f"Batch rejected: {reply.get('error')}")
+            signature = signatures[reply['id']]
+            if 'error' in reply:
+                self.log(f"⚠️  getTransaction {signature[:16]}... failed: {reply['error'].get('message')}")
+                continue
+            results[signature] = reply.get('result')
+            self.transactions += 1
+        return results
+
+    async def fetch(self, signatures, commitment='finalized'):
+        """
+        Fetch many transactions concurrently, yielding as each batch lands
+
+        Batches are cut in the given order, so oldest-first input comes back
+        roughly oldest first. A batch that keeps failing yields None for its
+        signatures (the caller leaves them for the next poll).
+
+        Yields:
+            (signature, transaction or None)
+        """
+        signatures = list(signatures)
+        batches = [signatures[i:i + self.batch_size] for i in range(0, len(signatures), self.batch_size)]
+        async def fetch_batch(batch):
+            try:
+                return batch, await self.fetch_batch(batch, commitment)
+            except Exception as e:
+                self.log(f"❌ getTransaction batch failed: {e}")
+                return batch, {signature: None for signature in batch}
+
+        tasks = [asyncio.create_task(fetch_batch(batch)) for batch in batches]
+        try:
+            for task in asyncio.as_completed(tasks):
+                batch, results = await task
+                for signature in batch:
+                    yield signature, results[signature]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_one(self, signature, commitment='finalized'):
+        return (await self.fetch_batch([signature], commitment))[signature]
+
+    def report(self):
+        if not self.requests:
+            return "📡 RPC: no requests yet"
+        return (f"📡 RPC: {self.transactions} transaction(s) in {self.requests} request(s), "
+                f"{self.total_seconds / self.requests * 1000:.0f} ms per request, {self.retries} retried")
+
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Processed-Signature Store for MemeXshot Automation
+Insertion-ordered, time-bounded record of handled transactions and how each
+was classified, mirrored to SQLite so restarts and overlapping polls never
+fetch or reply to the same transaction twice
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+class SignatureStore:
+    def __init__(self, path, window_seconds=3600, maxsize=10000, log=print):
+        """
+        Args:
+            path: SQLite file (created if missing)
+            window_seconds: How long a signature is remembered (keep above the reply window)
+            maxsize: Hard cap on remembered signatures, oldest dropped first
+            log: Logger callable
+        """
+        self.window_seconds = window_seconds
+        self.maxsize = maxsize
+        self.log = log
+        self._items = OrderedDict()  # signature -> (classification, processed_at), oldest first
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS processed_signatures (
+                signature TEXT PRIMARY KEY,
+                classification TEXT NOT NULL,
+                processed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_processed_signatures_at ON processed_signatures(processed_at);
+        ''')
+        self.db.commit()
+
+        self.hits = 0
+        self.expired = 0
+        self.load()
+
+    def load(self):
+        """Restore the window from disk, oldest first"""
+        cutoff = time.time() - self.window_seconds
+        with self.lock:
+            self.db.execute('DELETE FROM processed_signatures WHERE processed_at < ?', (cutoff,))
+            self.db.commit()
+            rows = self.db.execute(
+                'SELECT signature, classification, processed_at FROM processed_signatures '
+                'ORDER BY processed_at DESC LIMIT ?', (self.maxsize,)
+            ).fetchall()
+        for signature, classification, processed_at in reversed(rows):
+            self._items[signature] = (json.loads(classification), processed_at)
+        if rows:
+            self.log(f"🗂️  Restored {len(rows)} processed signature(s)")
+
+    def add(self, signature, classification):
+        """Remember a handled signature and what it turned out to be"""
+        now = time.time()
+        with self.lock:
+            self._items[signature] = (classification, now)
+            self._items.move_to_end(signature)
+            self.db.execute(
+                'INSERT OR REPLACE INTO processed_signatures (signature, classification, processed_at) VALUES (?, ?, ?)',
+                (signature, json.dumps(classification), now)
+            )
+            self.evict(now)
+            self.db.commit()
+
+    def evict(self, now):
+        """Drop entries past the window or over maxsize (oldest are at the front)"""
+        cutoff = now - self.window_seconds
+        dropped = []
+        while self._items:
+            signature, (_, processed_at) = next(iter(self._items.items()))
+            if processed_at >= cutoff and len(self._items) <= self.maxsize:
+                break
+            self._items.popitem(last=False)
+            dropped.append((signature,))
+        if dropped:
+            self.expired += len(dropped)
+            self.db.executemany('DELETE FROM processed_signatures WHERE signature = ?', dropped)
+
+    def get(self, signature):
+        """Cached classification of a handled signature, or None"""
+        with self.lock:
+            entry = self._items.get(signature)
+        if entry:
+            self.hits += 1
+            return entry[0]
+        return None
+
+    def __contains__(self, signature):
+        return signature in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def report(self):
+        return (f"🗂️  Signature store: {len(self)} remembered, {self.hits} repeat(s) skipped, "
+                f"{self.expired} expired")
+
+    def close(self):
+        with self.lock:
+            self.db.close()
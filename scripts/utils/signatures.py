@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Signature Paging for MemeXshot Automation
+Drain every signature of an address newer than a cursor, page by page, so a
+burst of transactions between polls is never cut off at one page
+"""
+
+import time
+
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+MAX_PAGE_SIZE = 1000  # getSignaturesForAddress limit
+
+async def fetch_signatures_since(client, address, until=None, page_size=MAX_PAGE_SIZE, max_age=None, commitment=None):
+    """
+    Page backward from the newest signature until reaching `until`
+
+    Args:
+        client: Solana AsyncClient (get_signatures_for_address)
+        address: Wallet address (str)
+        until: Newest signature already handled (str); None reads back to max_age
+        page_size: Signatures per request (RPC maximum by default)
+        max_age: Stop paging once a page reaches signatures older than this many seconds
+        commitment: Commitment for the lookup
+
+    Returns:
+        (signature infos oldest-first, pages requested)
+    """
+    pubkey = Pubkey.from_string(address)
+    until_signature = Signature.from_string(until) if until else None
+    cutoff = time.time() - max_age if max_age else None
+
+    collected = []
+    before = None
+    pages = 0
+    while True:
+        response = await client.get_signatures_for_address(
+            pubkey,
+            before=before,
+            until=until_signature,
+            limit=page_size,
+            commitment=commitment
+        )
+        pages += 1
+        page = response.value if hasattr(response, 'value') else response
+        if not page:
+            break
+
+        collected.extend(page)
+
+        # A short page means we reached `until` (or the start of the history)
+        if len(page) < page_size:
+            break
+
+        oldest = page[-1]
+        if cutoff and oldest.block_time and oldest.block_time < cutoff:
+            break
+
+        before = oldest.signature
+
+    collected.reverse()
+    return collected, pages
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Solana Websocket Subscriptions for MemeXshot Automation
+logsSubscribe / accountSubscribe over the RPC websocket, reconnecting forever,
+so wallet activity is pushed instead of polled
+"""
+
+import os
+import json
+import time
+import asyncio
+from urllib.parse import urlparse, urlunparse
+
+import websockets
+
+from scripts.utils.retry import compute_backoff
+
+SUBSCRIBE_METHODS = {
+    'logs': ('logsSubscribe', 'logsNotification'),
+    'account': ('accountSubscribe', 'accountNotification')
+}
+
+def build_ws_url(rpc_url):
+    """Websocket endpoint for an RPC URL (HELIUS_WS_URL overrides)"""
+    override = os.getenv('HELIUS_WS_URL')
+    if override:
+        return override
+
+    parsed = urlparse(rpc_url)
+    scheme = 'wss' if parsed.scheme == 'https' else 'ws'
+    return urlunparse(parsed._replace(scheme=scheme))
+
+class WalletSubscription:
+    """
+    Subscribe to one wallet's activity, reconnecting forever
+
+    mode='logs' pushes the signature of every transaction mentioning the wallet;
+    mode='account' only says the account changed (signature is None), so the
+    caller has to look the signatures up.
+
+    Callbacks run on the event loop and must not block:
+        on_signature(signature, slot) - per notification (failed transactions skipped)
+        on_subscribed()               - after every successful (re)subscribe, to gap-fill
+        on_disconnect(error)          - when the socket drops
+    """
+
+    def __init__(self, url, address, on_signature, on_subscribed=None, on_disconnect=None,
+                 mode='logs', commitment='confirmed', log=print, ping_interval=20,
+                 reconnect_base_delay=1, reconnect_max_delay=30):
+        if mode not in SUBSCRIBE_METHODS:
+            raise ValueError(f"Unknown subscription mode: {mode}")
+
+        self.url = url
+        self.address = address
+        self.on_signature = on_signature
+        self.on_subscribed = on_subscribed
+        self.on_disconnect = on_disconnect
+        self.mode = mode
+        self.commitment = commitment
+        self.log = log
+        self.ping_interval = ping_interval
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.subscribe_method, self.notification_method = SUBSCRIBE_METHODS[mode]
+
+        self.subscribed = False
+        self.subscription_id = None
+        self.request_id = 0
+        self.notifications = 0
+        self.reconnects = 0
+        self.last_notification_at = None
+
+    def subscribe_params(self):
+        if self.mode == 'logs':
+            return [{'mentions': [self.address]}, {'commitment': self.commitment}]
+        return [self.address, {'encoding': 'base64', 'commitment': self.commitment}]
+
+    async def subscribe(self, ws):
+        self.request_id += 1
+        await ws.send(json.dumps({
+            'jsonrpc': '2.0',
+            'id': self.request_id,
+            'method': self.subscribe_method,
+            'params': self.subscribe_params()
+        }))
+
+    def handle_message(self, message):
+        """Dispatch one server message"""
+        if message.get('id') == self.request_id and 'result' in message:
+            self.subscription_id = message['result']
+            self.subscribed = True
+            if self.on_subscribed:
+                self.on_subscribed()
+            return
+
+        if 'error' in message:
+            raise ConnectionError(f"{self.subscribe_method} rejected: {message['error']}")
+
+        if message.get('method') != self.notification_method:
+            return
+
+        result = (message.get('params') or {}).get('result') or {}
+        value = result.get('value') or {}
+        slot = (result.get('context') or {}).get('slot')
+
+        self.notifications += 1
+        self.last_notification_at = time.time()
+
+        if self.mode == 'logs':
+            if value.get('err') is not None:
+                return  # Failed transaction - nothing to reply to
+            self.on_signature(value.get('signature'), slot)
+        else:
+            self.on_signature(None, slot)
+
+    async def run_once(self):
+        """Connect, subscribe and dispatch until the socket closes"""
+        async with websockets.connect(self.url, ping_interval=self.ping_interval) as ws:
+            await self.subscribe(ws)
+            async for raw in ws:
+                self.handle_message(json.loads(raw))
+
+    async def run_forever(self):
+        """Keep the subscription up, backing off between reconnect attempts"""
+        failures = 0
+        while True:
+            try:
+                await self.run_once()
+                error = ConnectionError("RPC websocket closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+
+            was_subscribed = self.subscribed
+            self.subscribed = False
+            self.subscription_id = None
+            self.reconnects += 1
+            if self.on_disconnect:
+                self.on_disconnect(error)
+
+            failures = 1 if was_subscribed else failures + 1
+            delay = compute_backoff(failures, self.reconnect_base_delay, self.reconnect_max_delay)
+            self.log(f"🔌 RPC websocket disconnected ({error}), reconnecting in {delay:.1f}s...")
+            await asyncio.sleep(delay)
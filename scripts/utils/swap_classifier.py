@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Swap Classifier for MemeXshot Automation
+Single pass over a jsonParsed getTransaction result that finds the Meteora
+DBC program, the 5 USDC transfer, the wallet's moon-token balance delta and
+the ticker, returned as one compact record
+"""
+
+METEORA_DBC_PROGRAM = "dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+SWAP_USDC_MIN = 4.9  # Exclusive bounds around the 5 USDC launch swap
+SWAP_USDC_MAX = 5.1
+MOON_SUFFIX = 'moon'
+TICKER_MARKERS = ('Symbol:', 'Ticker:', 'Token:')
+MAX_TICKER_LENGTH = 10
+
+class SwapClassification:
+    """What one wallet transaction turned out to be"""
+    __slots__ = ('meteora', 'usdc_amount', 'moon_mint', 'moon_amount', 'ticker', 'block_time')
+
+    def __init__(self, block_time=None):
+        self.meteora = False       # Meteora DBC program involved
+        self.usdc_amount = None    # USDC moved by the swap, when it is ~5
+        self.moon_mint = None      # Moon token the wallet received
+        self.moon_amount = 0.0     # How much of it (post - pre balance)
+        self.ticker = None         # From the logs or a metadata instruction
+        self.block_time = block_time
+
+    @property
+    def is_swap(self):
+        """A 5 USDC Meteora swap (whether or not a moon token came out of it)"""
+        return self.meteora and self.usdc_amount is not None
+
+    def as_dict(self):
+        """Compact classification kept by the signature store"""
+        return {'swap': self.is_swap, 'usdc_amount': self.usdc_amount, 'mint': self.moon_mint, 'ticker': self.ticker}
+
+    def __repr__(self):
+        return (f"SwapClassification(swap={self.is_swap}, usdc_amount={self.usdc_amount}, "
+                f"moon_mint={self.moon_mint}, moon_amount={self.moon_amount}, ticker={self.ticker})")
+
+def ui_amount(balance):
+    """uiAmount of a pre/postTokenBalances entry (null for zero on some nodes)"""
+    return float((balance.get('uiTokenAmount') or {}).get('uiAmount') or 0)
+
+def ticker_from_logs(log_messages):
+    """First 'Symbol: X' / 'Ticker: X' / 'Token: X' in the program logs"""
+    for line in log_messages or ():
+        if ':' not in line:
+            continue
+        parts = line.split()
+        for i, part in enumerate(parts[:-1]):
+            if part in TICKER_MARKERS:
+                ticker = parts[i + 1].strip(',').strip('"').strip("'")
+                if ticker and len(ticker) <= MAX_TICKER_LENGTH:
+                    return ticker.upper()
+    return None
+
+def classify_transaction(tx, wallet, program=METEORA_DBC_PROGRAM, usdc_mint=USDC_MINT):
+    """
+    Classify a jsonParsed getTransaction result in one traversal
+
+    Each part of the transaction is visited at most once, and most wallet
+    activity (no Meteora program) stops after the message. The ticker is left
+    None when neither the logs nor a metadata instruction carry it; the caller
+    falls back to the Helius metadata API.
+
+    Args:
+        tx: getTransaction result (dict, as decoded from the RPC response)
+        wallet: Monitored wallet address (owner of the moon-token balance)
+        program: Meteora DBC program id
+        usdc_mint: USDC mint
+
+    Returns:
+        SwapClassification
+    """
+    result = SwapClassification(tx.get('blockTime'))
+    message = (tx.get('transaction') or {}).get('message') or {}
+    meta = tx.get('meta') or {}
+
+    for key in message.get('accountKeys') or ():
+        if (key.get('pubkey') if isinstance(key, dict) else key) == program:
+            result.meteora = True
+            break
+
+    metadata_symbol = None
+    for inst in message.get('instructions') or ():
+        if not isinstance(inst, dict):
+            continue
+        if inst.get('programId') == program:
+            result.meteora = True
+        parsed = inst.get('parsed')
+        if metadata_symbol is None and isinstance(parsed, dict) and parsed.get('type') == 'createMetadataAccounts':
+            metadata_symbol = (parsed.get('info') or {}).get('symbol')
+
+    if not result.meteora:
+        return result
+
+    # USDC leg of the swap (the last matching transfer wins, as before)
+    for group in meta.get('innerInstructions') or ():
+        for inst in group.get('instructions') or ():
+            parsed = inst.get('parsed')
+            if not isinstance(parsed, dict) or parsed.get('type') != 'transferChecked':
+                continue
+            info = parsed.get('info') or {}
+            if info.get('mint') != usdc_mint:
+                continue
+            amount = (info.get('tokenAmount') or {}).get('uiAmount')
+            if amount and SWAP_USDC_MIN < float(amount) < SWAP_USDC_MAX:
+                result.usdc_amount = float(amount)
+
+    if result.usdc_amount is None:
+        return result
+
+    # Moon token the wallet gained
+    pre = {}
+    for balance in meta.get('preTokenBalances') or ():
+        if balance.get('owner') == wallet:
+            pre[balance.get('mint')] = ui_amount(balance)
+    for balance in meta.get('postTokenBalances') or ():
+        mint = balance.get('mint') or ''
+        if balance.get('owner') != wallet or not mint.endswith(MOON_SUFFIX):
+            continue
+        delta = ui_amount(balance) - pre.get(mint, 0.0)
+        if delta > 0:
+            result.moon_mint = mint
+            result.moon_amount = delta
+            break
+
+    if result.moon_mint:
+        result.ticker = ticker_from_logs(meta.get('logMessages'))
+        if not result.ticker and metadata_symbol:
+            result.ticker = metadata_symbol.upper()
+
+    return result
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Token Metadata Lookups for MemeXshot Automation
+Mint -> symbol through the Helius token-metadata API, with an in-memory LRU
+(TTL-bounded) in front of a persistent SQLite table. Lookups arriving within
+a short window go out as one batched request, and concurrent lookups for the
+same mint share one in-flight call
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+
+import httpx
+
+HELIUS_METADATA_URL = "https://api.helius.xyz/v0/token-metadata"
+MAX_MINTS_PER_REQUEST = 100  # token-metadata mintAccounts limit
+
+def helius_metadata_url(rpc_url):
+    """token-metadata endpoint for the API key in a Helius RPC URL, or None"""
+    if not rpc_url or 'api-key=' not in rpc_url:
+        return None
+    return f"{HELIUS_METADATA_URL}?api-key={rpc_url.split('api-key=')[-1]}"
+
+def symbol_from_metadata(metadata):
+    """Symbol of one token-metadata entry: on-chain first, then off-chain"""
+    on_chain = (metadata.get('onChainMetadata') or {}).get('metadata') or {}
+    symbol = (on_chain.get('data') or {}).get('symbol')
+    if not symbol:
+        off_chain = (metadata.get('offChainMetadata') or {}).get('metadata') or {}
+        symbol = off_chain.get('symbol')
+    return symbol.strip() if symbol and symbol.strip() else None
+
+class TokenMetadataService:
+    def __init__(self, url, path, ttl=7 * 24 * 3600, maxsize=10000, batch_window=0.05, timeout=5,
+                 recent_latencies=1000, log=print):
+        """
+        Args:
+            url: token-metadata endpoint including the API key (see helius_metadata_url)
+            path: SQLite file holding the mint -> symbol table (created if missing)
+            ttl: Seconds a symbol is trusted before it is looked up again
+            maxsize: Symbols kept in memory, least recently used dropped first
+            batch_window: Seconds to collect lookups into one request
+            timeout: Request timeout in seconds
+            recent_latencies: Lookup latencies kept for the p50/p95 in report()
+            log: Logger callable
+        """
+        self.url = url
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.batch_window = batch_window
+        self.log = log
+
+        self.client = httpx.AsyncClient(timeout=timeout)
+        self._symbols = OrderedDict()  # mint -> (symbol, fetched_at), least recently used first
+        self.inflight = {}             # mint -> Future shared by every lookup of it
+        self.pending = []              # mints waiting for the next request
+        self.flush_task = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS token_symbols (
+                mint TEXT PRIMARY KEY,
+                symbol TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+        ''')
+        self.db.commit()
+
+        self.lookups = 0
+        self.hits = 0
+        self.stored_hits = 0
+        self.coalesced = 0
+        self.requests = 0
+        self.failures = 0
+        self.request_seconds = 0.0
+        self.latencies = deque(maxlen=recent_latencies)
+
+    def cached(self, mint):
+        """Fresh symbol from memory, then from the table, or None"""
+        now = time.time()
+        entry = self._symbols.get(mint)
+        if entry and now - entry[1] < self.ttl:
+            self._symbols.move_to_end(mint)
+            return entry[0]
+
+        with self.lock:
+            row = self.db.execute(
+                'SELECT symbol, fetched_at FROM token_symbols WHERE mint = ? AND fetched_at > ?',
+                (mint, now - self.ttl)
+            ).fetchone()
+        if row:
+            self.stored_hits += 1
+            self.remember(mint, *row)
+            return row[0]
+        return None
+
+    def remember(self, mint, symbol, fetched_at):
+        self._symbols[mint] = (symbol, fetched_at)
+        self._symbols.move_to_end(mint)
+        while len(self._symbols) > self.maxsize:
+            self._symbols.popitem(last=False)
+
+    async def lookup(self, mint):
+        """
+        Symbol of a mint, or None when Helius doesn't know it (yet)
+
+        Misses aren't cached, so a token whose metadata isn't indexed yet is
+        asked for again on its next lookup.
+        """
+        started = time.perf_counter()
+        self.lookups += 1
+        try:
+            symbol = self.cached(mint)
+            if symbol is not None:
+                self.hits += 1
+                return symbol
+
+            future = self.inflight.get(mint)
+            if future:
+                self.coalesced += 1
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self.inflight[mint] = future
+                self.pending.append(mint)
+                if self.flush_task is None:
+                    self.flush_task = asyncio.create_task(self.flush_later())
+            # A cancelled caller mustn't cancel the lookup others are sharing
+            return await asyncio.shield(future)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    async def flush_later(self):
+        await asyncio.sleep(self.batch_window)
+        self.flush_task = None
+        mints, self.pending = self.pending, []
+        for i in range(0, len(mints), MAX_MINTS_PER_REQUEST):
+            await self.resolve(mints[i:i + MAX_MINTS_PER_REQUEST])
+
+    async def resolve(self, mints):
+        """One request for a batch of mints; every waiting lookup gets its answer"""
+        symbols = {}
+        try:
+            symbols = await self.fetch(mints)
+        except Exception as e:
+            self.failures += 1
+            self.log(f"⚠️  Token metadata lookup for {len(mints)} mint(s) failed: {e}")
+        finally:
+            for mint in mints:
+                future = self.inflight.pop(mint, None)
+                if future and not future.done():
+                    future.set_result(symbols.get(mint))
+
+    async def fetch(self, mints):
+        payload = {"mintAccounts": mints, "includeOffChain": True, "disableCache": False}
+        started = time.perf_counter()
+        response = await self.client.post(self.url, json=payload)
+        self.requests += 1
+        self.request_seconds += time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+        now = time.time()
+        symbols = {}
+        for metadata in response.json() or []:
+            mint = metadata.get('account')
+            symbol = symbol_from_metadata(metadata)
+            if mint in mints and symbol:
+                symbols[mint] = symbol
+                self.remember(mint, symbol, now)
+
+        if symbols:
+            with self.lock:
+                self.db.executemany(
+                    'INSERT OR REPLACE INTO token_symbols (mint, symbol, fetched_at) VALUES (?, ?, ?)',
+                    [(mint, symbol, now) for mint, symbol in symbols.items()]
+                )
+                self.db.commit()
+        return symbols
+
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def latency_percentile(self, fraction):
+        latencies = sorted(self.latencies)
+        return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] if latencies else 0.0
+
+    def report(self):
+        if not self.lookups:
+            return "🏷️  Token metadata: no lookups yet"
+        return (f"🏷️  Token metadata: {self.hits}/{self.lookups} hits ({self.hit_rate():.0%}, "
+                f"{self.stored_hits} from disk), {self.coalesced} coalesced, "
+                f"{self.requests} request(s), {self.failures} failed, "
+                f"lookup p50 {self.latency_percentile(0.5) * 1000:.0f} ms / p95 {self.latency_percentile(0.95) * 1000:.0f} ms")
+
+    async def close(self):
+        """Stop batching; lookups still waiting on a request get None"""
+        if self.flush_task:
+            self.flush_task.cancel()
+            self.flush_task = None
+        self.pending = []
+        for future in self.inflight.values():
+            if not future.done():
+                future.set_result(None)
+        self.inflight.clear()
+        await self.client.aclose()
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Pre-flight Coin Validation for MemeXshot Automation
+Cheap in-process checks that reject coins which can't succeed before any
+UI automation time is spent on them
+"""
+
+import os
+import re
+import unicodedata
+
+try:
+    from PIL import Image, UnidentifiedImageError
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Same charset/length the Twitter bot parses tickers with
+TICKER_PATTERN = re.compile(r'^[A-Z0-9]{3,10}$')
+TWITTER_PATTERN = re.compile(r'^@?[A-Za-z0-9_]{1,15}$')
+
+# coins table VARCHAR limits
+FIELD_LIMITS = {
+    'ticker': 10,
+    'name': 100,
+    'website': 255,
+    'twitter': 50
+}
+
+IMAGE_MAX_BYTES = int(os.getenv('IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+IMAGE_MIN_SIDE = int(os.getenv('IMAGE_MIN_SIDE', '64'))
+IMAGE_MAX_SIDE = int(os.getenv('IMAGE_MAX_SIDE', '8192'))
+IMAGE_FORMATS = {'JPEG', 'PNG', 'GIF', 'WEBP'}
+
+# Control, surrogate and private-use characters; format characters (Cf: ZWJ,
+# emoji tags) are part of ordinary emoji display names and stay allowed
+REJECTED_NAME_CATEGORIES = {'Cc', 'Cs', 'Co'}
+
+# Leading bytes of IMAGE_FORMATS (used when Pillow is not installed)
+IMAGE_SIGNATURES = {
+    b'\xff\xd8\xff': 'JPEG',
+    b'\x89PNG\r\n\x1a\n': 'PNG',
+    b'GIF87a': 'GIF',
+    b'GIF89a': 'GIF'
+}
+
+def sniff_image_format(header):
+    """Image format from the first bytes of a file, or None"""
+    for signature, image_format in IMAGE_SIGNATURES.items():
+        if header.startswith(signature):
+            return image_format
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+def oversized_field(coin):
+    """Reason the first field too long for its coins column, or None"""
+    for field, limit in FIELD_LIMITS.items():
+        value = coin.get(field) or ''
+        if len(value) > limit:
+            return f"{field} is {len(value)} characters (limit {limit})"
+    return None
+
+def validate_coin_fields(coin):
+    """
+    Check the fields the automation types into Moonshot
+
+    Returns:
+        Reason string for the first problem found, or None if the coin is valid
+    """
+    reason = oversized_field(coin)
+    if reason:
+        return reason
+
+    ticker = coin.get('ticker') or ''
+    if not TICKER_PATTERN.match(ticker):
+        return f"ticker '{ticker}' must be 3-10 characters A-Z/0-9"
+
+    name = (coin.get('name') or '').strip()
+    if not name:
+        return "name is empty"
+    if any(unicodedata.category(c) in REJECTED_NAME_CATEGORIES for c in name):
+        return "name contains control characters"
+
+    website = coin.get('website')
+    if website and not website.startswith(('http://', 'https://')):
+        return f"website '{website[:50]}' is not an http(s) URL"
+
+    twitter = coin.get('twitter')
+    if twitter and not TWITTER_PATTERN.match(twitter):
+        return f"twitter '{twitter}' is not a valid handle"
+
+    return None
+
+def validate_image(path):
+    """
+    Check a downloaded image is within size limits and fully decodable
+
+    Returns:
+        Reason string for the first problem found, or None if the image is usable
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError as e:
+        return f"image missing: {e}"
+
+    if size == 0:
+        return "image is empty"
+    if size > IMAGE_MAX_BYTES:
+        return f"image is {size} bytes (limit {IMAGE_MAX_BYTES})"
+
+    if not PIL_AVAILABLE:
+        with open(path, 'rb') as f:
+            if not sniff_image_format(f.read(16)):
+                return "image is not a JPEG/PNG/GIF/WEBP file"
+        return None
+
+    try:
+        with Image.open(path) as img:
+            if img.format not in IMAGE_FORMATS:
+                return f"image format {img.format} not supported"
+
+            width, height = img.size
+            if min(width, height) < IMAGE_MIN_SIDE:
+                return f"image is {width}x{height} (minimum side {IMAGE_MIN_SIDE}px)"
+            if max(width, height) > IMAGE_MAX_SIDE:
+                return f"image is {width}x{height} (maximum side {IMAGE_MAX_SIDE}px)"
+
+            # Full decode - catches truncated/corrupt data that the header check misses
+            img.load()
+
+    except UnidentifiedImageError:
+        return "image data is not a recognizable image"
+    except Image.DecompressionBombError as e:
+        return f"image too large to decode: {e}"
+    except (OSError, SyntaxError, ValueError) as e:
+        return f"image is corrupt: {e}"
+
+    return None
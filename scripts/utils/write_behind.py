@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Row Updates for MemeXshot Automation
+Coalesces per-row updates (latest state wins) and flushes them in one bulk
+write on an interval or when the batch fills up
+"""
+
+import threading
+
+from scripts.utils.retry import is_missing_function
+
+class WriteBehindBuffer:
+    def __init__(self, supabase, table, rpc='apply_coin_updates', flush_interval=2.0, max_batch=50, log=print):
+        """
+        Args:
+            supabase: Supabase client
+            table: Table the updates belong to (per-row fallback target)
+            rpc: Bulk update function taking {'updates': [{'id': ..., <column>: <value>}, ...]}
+            flush_interval: Seconds between background flushes
+            max_batch: Flush as soon as this many rows are pending
+            log: Logger callable
+        """
+        self.supabase = supabase
+        self.table = table
+        self.rpc = rpc
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.log = log
+
+        self.lock = threading.Lock()  # Guards pending/staged
+        self.flush_lock = threading.Lock()  # One flush at a time, so writes land in order
+        self.pending = {}  # row id -> merged fields
+        self.staged = 0  # Updates merged into pending since the last flush
+        self.bulk = True  # Disabled if the bulk RPC turns out not to be installed
+
+        self.flushes = 0
+        self.updates_flushed = 0
+        self.writes = 0
+
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Flush in the background every flush_interval seconds"""
+        self.thread = threading.Thread(target=self.flush_loop, name=f"write-behind-{self.table}", daemon=True)
+        self.thread.start()
+        return self
+
+    def flush_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            if self.pending:
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.log(f"⚠️  Background flush failed, will retry: {e}")
+
+    def stage(self, row_id, sync=False, **fields):
+        """Merge an update for a row; sync=True flushes before returning (raises on failure)"""
+        with self.lock:
+            self.pending.setdefault(row_id, {}).update(fields)
+            self.staged += 1
+            full = len(self.pending) >= self.max_batch
+
+        if sync or full:
+            self.flush()
+
+    def discard(self, row_id):
+        """Drop a row's buffered update (the caller is writing the row directly)"""
+        with self.lock:
+            self.pending.pop(row_id, None)
+
+    def flush(self):
+        """Write all pending rows; returns the number of rows written"""
+        with self.flush_lock:
+            with self.lock:
+                if not self.pending:
+                    return 0
+                batch, self.pending = self.pending, {}
+                staged, self.staged = self.staged, 0
+
+            rows = [{'id': row_id, **fields} for row_id, fields in batch.items()]
+            try:
+                writes = self.write(rows)
+            except Exception:
+                # Put the batch back under anything staged meanwhile (newer fields win)
+                with self.lock:
+                    for row_id, fields in batch.items():
+                        self.pending[row_id] = {**fields, **self.pending.get(row_id, {})}
+                    self.staged += staged
+                raise
+
+            self.flushes += 1
+            self.updates_flushed += staged
+            self.writes += writes
+            return len(rows)
+
+    def write(self, rows):
+        """
+        One bulk RPC, or one update per row if the RPC is not installed; returns requests made
+
+        Any other failure raises, and flush() keeps the batch for the next attempt.
+        """
+        if self.bulk:
+            try:
+                self.supabase.rpc(self.rpc, {'updates': rows}).execute()
+                return 1
+            except Exception as e:
+                if not is_missing_function(e):
+                    raise
+                self.log(f"⚠️  Bulk update unavailable, using per-row updates: {e}")
+                self.bulk = False
+
+        for row in rows:
+            fields = {k: v for k, v in row.items() if k != 'id'}
+            self.supabase.table(self.table).update(fields).eq('id', row['id']).execute()
+        return len(rows)
+
+    def writes_saved_per_flush(self):
+        """Average requests saved per flush versus one write per update"""
+        if not self.flushes:
+            return 0.0
+        return (self.updates_flushed - self.writes) / self.flushes
+
+    def report(self):
+        return (f"💾 {self.updates_flushed} update(s) in {self.writes} write(s) over {self.flushes} flush(es), "
+                f"{self.writes_saved_per_flush():.1f} writes saved per flush")
+
+    def close(self):
+        """Stop the background flusher and write what's left"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(self.flush_interval + 1)
+        try:
+            self.flush()
+        except Exception as e:
+            self.log(f"⚠️  Final flush failed: {e}")
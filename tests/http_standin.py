@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Local Image Host Stand-in
+Threaded HTTP/1.1 keep-alive server that serves generated image bytes, to test
+and benchmark downloads without hitting pbs.twimg.com. /status/<code> answers
+with that status and /page/... with an HTML page
+"""
+
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+class ImageStandIn:
+    def __init__(self, host='127.0.0.1', port=0, image_bytes=200 * 1024, latency=0.0, body=None):
+        """
+        Args:
+            image_bytes: Default body size for /img/... requests (?size= overrides)
+            latency: Seconds to wait before sending headers (simulated RTT/server time)
+            body: Serve these exact bytes for /img/... instead of filler (or body(path) -> bytes)
+        """
+        self.host = host
+        self.image_bytes = image_bytes
+        self.body = body
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive
+
+            def setup(self):
+                super().setup()
+                with standin.lock:
+                    standin.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with standin.lock:
+                    standin.requests += 1
+
+                parsed = urlparse(self.path)
+                if parsed.path.startswith('/status/'):
+                    self.send_response(int(parsed.path.split('/')[2]))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if parsed.path.startswith('/page/'):
+                    page = b'<html>This Tweet was deleted</html>'
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(page)))
+                    self.end_headers()
+                    self.wfile.write(page)
+                    return
+                if not parsed.path.startswith('/img/'):
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                body = standin.body(parsed.path) if callable(standin.body) else standin.body
+                size = len(body) if body is not None else int(parse_qs(parsed.query).get('size', [standin.image_bytes])[0])
+                if standin.latency:
+                    time.sleep(standin.latency)
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/jpeg')
+                if 'nolength' not in parsed.query:
+                    self.send_header('Content-Length', str(size))
+                else:
+                    self.send_header('Connection', 'close')
+                self.end_headers()
+
+                if body is not None:
+                    self.wfile.write(body)
+                else:
+                    chunk = b'\xff' * 65536
+                    remaining = size
+                    while remaining > 0:
+                        self.wfile.write(chunk[:remaining])
+                        remaining -= len(chunk)
+
+                if 'nolength' in parsed.query:
+                    self.close_connection = True
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = None
+
+    def url(self, path):
+        return f"http://{self.host}:{self.port}{path}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Local Supabase Realtime Stand-in
+Speaks enough of the Phoenix channel protocol (join, heartbeat, postgres_changes)
+to test realtime subscribers without a Supabase project
+"""
+
+import json
+import asyncio
+from datetime import datetime, timezone
+
+import websockets
+
+class RealtimeStandIn:
+    def __init__(self, host='127.0.0.1', port=0):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.clients = {}  # websocket -> joined topic
+        self.joins = 0
+        self.heartbeats = 0
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/realtime/v1/websocket?apikey=test&vsn=1.0.0"
+
+    async def start(self):
+        self.server = await websockets.serve(self.handler, self.host, self.port)
+        self.port = list(self.server.sockets)[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handler(self, ws, *args):
+        self.clients[ws] = None
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+
+                if message['event'] == 'phx_join':
+                    self.clients[ws] = message['topic']
+                    self.joins += 1
+                elif message['event'] == 'heartbeat':
+                    self.heartbeats += 1
+
+                await ws.send(json.dumps({
+                    'topic': message['topic'],
+                    'event': 'phx_reply',
+                    'payload': {'status': 'ok', 'response': {}},
+                    'ref': message['ref']
+                }))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.pop(ws, None)
+
+    async def wait_for_joins(self, count, timeout=5):
+        """Wait until `count` joins happened in total"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self.joins < count:
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"Only {self.joins} joins after {timeout}s")
+            await asyncio.sleep(0.01)
+
+    async def push(self, table, change_type, record, schema='public'):
+        """Broadcast a postgres_changes event to every client joined to the table"""
+        topic = f"realtime:{schema}:{table}"
+        message = json.dumps({
+            'topic': topic,
+            'event': 'postgres_changes',
+            'payload': {
+                'data': {
+                    'schema': schema,
+                    'table': table,
+                    'type': change_type,
+                    'commit_timestamp': datetime.now(timezone.utc).isoformat(),
+                    'record': record,
+                    'old_record': {}
+                }
+            },
+            'ref': None
+        })
+        for ws, joined in list(self.clients.items()):
+            if joined == topic:
+                await ws.send(message)
+
+    async def drop_clients(self):
+        """Simulate a network drop"""
+        for ws in list(self.clients):
+            await ws.close()
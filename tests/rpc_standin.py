@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local Solana RPC Stand-in
+Threaded HTTP/1.1 keep-alive JSON-RPC server answering getTransaction (single
+and batch) from recorded transactions, and Helius /v0/token-metadata from a
+mint -> symbol table, with simulated latency and 429/5xx faults, to test and
+benchmark transaction fetching and metadata lookups without an RPC provider
+"""
+
+import copy
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from solders.signature import Signature
+
+WALLET = '9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM'
+METEORA_DBC_PROGRAM = 'dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN'
+USDC_MINT = 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
+MOON_MINT = '7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgmoon'
+
+# Recorded getTransaction (jsonParsed) of a 5 USDC Meteora DBC swap into a moon token, trimmed
+RECORDED_SWAP_TRANSACTION = {
+    'slot': 358213001,
+    'blockTime': 1760850000,
+    'version': 0,
+    'transaction': {
+        'signatures': ['5hWv1sQ8KxJ3rYt6bG2ePnUq9oLmZc4dVfA7iTkR1xNwH3jS8uCyB6gE2aD9vMpQ4oL7tZn5rXk1WqY3sFe8bJc'],
+        'message': {
+            'accountKeys': [
+                {'pubkey': WALLET, 'signer': True, 'writable': True, 'source': 'transaction'},
+                {'pubkey': 'ComputeBudget111111111111111111111111111111', 'signer': False, 'writable': False, 'source': 'transaction'},
+                {'pubkey': METEORA_DBC_PROGRAM, 'signer': False, 'writable': False, 'source': 'transaction'},
+                {'pubkey': USDC_MINT, 'signer': False, 'writable': False, 'source': 'transaction'},
+                {'pubkey': MOON_MINT, 'signer': False, 'writable': True, 'source': 'transaction'},
+                {'pubkey': 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA', 'signer': False, 'writable': False, 'source': 'transaction'}
+            ],
+            'instructions': [
+                {'programId': 'ComputeBudget111111111111111111111111111111', 'accounts': [], 'data': '3DdGGhkhJbjm', 'stackHeight': None},
+                {'programId': METEORA_DBC_PROGRAM, 'accounts': [WALLET, USDC_MINT, MOON_MINT], 'data': 'PgQWtn8oziwqoZL8sWNwT7LtzLzAUp8MM', 'stackHeight': None}
+            ],
+            'recentBlockhash': 'EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N'
+        }
+    },
+    'meta': {
+        'err': None,
+        'status': {'Ok': None},
+        'fee': 85000,
+        'preBalances': [912000000, 1, 1141440, 388425361, 1461600, 934087680],
+        'postBalances': [911915000, 1, 1141440, 388425361, 1461600, 934087680],
+        'innerInstructions': [
+            {
+                'index': 1,
+                'instructions': [
+                    {
+                        'program': 'spl-token',
+                        'programId': 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA',
+                        'parsed': {
+                            'type': 'transferChecked',
+                            'info': {
+                                'authority': WALLET,
+                                'mint': USDC_MINT,
+                                'tokenAmount': {'amount': '5000000', 'decimals': 6, 'uiAmount': 5.0, 'uiAmountString': '5'}
+                            }
+                        },
+                        'stackHeight': 2
+                    },
+                    {
+                        'program': 'spl-token',
+                        'programId': 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA',
+                        'parsed': {
+                            'type': 'transferChecked',
+                            'info': {
+                                'mint': MOON_MINT,
+                                'tokenAmount': {'amount': '31250000000000', 'decimals': 6, 'uiAmount': 31250000.0, 'uiAmountString': '31250000'}
+                            }
+                        },
+                        'stackHeight': 2
+                    }
+                ]
+            }
+        ],
+        'logMessages': [
+            f'Program {METEORA_DBC_PROGRAM} invoke [1]',
+            'Program log: Instruction: Swap',
+            'Program log: Symbol: FROG',
+            f'Program {METEORA_DBC_PROGRAM} success'
+        ],
+        'preTokenBalances': [],
+        'postTokenBalances': [
+            {'accountIndex': 4, 'mint': USDC_MINT, 'owner': WALLET,
+             'uiTokenAmount': {'amount': '0', 'decimals': 6, 'uiAmount': 0.0, 'uiAmountString': '0'}},
+            {'accountIndex': 5, 'mint': MOON_MINT, 'owner': WALLET,
+             'uiTokenAmount': {'amount': '31250000000000', 'decimals': 6, 'uiAmount': 31250000.0, 'uiAmountString': '31250000'}}
+        ],
+        'rewards': [],
+        'computeUnitsConsumed': 98213
+    }
+}
+
+def recorded_transactions(count):
+    """count copies of the recorded swap under distinct signatures: {signature: transaction}"""
+    transactions = {}
+    for i in range(count):
+        signature = str(Signature((i + 1).to_bytes(64, 'big')))
+        transaction = copy.deepcopy(RECORDED_SWAP_TRANSACTION)
+        transaction['transaction']['signatures'] = [signature]
+        transaction['slot'] += i
+        transactions[signature] = transaction
+    return transactions
+
+def recorded_wallet_activity(count):
+    """
+    count transactions of the mix a monitored wallet sees: {signature: transaction}
+
+    Cycles through the recorded 5 USDC swap, a swap of another USDC amount, a
+    swap into a non-moon token and a transfer that never touches Meteora.
+    """
+    transactions = recorded_transactions(count)
+    for i, transaction in enumerate(transactions.values()):
+        kind = i % 4
+        inner = transaction['meta']['innerInstructions'][0]['instructions']
+        if kind == 1:
+            inner[0]['parsed']['info']['tokenAmount'].update(
+                {'amount': '25000000', 'uiAmount': 25.0, 'uiAmountString': '25'})
+        elif kind == 2:
+            balance = transaction['meta']['postTokenBalances'][1]
+            balance['mint'] = inner[1]['parsed']['info']['mint'] = MOON_MINT[:-4] + 'pump'
+        elif kind == 3:
+            message = transaction['transaction']['message']
+            message['accountKeys'] = [key for key in message['accountKeys'] if key['pubkey'] != METEORA_DBC_PROGRAM]
+            message['instructions'] = message['instructions'][:1]
+            transaction['meta']['logMessages'] = []
+    return transactions
+
+class RPCStandIn:
+    def __init__(self, transactions, host='127.0.0.1', port=0, latency=0.0, faults=None, retry_after=None,
+                 metadata=None):
+        """
+        Args:
+            transactions: {signature: getTransaction result}; unknown signatures answer null
+            metadata: {mint: symbol} for /v0/token-metadata; unknown mints are left out
+            latency: Seconds per HTTP request (simulated RTT/server time; a batch costs one)
+            faults: HTTP statuses to answer the next requests with, in order (e.g. [429, 503])
+            retry_after: Retry-After header value sent with faults
+        """
+        self.host = host
+        self.transactions = transactions
+        self.latency = latency
+        self.faults = list(faults or [])
+        self.retry_after = retry_after
+        self.metadata = metadata or {}
+        self.metadata_requests = []  # mintAccounts of each token-metadata request
+        self.connections = 0
+        self.requests = 0
+        self.calls = 0
+        self.max_concurrent = 0
+        self.active = 0
+        self.lock = threading.Lock()
+
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive
+
+            def setup(self):
+                super().setup()
+                with standin.lock:
+                    standin.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, body=b'', headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with standin.lock:
+                    standin.requests += 1
+                    standin.active += 1
+                    standin.max_concurrent = max(standin.max_concurrent, standin.active)
+                    fault = standin.faults.pop(0) if standin.faults else None
+                try:
+                    if standin.latency:
+                        time.sleep(standin.latency)
+
+                    if fault:
+                        headers = {'Retry-After': str(standin.retry_after)} if standin.retry_after is not None else {}
+                        self.reply(fault, b'{"jsonrpc":"2.0","error":{"code":-32005,"message":"busy"},"id":null}', headers)
+                        return
+
+                    if self.path.startswith('/v0/token-metadata'):
+                        with standin.lock:
+                            standin.metadata_requests.append(payload['mintAccounts'])
+                        self.reply(200, json.dumps(standin.token_metadata(payload['mintAccounts'])).encode())
+                        return
+
+                    calls = payload if isinstance(payload, list) else [payload]
+                    with standin.lock:
+                        standin.calls += len(calls)
+                    replies = [standin.answer(call) for call in calls]
+                    body = json.dumps(replies if isinstance(payload, list) else replies[0]).encode()
+                    self.reply(200, body)
+                finally:
+                    with standin.lock:
+                        standin.active -= 1
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = None
+
+    def answer(self, call):
+        if call.get('method') != 'getTransaction':
+            return {'jsonrpc': '2.0', 'id': call.get('id'), 'error': {'code': -32601, 'message': 'Method not found'}}
+        return {'jsonrpc': '2.0', 'id': call['id'], 'result': self.transactions.get(call['params'][0])}
+
+    def token_metadata(self, mints):
+        return [
+            {'account': mint, 'onChainMetadata': {'metadata': {'data': {'symbol': self.metadata[mint]}}}, 'offChainMetadata': {}}
+            for mint in mints if mint in self.metadata
+        ]
+
+    @property
+    def metadata_url(self):
+        return f"http://{self.host}:{self.port}/v0/token-metadata?api-key=test"
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/?api-key=test"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
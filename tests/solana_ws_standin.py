@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Local Solana RPC Websocket Stand-in
+Answers logsSubscribe/accountSubscribe and replays recorded notifications,
+to test wallet subscriptions without an RPC provider
+"""
+
+import json
+import asyncio
+
+import websockets
+
+# Recorded from a mainnet logsSubscribe (mentions: wallet), signatures and slots shortened
+RECORDED_LOGS_NOTIFICATIONS = [
+    {
+        'jsonrpc': '2.0',
+        'method': 'logsNotification',
+        'params': {
+            'result': {
+                'context': {'slot': 358213001},
+                'value': {
+                    'signature': '5hWv1sQ8KxJ3rYt6bG2ePnUq9oLmZc4dVfA7iTkR1xNwH3jS8uCyB6gE2aD9vMpQ4oL7tZn5rXk1WqY3sFe8bJc',
+                    'err': None,
+                    'logs': [
+                        'Program ComputeBudget111111111111111111111111111111 invoke [1]',
+                        'Program ComputeBudget111111111111111111111111111111 success',
+                        'Program dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN invoke [1]',
+                        'Program log: Instruction: Swap',
+                        'Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA invoke [2]',
+                        'Program log: Instruction: TransferChecked',
+                        'Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA success',
+                        'Program dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN success'
+                    ]
+                }
+            },
+            'subscription': 0
+        }
+    },
+    {
+        'jsonrpc': '2.0',
+        'method': 'logsNotification',
+        'params': {
+            'result': {
+                'context': {'slot': 358213044},
+                'value': {
+                    'signature': '3kPq8nVb2XyT7cWmR4sLdJ9hF6gE1aZuN5oKtQ2iYvB8xC3wM7rS4eD6jG9pA1lH5nU2bT8fV3kX6qW9zR4cM2y',
+                    'err': {'InstructionError': [2, {'Custom': 6001}]},
+                    'logs': [
+                        'Program dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN invoke [1]',
+                        'Program log: Instruction: Swap',
+                        'Program log: AnchorError occurred. Error Code: ExceededSlippage.',
+                        'Program dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN failed: custom program error: 0x1771'
+                    ]
+                }
+            },
+            'subscription': 0
+        }
+    },
+    {
+        'jsonrpc': '2.0',
+        'method': 'logsNotification',
+        'params': {
+            'result': {
+                'context': {'slot': 358213102},
+                'value': {
+                    'signature': '2dRt6yHn4WqB8cVx3mKs7jP1fL9gA5eZoU2iTkN6rXwQ8sC4vM1bY7hE3aJ5pD9lG2nF8tR6kW4qZ1xS7cB3mV',
+                    'err': None,
+                    'logs': [
+                        'Program 11111111111111111111111111111111 invoke [1]',
+                        'Program 11111111111111111111111111111111 success'
+                    ]
+                }
+            },
+            'subscription': 0
+        }
+    }
+]
+
+class SolanaWebsocketStandIn:
+    def __init__(self, host='127.0.0.1', port=0):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.clients = {}  # websocket -> (method, subscription id)
+        self.subscribes = 0
+        self.next_subscription = 100
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/?api-key=test"
+
+    async def start(self):
+        self.server = await websockets.serve(self.handler, self.host, self.port)
+        self.port = list(self.server.sockets)[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handler(self, ws, *args):
+        self.clients[ws] = None
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get('method') not in ('logsSubscribe', 'accountSubscribe'):
+                    await ws.send(json.dumps({
+                        'jsonrpc': '2.0',
+                        'id': message.get('id'),
+                        'error': {'code': -32601, 'message': 'Method not found'}
+                    }))
+                    continue
+
+                self.next_subscription += 1
+                self.subscribes += 1
+                self.clients[ws] = (message['method'], self.next_subscription)
+                await ws.send(json.dumps({'jsonrpc': '2.0', 'result': self.next_subscription, 'id': message['id']}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.pop(ws, None)
+
+    async def wait_for_subscribes(self, count, timeout=5):
+        """Wait until `count` subscriptions happened in total"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self.subscribes < count:
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"Only {self.subscribes} subscribes after {timeout}s")
+            await asyncio.sleep(0.01)
+
+    async def replay(self, notifications, interval=0):
+        """Send recorded notifications to every client subscribed with the matching method"""
+        for notification in notifications:
+            method = notification['method'].replace('Notification', 'Subscribe')
+            for ws, subscription in list(self.clients.items()):
+                if subscription and subscription[0] == method:
+                    message = json.loads(json.dumps(notification))
+                    message['params']['subscription'] = subscription[1]
+                    await ws.send(json.dumps(message))
+            if interval:
+                await asyncio.sleep(interval)
+
+    async def push_account_change(self, lamports, slot=358213200):
+        await self.replay([{
+            'jsonrpc': '2.0',
+            'method': 'accountNotification',
+            'params': {
+                'result': {
+                    'context': {'slot': slot},
+                    'value': {'lamports': lamports, 'data': ['', 'base64'], 'owner': '11111111111111111111111111111111',
+                              'executable': False, 'rentEpoch': 18446744073709551615, 'space': 0}
+                },
+                'subscription': 0
+            }
+        }])
+
+    async def drop_clients(self):
+        """Simulate a network drop"""
+        for ws in list(self.clients):
+            await ws.close()
@@ -124,11 +124,9 @@ def test_pending_images_query():
     try:
         supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
         
-        # Query for coins with pending image sync
-        result = supabase.table('coins')\
-            .select('id, ticker, image_url, image_synced')\
-            .eq('image_synced', False)\
-            .not_.is_('image_url', 'null')\
+        # Query the view photo sync reads its work from
+        result = supabase.table('pending_image_syncs')\
+            .select('id, ticker, image_url')\
             .neq('image_url', 'NO_IMAGE')\
             .limit(5)\
             .execute()
@@ -202,6 +200,885 @@ def test_image_processing_logic():
         print(f"❌ Logic test error: {e}")
         return False
 
+def test_preflight_validation():
+    """Test coins and images that can't succeed are rejected with a precise reason"""
+    print("\n🔍 Testing Pre-flight Validation...")
+    
+    try:
+        from scripts.utils.validation import validate_coin_fields, validate_image, PIL_AVAILABLE
+        
+        coin = {
+            'ticker': 'MOON',
+            'name': 'Moon Token',
+            'website': 'https://twitter.com/user/status/1',
+            'twitter': '@memexshot'
+        }
+        if validate_coin_fields(coin):
+            print(f"❌ Valid coin rejected: {validate_coin_fields(coin)}")
+            return False
+        
+        # ZWJ sequences, variation selectors and tag flags are everyday display-name emoji
+        for name in ('👨\u200d🚀 Moon', '❤\ufe0f Moon', '🏴\U000e0067\U000e0062\U000e0073\U000e0063\U000e0074\U000e007f Moon'):
+            if validate_coin_fields({**coin, 'name': name}):
+                print(f"❌ Emoji name rejected: {validate_coin_fields({**coin, 'name': name})}")
+                return False
+        
+        bad_coins = [
+            ({'ticker': 'MO$N'}, 'ticker'),
+            ({'ticker': 'MOONMOONMOON'}, 'ticker is 12 characters'),
+            ({'name': 'x' * 101}, 'name is 101 characters'),
+            ({'website': 'https://example.com/' + 'a' * 300}, 'website is'),
+            ({'twitter': '@not a handle'}, 'twitter'),
+            ({'name': '   '}, 'name is empty'),
+            ({'name': 'Moon\x00Token'}, 'control characters')
+        ]
+        for override, expected in bad_coins:
+            reason = validate_coin_fields({**coin, **override})
+            if not reason or expected not in reason:
+                print(f"❌ Expected '{expected}' for {override}, got {reason}")
+                return False
+        print(f"✅ {len(bad_coins)} invalid coins rejected with precise reasons; emoji names accepted")
+        
+        if not PIL_AVAILABLE:
+            print("⚠️  Pillow not installed - skipping image decode checks")
+            return True
+        
+        from PIL import Image
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            good = os.path.join(tmp, 'good.jpg')
+            Image.new('RGB', (256, 256), 'orange').save(good, 'JPEG')
+            
+            truncated = os.path.join(tmp, 'truncated.jpg')
+            with open(good, 'rb') as src, open(truncated, 'wb') as dst:
+                dst.write(src.read()[:400])
+            
+            tiny = os.path.join(tmp, 'tiny.png')
+            Image.new('RGB', (16, 16)).save(tiny, 'PNG')
+            
+            html = os.path.join(tmp, 'error.jpg')
+            with open(html, 'w') as f:
+                f.write('<html>rate limited</html>')
+            
+            if validate_image(good):
+                print(f"❌ Valid image rejected: {validate_image(good)}")
+                return False
+            
+            for path, expected in [(truncated, 'corrupt'), (tiny, 'minimum side'), (html, 'not a recognizable image')]:
+                reason = validate_image(path)
+                if not reason or expected not in reason:
+                    print(f"❌ Expected '{expected}' for {os.path.basename(path)}, got {reason}")
+                    return False
+                print(f"✅ {os.path.basename(path)}: {reason}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Validation test error: {e}")
+        return False
+
+def test_download_engine():
+    """Test pooled streaming downloads against a local image host"""
+    print("\n🔍 Testing Download Engine...")
+    
+    try:
+        from scripts.utils.downloads import DownloadEngine
+        from tests.http_standin import ImageStandIn
+        
+        standin = ImageStandIn(image_bytes=100 * 1024, latency=0.01).start()
+        engine = DownloadEngine(max_workers=4, max_bytes=500 * 1024, log=lambda message: None)
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                jobs = [(standin.url(f'/img/{i}.jpg'), os.path.join(tmp, f'{i}.jpg')) for i in range(40)]
+                results = engine.download_many(jobs)
+                
+                if not all(r['ok'] and os.path.getsize(r['path']) == 100 * 1024 for r in results):
+                    print(f"❌ Downloads incomplete: {[r['error'] for r in results if not r['ok']][:3]}")
+                    return False
+                if standin.connections > 4:
+                    print(f"❌ Expected at most 4 pooled connections, got {standin.connections}")
+                    return False
+                print(f"✅ 40 images over {standin.connections} keep-alive connection(s)")
+                
+                # Declared and undeclared oversize bodies are both refused, leaving no partial files
+                for query in ('size=1000000', 'size=1000000&nolength=1'):
+                    path = os.path.join(tmp, 'huge.jpg')
+                    result = engine.download(standin.url(f'/img/huge.jpg?{query}'), path)
+                    if result['ok'] or os.path.exists(path):
+                        print(f"❌ Oversized download should be refused ({query})")
+                        return False
+                
+                missing = engine.download(standin.url('/missing.jpg'), os.path.join(tmp, 'missing.jpg'))
+                if missing['ok'] or '404' not in missing['error']:
+                    print(f"❌ 404 should fail: {missing}")
+                    return False
+                
+                leftovers = [f for f in os.listdir(tmp) if f.endswith('.part')]
+                if leftovers:
+                    print(f"❌ Temp files left behind: {leftovers}")
+                    return False
+                print("✅ Oversized and missing images refused without partial files")
+                
+                print(f"✅ {engine.report()}")
+        finally:
+            engine.close()
+            standin.stop()
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Download engine test error: {e}")
+        return False
+
+def test_image_cache():
+    """Test the content-addressed cache dedupes, persists and evicts LRU"""
+    print("\n🔍 Testing Image Cache...")
+    
+    try:
+        from scripts.utils.image_cache import ImageCache
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = os.path.join(tmp, 'cache')
+            cache = ImageCache(cache_dir, max_bytes=25 * 1024, log=lambda message: None)
+            
+            def downloaded(name, content):
+                path = os.path.join(tmp, name)
+                with open(path, 'wb') as f:
+                    f.write(content)
+                return path
+            
+            cache.put('https://img/a', downloaded('a.jpg', b'a' * 10240))
+            cache.put('https://img/b', downloaded('b.jpg', b'b' * 10240))
+            
+            target = os.path.join(tmp, 'out.jpg')
+            if not cache.fetch('https://img/a', target) or open(target, 'rb').read() != b'a' * 10240:
+                print("❌ Cached image should be served without a download")
+                return False
+            if cache.fetch('https://img/missing', target):
+                print("❌ Unknown URL should miss")
+                return False
+            print(f"✅ {cache.report()}")
+            
+            # Same bytes under another URL share one blob - and its import
+            cache.mark_imported('https://img/a')
+            cache.put('https://img/a-copy', downloaded('a2.jpg', b'a' * 10240))
+            if not cache.was_imported('https://img/a-copy'):
+                print("❌ Identical content should count as already imported")
+                return False
+            print("✅ Duplicate content under a new URL detected")
+            
+            # Third blob exceeds the budget - b is least recently used
+            cache.put('https://img/c', downloaded('c.jpg', b'c' * 10240))
+            if cache.fetch('https://img/b', target) or not cache.fetch('https://img/a', target):
+                print("❌ LRU blob should be evicted, recently used one kept")
+                return False
+            if cache.total_bytes() > 25 * 1024:
+                print(f"❌ Cache over budget: {cache.total_bytes()} bytes")
+                return False
+            print(f"✅ Evicted LRU blob, {cache.total_bytes()} bytes cached")
+            cache.close()
+            
+            # Index survives a restart
+            cache = ImageCache(cache_dir, max_bytes=25 * 1024, log=lambda message: None)
+            if not cache.was_imported('https://img/a') or not cache.fetch('https://img/c', target):
+                print("❌ Index should persist across restarts")
+                return False
+            print("✅ Index and imports persist across restarts")
+            cache.close()
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Image cache test error: {e}")
+        return False
+
+def test_near_duplicate_detection():
+    """Test perceptual hashes match re-encoded images and the multi-index hash table finds them fast"""
+    print("\n🔍 Testing Near-Duplicate Detection...")
+    
+    try:
+        import time
+        import random
+        import numpy as np
+        from PIL import Image
+        from scripts.utils.image_hash import ImageHashIndex, MultiIndexHash, hamming, parse_hash
+        
+        def meme(seed):
+            noise = np.random.default_rng(seed).integers(0, 256, (8, 8, 3), dtype=np.uint8)
+            return Image.fromarray(noise).resize((400, 400), Image.BICUBIC)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            original = os.path.join(tmp, 'original.png')
+            reupload = os.path.join(tmp, 'reupload.jpg')
+            other = os.path.join(tmp, 'other.png')
+            
+            meme(1).save(original)
+            # Twitter-style re-upload: downscaled and recompressed
+            meme(1).resize((300, 300)).save(reupload, 'JPEG', quality=60)
+            meme(2).save(other)
+            
+            for algorithm in ('dhash', 'phash'):
+                index = ImageHashIndex(algorithm=algorithm, max_distance=6, log=lambda message: None)
+                index.add(index.compute(original), 'coin-1', 'MEME')
+                
+                match = index.find_duplicate(index.compute(reupload), exclude_id='coin-2')
+                if not match or match[1] != 'coin-1':
+                    print(f"❌ {algorithm}: re-upload should match the original")
+                    return False
+                if index.find_duplicate(index.compute(other)):
+                    print(f"❌ {algorithm}: unrelated image should not match")
+                    return False
+                if index.find_duplicate(index.compute(original), exclude_id='coin-1'):
+                    print(f"❌ {algorithm}: a coin should not match itself")
+                    return False
+                print(f"✅ {algorithm}: re-upload matched at distance {match[0]}, unrelated image ignored")
+        
+        # Whole-history lookups: agree with brute force, sub-millisecond
+        rng = random.Random(7)
+        hashes = [rng.getrandbits(64) for _ in range(50000)]
+        table = MultiIndexHash(max_distance=6)
+        for i, value in enumerate(hashes):
+            table.add(value, i)
+        
+        # Near misses (up to 6 bits flipped) of stored hashes, plus unrelated queries
+        queries = []
+        for _ in range(200):
+            query = hashes[rng.randrange(len(hashes))]
+            for bit in rng.sample(range(64), rng.randint(0, 6)):
+                query ^= 1 << bit
+            queries.append(query)
+        queries += [rng.getrandbits(64) for _ in range(50)]
+        
+        started = time.perf_counter()
+        results = [table.search(query) for query in queries]
+        per_query = (time.perf_counter() - started) / len(queries)
+        
+        for query, found in list(zip(queries, results))[::10]:
+            expected = sorted(i for i, value in enumerate(hashes) if hamming(query, value) <= 6)
+            if sorted(item for _, item in found) != expected:
+                print("❌ Multi-index results differ from brute force")
+                return False
+        if not all(results[:200]):
+            print("❌ Every near miss should find its source hash")
+            return False
+        print(f"✅ {table.size} hashes, {per_query * 1000:.3f} ms per lookup (distance 6)")
+        
+        # Startup rebuild pages through stored hashes
+        class HashRows:
+            def __init__(self, rows):
+                self.rows, self.window = rows, (0, 0)
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self
+            def range(self, start, end):
+                self.window = (start, end)
+                return self
+            def execute(self):
+                self.data = self.rows[self.window[0]:self.window[1] + 1]
+                return self
+        
+        rows = [{'id': f'coin-{i}', 'ticker': f'T{i}', 'image_hash': f'dhash:{value:016x}'} for i, value in enumerate(hashes[:2500])]
+        index = ImageHashIndex(log=lambda message: None)
+        if index.rebuild(HashRows(rows), 'coins') != 2500 or parse_hash(rows[0]['image_hash'])[1] != hashes[0]:
+            print("❌ Rebuild should load every stored hash")
+            return False
+        print("✅ Index rebuilt from 2500 stored hashes")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Near-duplicate test error: {e}")
+        return False
+
+def test_batched_import():
+    """Test batch imports land atomically and AppleScript imports a batch in one call"""
+    print("\n📥 Testing Batched Import...")
+    
+    try:
+        from scripts.utils.importers import AppleScriptImporter, DropFolderImporter
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            staging = os.path.join(tmp, 'staging')
+            drop = os.path.join(tmp, 'drop')
+            os.makedirs(staging)
+            
+            paths = []
+            for i in range(10):
+                path = os.path.join(staging, f'coin_{i}.jpg')
+                with open(path, 'wb') as f:
+                    f.write(b'\xff\xd8\xff' + bytes([i]) * 1000)
+                paths.append(path)
+            missing = os.path.join(staging, 'missing.jpg')
+            
+            importer = DropFolderImporter(drop, log=lambda message: None)
+            imported, elapsed = importer.import_batch(paths + [missing])
+            
+            if imported != set(paths):
+                print("❌ Every existing file should be imported, the missing one reported")
+                return False
+            if sorted(os.listdir(drop)) != sorted(os.path.basename(p) for p in paths):
+                print("❌ Drop folder should hold exactly the imported files (no partial .part files)")
+                return False
+            with open(os.path.join(drop, 'coin_3.jpg'), 'rb') as f:
+                if f.read() != b'\xff\xd8\xff' + bytes([3]) * 1000:
+                    print("❌ Dropped file content differs")
+                    return False
+            if importer.batches != 1 or importer.images != 11 or importer.failures != 1:
+                print("❌ Import counters are wrong")
+                return False
+            print(f"✅ 10 images dropped in one batch ({elapsed * 1000:.1f} ms), missing file reported")
+            print(f"✅ {importer.report()}")
+        
+        script = AppleScriptImporter(settle_seconds=2).build_script(['/tmp/a.jpg', '/tmp/b.jpg'])
+        if script.count('import {') != 1 or 'POSIX file "/tmp/a.jpg", POSIX file "/tmp/b.jpg"' not in script:
+            print("❌ AppleScript should import the whole batch in one command")
+            return False
+        if script.count('activate') != 1 or script.count('delay 2') != 1:
+            print("❌ AppleScript should activate Photos and wait once per batch")
+            return False
+        print("✅ AppleScript activates Photos once, imports the batch with one command and one settle delay")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Batched import test error: {e}")
+        return False
+
+def test_image_normalization():
+    """Test images are re-encoded to small metadata-free JPEGs in the worker pool"""
+    print("\n🪄 Testing Image Normalization...")
+    
+    try:
+        import numpy as np
+        from PIL import Image
+        from scripts.utils.normalize import ImageNormalizer
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            rng = np.random.default_rng(3)
+            big = Image.fromarray(rng.integers(0, 256, (60, 80, 4), dtype=np.uint8), 'RGBA').resize((2400, 1800))
+            
+            paths = {
+                'png': os.path.join(tmp, 'png_coin.jpg'),    # PNG bytes behind a .jpg name
+                'webp': os.path.join(tmp, 'webp_coin.jpg'),
+                'exif': os.path.join(tmp, 'exif_coin.jpg'),
+                'small': os.path.join(tmp, 'small_coin.jpg'),
+                'broken': os.path.join(tmp, 'broken_coin.jpg')
+            }
+            big.save(paths['png'], 'PNG')
+            big.save(paths['webp'], 'WEBP', quality=95)
+            exif = Image.Exif()
+            exif[0x010F] = 'PhoneMaker'  # Camera make
+            exif[0x0112] = 6             # Rotated 90 degrees
+            big.convert('RGB').save(paths['exif'], 'JPEG', quality=98, exif=exif)
+            big.convert('RGB').resize((400, 300)).save(paths['small'], 'JPEG', quality=95)
+            with open(paths['broken'], 'wb') as f:
+                f.write(b'<html>not an image</html>')
+            
+            normalizer = ImageNormalizer(workers=2, max_side=1024, quality=85, log=lambda message: None)
+            try:
+                results = normalizer.normalize_many(paths.values())
+            finally:
+                normalizer.close()
+            
+            for name in ('png', 'webp', 'exif', 'small'):
+                result = results[paths[name]]
+                if not result['ok']:
+                    print(f"❌ {name}: normalization failed: {result['reason'] or result['error']}")
+                    return False
+                with Image.open(paths[name]) as img:
+                    if img.format != 'JPEG' or img.mode != 'RGB' or max(img.size) > 1024:
+                        print(f"❌ {name}: expected an RGB JPEG within 1024px, got {img.format} {img.mode} {img.size}")
+                        return False
+                    if img.getexif() or 'icc_profile' in img.info:
+                        print(f"❌ {name}: metadata was not stripped")
+                        return False
+                if result['normalized_bytes'] != os.path.getsize(paths[name]):
+                    print(f"❌ {name}: normalized size not recorded")
+                    return False
+            
+            if results[paths['exif']]['normalized_size'] != (768, 1024):
+                print("❌ EXIF orientation should be applied before it is stripped")
+                return False
+            if results[paths['small']]['normalized_size'] != (400, 300):
+                print("❌ Small images should not be upscaled")
+                return False
+            if results[paths['png']]['format'] != 'PNG' or results[paths['png']]['normalized_bytes'] >= results[paths['png']]['original_bytes']:
+                print("❌ PNG original should be recorded and shrink")
+                return False
+            print(f"✅ PNG {results[paths['png']]['original_bytes']} -> {results[paths['png']]['normalized_bytes']} bytes, "
+                  f"WEBP {results[paths['webp']]['original_bytes']} -> {results[paths['webp']]['normalized_bytes']} bytes")
+            print("✅ All outputs are metadata-free RGB JPEGs within 1024px, orientation kept")
+            
+            broken = results[paths['broken']]
+            if broken['ok'] or not broken['reason']:
+                print("❌ Non-image data should be reported for rejection")
+                return False
+            print(f"✅ Non-image rejected: {broken['reason']}")
+            
+            if normalizer.normalized != 4 or any(name.endswith('.part') for name in os.listdir(tmp)):
+                print("❌ Stats wrong or temp files left behind")
+                return False
+            print(f"✅ {normalizer.report()}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Image normalization test error: {e}")
+        return False
+
+def test_realtime_wakeup():
+    """Test photo sync is woken by matching coin changes instead of polling"""
+    print("\n⚡ Testing Realtime Wakeup (local stand-in)...")
+    
+    try:
+        import time
+        import asyncio
+        from tests.realtime_standin import RealtimeStandIn
+        from scripts.utils.realtime import RealtimeWakeup
+        from scripts.services.auto_photo_sync import needs_image_sync
+        
+        async def scenario():
+            standin = await RealtimeStandIn().start()
+            wakeup = RealtimeWakeup(standin.url, 'coins', needs_image_sync, log=lambda message: None,
+                                    reconnect_base_delay=0.05, reconnect_max_delay=0.1).start()
+            try:
+                # First subscribe wakes the loop (gap fill)
+                if not await asyncio.to_thread(wakeup.wait, 5):
+                    return "no wakeup after subscribing"
+                
+                # Rows photo sync has nothing to do for
+                await standin.push('coins', 'UPDATE', {'id': 'c1', 'status': 'pending', 'image_url': 'https://x/a.jpg', 'image_synced': True})
+                await standin.push('coins', 'INSERT', {'id': 'c2', 'status': 'pending', 'image_url': None, 'image_synced': False})
+                if await asyncio.to_thread(wakeup.wait, 0.3):
+                    return "woken by a row that needs no sync"
+                
+                sent_at = time.perf_counter()
+                await standin.push('coins', 'INSERT', {'id': 'c3', 'status': 'pending', 'image_url': 'https://x/b.jpg', 'image_synced': False})
+                if not await asyncio.to_thread(wakeup.wait, 5):
+                    return "promoted coin did not wake the loop"
+                latency_ms = (time.perf_counter() - sent_at) * 1000
+                
+                # Reconnect re-subscribes and wakes again to re-read missed work
+                await standin.drop_clients()
+                if not await asyncio.to_thread(wakeup.wait, 5) or standin.joins < 2:
+                    return "no wakeup after reconnect"
+                
+                return latency_ms
+            finally:
+                wakeup.stop()
+                await standin.stop()
+        
+        outcome = asyncio.run(asyncio.wait_for(scenario(), timeout=20))
+        if isinstance(outcome, str):
+            print(f"❌ {outcome}")
+            return False
+        
+        print(f"✅ Woken {outcome:.2f} ms after a coin needing an image was inserted")
+        print("✅ Synced/imageless rows ignored, reconnect triggers a re-read")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Realtime wakeup test error: {e}")
+        return False
+
+def test_queue_prefetch():
+    """Test queued tweets' images are cached normalized, so syncing after promotion skips download and normalization"""
+    print("\n📦 Testing Queue Prefetch...")
+    
+    try:
+        import io
+        import time
+        import numpy as np
+        from PIL import Image
+        from tests.http_standin import ImageStandIn
+        from scripts.services.auto_photo_sync import AutoPhotoSync, needs_prefetch
+        from scripts.utils.downloads import DownloadEngine
+        from scripts.utils.image_cache import ImageCache
+        from scripts.utils.normalize import ImageNormalizer
+        
+        png = io.BytesIO()
+        noise = np.random.default_rng(5).integers(0, 256, (40, 40, 3), dtype=np.uint8)
+        Image.fromarray(noise).resize((1600, 1600)).save(png, 'PNG')
+        
+        class QueueRows:
+            def __init__(self, rows):
+                self.rows = rows
+            @property
+            def not_(self):
+                return self
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self
+            def execute(self):
+                self.data = self.rows
+                return self
+        
+        standin = ImageStandIn(body=png.getvalue()).start()
+        quiet = lambda message: None
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = [{'image_url': standin.url(f'/img/{i}.png')} for i in range(3)]
+            rows += [{'image_url': rows[0]['image_url']}, {'image_url': 'NO_IMAGE'}]
+            
+            service = AutoPhotoSync.__new__(AutoPhotoSync)
+            service.log = quiet
+            service.supabase = QueueRows(rows)
+            service.queue_prefetch_limit = 50
+            service.queue_prefetch_chunk = 2
+            service.prefetch_thread = None
+            service.downloads = DownloadEngine(max_workers=4, log=quiet)
+            service.image_cache = ImageCache(os.path.join(tmp, 'cache'), log=quiet)
+            service.normalizer = ImageNormalizer(workers=0, log=quiet)
+            
+            try:
+                if not needs_prefetch({'status': 'queued', 'image_url': rows[0]['image_url']}) or needs_prefetch({'status': 'rejected', 'image_url': rows[0]['image_url']}):
+                    print("❌ Only queued rows with an image URL should trigger prefetch")
+                    return False
+                
+                if service.prefetch_queued() != 3 or standin.requests != 3:
+                    print(f"❌ Expected 3 unique images fetched, got {standin.requests} requests")
+                    return False
+                if service.prefetch_queued() != 0 or standin.requests != 3:
+                    print("❌ Cached images should not be fetched again")
+                    return False
+                if not service.start_prefetch():
+                    print("❌ Background prefetch should start when none is running")
+                    return False
+                service.prefetch_thread.join(timeout=10)
+                if service.prefetch_thread.is_alive() or standin.requests != 3:
+                    print("❌ Background prefetch pass should finish without refetching")
+                    return False
+                print("✅ 3 unique queued images downloaded and cached, duplicates/NO_IMAGE skipped")
+                
+                # After promotion: cache hit of the normalized copy, no download or re-encode
+                normalized_before = service.normalizer.normalized
+                local_path = os.path.join(tmp, 'coin.jpg')
+                started = time.perf_counter()
+                cached = service.cached_image(rows[1]['image_url'], local_path)
+                reason, fields = service.prepare_image(local_path, cached)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                
+                if reason or not cached or not cached['cached'] or service.normalizer.normalized != normalized_before:
+                    print("❌ Promoted coin should reuse the normalized copy")
+                    return False
+                if fields['image_original_bytes'] != len(png.getvalue()) or fields['image_bytes'] != os.path.getsize(local_path):
+                    print(f"❌ Sizes not carried through the cache: {fields}")
+                    return False
+                with Image.open(local_path) as img:
+                    if img.format != 'JPEG' or max(img.size) > 1024:
+                        print("❌ Cached copy should be the normalized JPEG")
+                        return False
+                print(f"✅ Sync after promotion: cache hit + ready JPEG in {elapsed_ms:.1f} ms "
+                      f"({fields['image_original_bytes']} -> {fields['image_bytes']} bytes)")
+            finally:
+                service.downloads.close()
+                service.image_cache.close()
+                standin.stop()
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Queue prefetch test error: {e}")
+        return False
+
+def test_staged_pipeline():
+    """Test stages overlap under backpressure and photo sync runs coins through fetch/prepare/import/ack"""
+    print("\n🔧 Testing Staged Pipeline...")
+    
+    try:
+        import io
+        import time
+        import threading
+        import numpy as np
+        from PIL import Image
+        from tests.http_standin import ImageStandIn
+        from scripts.utils.pipeline import Pipeline, Stage, BatchStage
+        from scripts.utils.downloads import DownloadEngine
+        from scripts.utils.image_cache import ImageCache
+        from scripts.utils.normalize import ImageNormalizer
+        from scripts.utils.importers import DropFolderImporter
+        from scripts.services.auto_photo_sync import AutoPhotoSync
+        
+        quiet = lambda message: None
+        
+        # Generic stages: 40 items, sequentially 40 * (50 + 20) ms + 8 batches * 100 ms = 3.6s
+        failed = []
+        def fetch(item):
+            time.sleep(0.05)
+            if item == 13:
+                raise ValueError("unlucky")
+            return item
+        def prepare(item):
+            time.sleep(0.02)
+            return item
+        def import_batch(items):
+            time.sleep(0.1)
+            return items
+        done = []
+        
+        pipeline = Pipeline([
+            Stage('fetch', fetch, workers=4, capacity=4),
+            Stage('prepare', prepare, workers=2, capacity=4),
+            BatchStage('import', import_batch, batch_size=5, flush_interval=30, capacity=4),
+            Stage('ack', done.append, workers=1, capacity=4)
+        ], on_error=lambda stage, item, error: failed.append((stage.name, item)), log=quiet).start()
+        
+        started = time.perf_counter()
+        for i in range(40):
+            pipeline.submit(i)
+        drained = pipeline.drain(timeout=10)
+        elapsed = time.perf_counter() - started
+        
+        if not drained or sorted(done) != [i for i in range(40) if i != 13] or failed != [('fetch', 13)]:
+            print(f"❌ Expected 39 items through and item 13 failed in fetch, got {len(done)} / {failed}")
+            return False
+        if elapsed > 1.8:
+            print(f"❌ Stages should overlap: {elapsed:.2f}s vs 3.6s sequential")
+            return False
+        if any(stage.max_depth > stage.capacity for stage in pipeline.stages):
+            print("❌ A queue grew past its capacity")
+            return False
+        print(f"✅ 40 items in {elapsed:.2f}s (3.6s sequential), queues bounded at 4, failure isolated")
+        
+        # A partial batch goes out as soon as upstream is idle, not after flush_interval
+        started = time.perf_counter()
+        for i in range(3):
+            pipeline.submit(100 + i)
+        pipeline.drain(timeout=10)
+        if time.perf_counter() - started > 1 or 102 not in done:
+            print("❌ Partial batch should flush once upstream is idle")
+            return False
+        print("✅ Partial batch flushed as soon as upstream went idle")
+        for line in pipeline.report().split("\n"):
+            print(f"✅ {line}")
+        pipeline.close()
+        
+        # Photo sync end to end: distinct PNGs -> normalized JPEGs in the drop folder, coins acked
+        def png(path):
+            buffer = io.BytesIO()
+            seed = sum(path.encode())
+            noise = np.random.default_rng(seed).integers(0, 256, (16, 16, 3), dtype=np.uint8)
+            Image.fromarray(noise).resize((600, 600)).save(buffer, 'PNG')
+            return buffer.getvalue()
+        
+        class Writes:
+            def __init__(self):
+                self.rows = {}
+                self.lock = threading.Lock()
+            def stage(self, row_id, sync=False, **fields):
+                with self.lock:
+                    self.rows.setdefault(row_id, {}).update(fields)
+        
+        standin = ImageStandIn(body=png, latency=0.02).start()
+        with tempfile.TemporaryDirectory() as tmp:
+            service = AutoPhotoSync.__new__(AutoPhotoSync)
+            service.log = quiet
+            service.import_folder = os.path.join(tmp, 'import')
+            os.makedirs(service.import_folder)
+            service.processing_coins = set()
+            service.fetch_workers = 4
+            service.prepare_workers = 2
+            service.downloads = DownloadEngine(max_workers=4, log=quiet)
+            service.image_cache = ImageCache(os.path.join(tmp, 'cache'), log=quiet)
+            service.normalizer = ImageNormalizer(workers=2, log=quiet)
+            service.hash_index = None
+            service.hash_lock = threading.Lock()
+            service.duplicate_action = 'off'
+            service.importer = DropFolderImporter(os.path.join(tmp, 'photos'), log=quiet)
+            service.import_batch_size = 4
+            service.import_flush_interval = 30
+            service.sync_writes = Writes()
+            service.pipeline = service.build_pipeline()
+            
+            coins = [{'id': f'coin-{i}', 'ticker': f'PIPE{i}', 'name': f'Pipe {i}', 'image_filename': None,
+                      'twitter_user': 'tester', 'image_url': standin.url(f'/img/{i}.png')} for i in range(10)]
+            coins.append({'id': 'coin-bad', 'ticker': 'x', 'name': 'Bad', 'image_filename': None,
+                          'image_url': standin.url('/img/bad.png')})
+            
+            try:
+                for coin in coins:
+                    service.processing_coins.add(coin['id'])
+                    service.pipeline.submit({'coin': coin, 'path': None, 'filename': None, 'normalized': None, 'fields': {}})
+                if not service.pipeline.drain(timeout=30):
+                    print("❌ Photo sync pipeline did not drain")
+                    return False
+                
+                synced = {row_id: row for row_id, row in service.sync_writes.rows.items() if row.get('image_synced')}
+                photos = os.listdir(os.path.join(tmp, 'photos'))
+                if len(synced) != 10 or len(photos) != 10 or os.listdir(service.import_folder):
+                    print(f"❌ Expected 10 synced coins and photos, no leftovers: {len(synced)} / {len(photos)}")
+                    return False
+                if service.sync_writes.rows['coin-bad'].get('status') != 'failed':
+                    print("❌ Invalid coin should be rejected in the fetch stage")
+                    return False
+                if not all(row['image_bytes'] < row['image_original_bytes'] for row in synced.values()):
+                    print("❌ Normalized sizes should be acknowledged with each coin")
+                    return False
+                if service.importer.batches > 4:
+                    print(f"❌ Imports should be batched, got {service.importer.batches} batches")
+                    return False
+                print(f"✅ 10 coins fetched, normalized, imported in {service.importer.batches} batch(es) and acked; invalid coin rejected")
+            finally:
+                service.pipeline.close(timeout=10)
+                service.normalizer.close()
+                service.downloads.close()
+                service.image_cache.close()
+                standin.stop()
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Staged pipeline test error: {e}")
+        return False
+
+def test_image_sync_failures():
+    """Test dead URLs are failed once and negative-cached while transient failures back off"""
+    print("\n🚧 Testing Image Sync Failure Handling...")
+    
+    try:
+        import threading
+        from tests.http_standin import ImageStandIn
+        from scripts.utils.downloads import DownloadEngine
+        from scripts.utils.image_cache import ImageCache
+        from scripts.services.auto_photo_sync import AutoPhotoSync
+        from config.supabase_config import MAX_RETRIES
+        
+        quiet = lambda message: None
+        standin = ImageStandIn(image_bytes=1024).start()
+        
+        class Recorder:
+            """Captures the direct updates schedule_retry makes"""
+            def __init__(self):
+                self.calls = []
+            def table(self, name):
+                self.current = name
+                return self
+            def update(self, data):
+                self.calls.append((self.current, 'update', data))
+                return self
+            def insert(self, data):
+                self.calls.append((self.current, 'insert', data))
+                return self
+            def eq(self, *args):
+                return self
+            def execute(self):
+                return self
+        
+        class Writes:
+            def __init__(self):
+                self.rows = {}
+                self.lock = threading.Lock()
+            def stage(self, row_id, sync=False, **fields):
+                with self.lock:
+                    self.rows.setdefault(row_id, {}).update(fields)
+            def discard(self, row_id):
+                self.rows.pop(row_id, None)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = DownloadEngine(max_workers=2, timeout=2, log=quiet)
+            try:
+                # Classification
+                cases = {
+                    '/status/404': True, '/status/410': True, '/page/deleted': True,
+                    '/status/503': False, '/status/429': False
+                }
+                for path, permanent in cases.items():
+                    result = engine.download(standin.url(path), os.path.join(tmp, 'x.jpg'))
+                    if result['ok'] or result['permanent'] != permanent:
+                        print(f"❌ {path}: expected permanent={permanent}, got {result}")
+                        return False
+                refused = engine.download('http://127.0.0.1:9/img/a.jpg', os.path.join(tmp, 'x.jpg'))
+                if refused['ok'] or refused['permanent']:
+                    print("❌ Connection errors should be transient")
+                    return False
+                print("✅ 404/410/HTML page permanent; 503/429/connection refused transient")
+                
+                service = AutoPhotoSync.__new__(AutoPhotoSync)
+                service.log = quiet
+                service.import_folder = tmp
+                service.processing_coins = set()
+                service.retry_due = {}
+                service.downloads = engine
+                service.image_cache = ImageCache(os.path.join(tmp, 'cache'), log=quiet)
+                service.sync_writes = Writes()
+                service.supabase = Recorder()
+                
+                def coin(coin_id, path, attempts=0):
+                    service.processing_coins.add(coin_id)
+                    return {'coin': {'id': coin_id, 'ticker': 'DEAD', 'name': 'Dead', 'image_filename': None,
+                                     'twitter_user': 'tester', 'image_url': standin.url(path), 'attempts': attempts},
+                            'path': None, 'filename': None, 'normalized': None, 'fields': {}}
+                
+                # Dead URL: coin failed with a reason, URL remembered
+                if service.fetch_stage(coin('c1', '/status/404')) is not None:
+                    print("❌ Dead URL should stop in the fetch stage")
+                    return False
+                if service.sync_writes.rows['c1']['status'] != 'failed' or '404' not in service.sync_writes.rows['c1']['error_message']:
+                    print(f"❌ Coin with dead URL should be failed with a reason: {service.sync_writes.rows['c1']}")
+                    return False
+                
+                # Same URL on another coin: no network at all
+                requests_before = standin.requests
+                service.fetch_stage(coin('c2', '/status/404'))
+                if standin.requests != requests_before or service.sync_writes.rows['c2']['status'] != 'failed':
+                    print("❌ Negative-cached URL should fail without a request")
+                    return False
+                if service.supabase.calls:
+                    print("❌ Permanent failures should not be retried")
+                    return False
+                print(f"✅ Dead URL failed the coin once; repeat URL skipped ({service.image_cache.negative_hits} negative hit)")
+                
+                # Transient: backoff scheduled, coin released
+                service.fetch_stage(coin('c3', '/status/503'))
+                updates = [data for table, action, data in service.supabase.calls if action == 'update']
+                if len(updates) != 1 or updates[0]['attempts'] != 1 or 'c3' not in service.retry_due or 'c3' in service.processing_coins:
+                    print(f"❌ Transient failure should schedule retry 1: {service.supabase.calls}")
+                    return False
+                if service.next_retry_in() is None or service.next_retry_in() > 60:
+                    print("❌ Wait should be bounded by the scheduled retry")
+                    return False
+                print(f"✅ 503 scheduled retry 1 in {service.next_retry_in():.0f}s, coin released")
+                
+                # Failed Photos import: same backoff, not an immediate re-pick
+                from scripts.utils.importers import DropFolderImporter
+                service.supabase.calls.clear()
+                service.importer = DropFolderImporter(os.path.join(tmp, 'drop'), log=quiet)
+                failed_import = coin('c5', '/img/c5.jpg')
+                failed_import['path'] = os.path.join(tmp, 'c5.jpg')
+                failed_import['imported'] = False
+                service.ack_stage(failed_import)
+                updates = [data for table, action, data in service.supabase.calls if action == 'update']
+                if len(updates) != 1 or 'c5' not in service.retry_due or 'c5' in service.processing_coins:
+                    print(f"❌ Failed import should schedule a retry: {service.supabase.calls}")
+                    return False
+                print("✅ Failed Photos import scheduled a retry, coin released")
+                
+                # Out of attempts: dead letter
+                service.supabase.calls.clear()
+                service.fetch_stage(coin('c4', '/status/503', attempts=MAX_RETRIES - 1))
+                actions = [(table, action) for table, action, _ in service.supabase.calls]
+                if ('dead_letter', 'insert') not in actions or 'c4' in service.retry_due:
+                    print(f"❌ Exhausted retries should dead-letter: {actions}")
+                    return False
+                print(f"✅ Dead-lettered after {MAX_RETRIES} transient failures")
+                
+                # Negative cache survives restarts
+                service.image_cache.close()
+                reopened = ImageCache(os.path.join(tmp, 'cache'), log=quiet)
+                if not reopened.failure_for(standin.url('/status/404')):
+                    print("❌ Negative cache should persist")
+                    return False
+                reopened.close()
+                print("✅ Negative cache persisted across restart")
+            finally:
+                engine.close()
+                standin.stop()
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Failure handling test error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 AUTO PHOTO SYNC TEST SUITE")
@@ -216,7 +1093,17 @@ def main():
         ("Temp Directory", test_temp_directory),
         ("Pending Images", test_pending_images_query),
         ("Service Init", test_auto_photo_sync_init),
-        ("Processing Logic", test_image_processing_logic)
+        ("Processing Logic", test_image_processing_logic),
+        ("Pre-flight Validation", test_preflight_validation),
+        ("Download Engine", test_download_engine),
+        ("Image Cache", test_image_cache),
+        ("Near Duplicates", test_near_duplicate_detection),
+        ("Batched Import", test_batched_import),
+        ("Image Normalization", test_image_normalization),
+        ("Realtime Wakeup", test_realtime_wakeup),
+        ("Queue Prefetch", test_queue_prefetch),
+        ("Staged Pipeline", test_staged_pipeline),
+        ("Failure Handling", test_image_sync_failures)
     ]
     
     results = []
@@ -184,6 +184,273 @@ def test_image_processing():
         print(f"❌ Image processing test error: {e}")
         return False
 
+def test_retry_backoff():
+    """Test exponential backoff with jitter (no database access)"""
+    print("\n🔍 Testing Retry Backoff...")
+    
+    try:
+        from scripts.utils.retry import compute_backoff
+        
+        previous_ceiling = 0
+        for attempts in range(1, 8):
+            ceiling = min(3600, 30 * (2 ** (attempts - 1)))
+            delays = [compute_backoff(attempts, base_delay=30, max_delay=3600) for _ in range(200)]
+            
+            if min(delays) < 15 or max(delays) > ceiling:
+                print(f"❌ Attempt {attempts}: delay out of range ({min(delays):.1f}-{max(delays):.1f}s)")
+                return False
+            if ceiling < previous_ceiling:
+                print(f"❌ Attempt {attempts}: backoff ceiling decreased")
+                return False
+            
+            previous_ceiling = ceiling
+            print(f"   Attempt {attempts}: {min(delays):.1f}s - {max(delays):.1f}s")
+        
+        print("✅ Backoff grows exponentially, jittered and capped")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Retry backoff test error: {e}")
+        return False
+
+def test_dead_letter_payload():
+    """Test dead letters keep the full row even when the caller selected a few columns"""
+    print("\n🔍 Testing Dead Letter Payload...")
+    
+    try:
+        from types import SimpleNamespace
+        from config.supabase_config import MAX_RETRIES, DEAD_LETTER_TABLE
+        from scripts.utils.retry import schedule_retry, requeue_dead_letter
+        
+        class FakeTable:
+            """In-memory table: select/insert/update filtered by eq()"""
+            def __init__(self, rows):
+                self.rows, self.action, self.data, self.filters = rows, 'select', None, {}
+            def select(self, *args):
+                return self
+            def limit(self, *args):
+                return self
+            def eq(self, column, value):
+                self.filters[column] = value
+                return self
+            def insert(self, data):
+                self.action, self.data = 'insert', data
+                return self
+            def update(self, data):
+                self.action, self.data = 'update', data
+                return self
+            def execute(self):
+                if self.action == 'insert':
+                    row = {'id': len(self.rows) + 1, **self.data}
+                    self.rows.append(row)
+                    return SimpleNamespace(data=[row])
+                matched = [row for row in self.rows if all(row.get(k) == v for k, v in self.filters.items())]
+                if self.action == 'update':
+                    for row in matched:
+                        row.update(self.data)
+                return SimpleNamespace(data=[dict(row) for row in matched])
+        
+        class FakeSupabase:
+            def __init__(self):
+                self.tables = {'coins': [], DEAD_LETTER_TABLE: []}
+            def table(self, name):
+                return FakeTable(self.tables[name])
+        
+        supabase = FakeSupabase()
+        full = {'id': 'coin-1', 'ticker': 'MOON', 'name': 'Moon', 'status': 'processing', 'attempts': MAX_RETRIES - 1,
+                'image_url': 'https://pbs.twimg.com/media/moon.jpg', 'tweet_id': '42', 'twitter_user': 'user'}
+        supabase.tables['coins'].append(dict(full))
+        
+        # The listener only selects the columns it types into Moonshot
+        partial = {key: full[key] for key in ('id', 'ticker', 'name', 'attempts')}
+        outcome, _ = schedule_retry(supabase, 'coins', partial, 'automation failed', retry_status='pending')
+        dead_letters = supabase.tables[DEAD_LETTER_TABLE]
+        if outcome != 'dead_letter' or len(dead_letters) != 1:
+            print(f"❌ Last attempt should dead-letter the coin: {outcome}")
+            return False
+        payload = dead_letters[0]['payload']
+        if any(payload.get(key) != full[key] for key in ('image_url', 'tweet_id', 'twitter_user')):
+            print(f"❌ Dead letter payload should be the full row: {payload}")
+            return False
+        
+        # Source row cleaned up: requeue rebuilds it from the payload
+        supabase.tables['coins'].clear()
+        requeue_dead_letter(supabase, dead_letters[0]['id'], {'coins': 'pending'})
+        restored = supabase.tables['coins'][0] if supabase.tables['coins'] else {}
+        if restored.get('image_url') != full['image_url'] or restored.get('tweet_id') != '42' or restored.get('status') != 'pending':
+            print(f"❌ Requeue should restore the full row: {restored}")
+            return False
+        
+        print("✅ Dead letter holds the full row; requeue restores image_url/tweet_id after cleanup")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Dead letter payload test error: {e}")
+        return False
+
+def test_batch_promotion():
+    """Test the promote_queued_tweets RPC path and the single-row fallback (fake Supabase)"""
+    print("\n🔍 Testing Batch Promotion...")
+    
+    try:
+        import httpx
+        from types import SimpleNamespace
+        from postgrest.exceptions import APIError
+        from scripts.services import queue_worker
+        
+        class FakeQuery:
+            """Chainable table query; records filters, returns no rows"""
+            def __init__(self, db, table):
+                self.db, self.table = db, table
+            def __getattr__(self, name):
+                def chain(*args, **kwargs):
+                    self.db.filters.append((self.table, name, args))
+                    return self
+                return chain
+            def execute(self):
+                return SimpleNamespace(data=[], count=0)
+        
+        class FakeSupabase:
+            def __init__(self):
+                self.outcomes = []  # Per rpc() call: list of coins, or an exception to raise
+                self.rpc_calls = 0
+                self.filters = []
+            def table(self, name):
+                return FakeQuery(self, name)
+            def rpc(self, name, params):
+                self.rpc_calls += 1
+                outcome = self.outcomes.pop(0)
+                def execute():
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    return SimpleNamespace(data=outcome)
+                return SimpleNamespace(execute=execute)
+        
+        fake = FakeSupabase()
+        create_client = queue_worker.create_client
+        queue_worker.create_client = lambda url, key: fake
+        try:
+            worker = queue_worker.QueueWorker()
+        finally:
+            queue_worker.create_client = create_client
+        worker.log = lambda message: None
+        
+        coins = [{'ticker': f'T{i}', 'twitter_user': 'user'} for i in range(3)]
+        fake.outcomes = [
+            coins,
+            httpx.ConnectError('connection reset'),
+            APIError({'code': '57014', 'message': 'canceling statement due to statement timeout'}),
+            coins[:1],
+            APIError({'code': 'PGRST202', 'message': 'Could not find the function public.promote_queued_tweets'})
+        ]
+        
+        if worker.promote_batch() != 3:
+            print("❌ RPC result should be the number of promoted coins")
+            return False
+        
+        # Transient failures: nothing promoted, RPC kept for the next loop
+        if worker.promote_batch() != 0 or worker.promote_batch() != 0 or not worker.batch_promotion:
+            print("❌ Transient errors should not disable batch promotion")
+            return False
+        if worker.promote_batch() != 1:
+            print("❌ Batch promotion should recover after a transient error")
+            return False
+        
+        # Function not installed: single-row path from now on
+        if worker.promote_batch() is not None or worker.batch_promotion:
+            print("❌ Missing RPC should switch to the single-row path")
+            return False
+        if worker.promote_single() != 0 or fake.rpc_calls != 5:
+            print("❌ Single-row path should not call the RPC")
+            return False
+        
+        # Coins backing off don't count as active
+        active_filter = [args[0] for table, name, args in fake.filters if table == 'coins' and name == 'or_']
+        if not active_filter or 'next_attempt_at.lte' not in active_filter[0]:
+            print(f"❌ Active coins should exclude pending coins backing off: {active_filter}")
+            return False
+        
+        print("✅ RPC promotes a batch; timeouts and network errors are retried next loop")
+        print("✅ Missing promote_queued_tweets() falls back to the single-row path")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Batch promotion test error: {e}")
+        return False
+
+def test_oversized_queue_rows():
+    """Test queued tweets too long for the coins columns are rejected instead of stalling promotion"""
+    print("\n🔍 Testing Oversized Queue Rows...")
+    
+    try:
+        from types import SimpleNamespace
+        from scripts.services import queue_worker
+        
+        tweet = {
+            'id': 'q-1', 'tweet_id': '1', 'twitter_user': 'user', 'ticker': 'LONG', 'name': 'Long Website',
+            'description': None, 'website': 'https://twitter.com/user/status/' + '1' * 300,
+            'twitter': '@user', 'image_url': None
+        }
+        
+        class FakeQuery:
+            def __init__(self, calls, table):
+                self.calls, self.table = calls, table
+            def __getattr__(self, name):
+                def chain(*args, **kwargs):
+                    self.calls.append((self.table, name, args))
+                    return self
+                return chain
+            def execute(self):
+                return SimpleNamespace(data=[{'id': 'coin-1'}])
+        
+        calls = []
+        worker = queue_worker.QueueWorker.__new__(queue_worker.QueueWorker)
+        worker.supabase = SimpleNamespace(table=lambda name: FakeQuery(calls, name))
+        worker.log = lambda message: None
+        
+        if worker.move_to_coins(tweet):
+            print("❌ Over-long website should not be moved to coins")
+            return False
+        updates = [args[0] for table, name, args in calls if table == 'tweet_queue' and name == 'update']
+        if any(table == 'coins' for table, _, _ in calls) or len(updates) != 1 or updates[0]['status'] != 'rejected' \
+                or 'website is' not in updates[0]['error_message']:
+            print(f"❌ Over-long website should reject the queued tweet: {calls}")
+            return False
+        print(f"✅ Single-row path: {updates[0]['error_message']}")
+        
+        # promote_queued_tweets() itself needs a real Postgres
+        database_url = os.getenv('TEST_DATABASE_URL')
+        if not database_url:
+            print("⚠️  TEST_DATABASE_URL not set - skipping the promote_queued_tweets() check")
+            return True
+        
+        from sqlalchemy import create_engine, text
+        from scripts.benchmarks.bench_queue_promotion import load_schema
+        
+        engine = create_engine(database_url)
+        with engine.connect() as conn:
+            load_schema(conn)
+            conn.execute(text('''
+                INSERT INTO tweet_queue (tweet_id, twitter_user, ticker, name, website, created_at) VALUES
+                    ('ok', 'user', 'MOON', 'Moon', 'https://twitter.com/user/status/1', NOW() - INTERVAL '3 minutes'),
+                    ('web', 'user', 'LONG', 'Long', 'https://twitter.com/user/status/' || repeat('1', 300), NOW() - INTERVAL '2 minutes'),
+                    ('tick', 'user', 'TICKERTOOLONG', 'Tick', 'https://twitter.com/user/status/3', NOW() - INTERVAL '1 minute')
+            '''))
+            promoted = [row[0] for row in conn.execute(text('SELECT ticker FROM promote_queued_tweets(10, 50)'))]
+            statuses = dict(conn.execute(text('SELECT tweet_id, status FROM tweet_queue')).fetchall())
+            conn.rollback()
+        engine.dispose()
+        
+        if promoted != ['MOON'] or statuses != {'ok': 'completed', 'web': 'rejected', 'tick': 'rejected'}:
+            print(f"❌ Oversized rows should be rejected and the rest promoted: {promoted}, {statuses}")
+            return False
+        print("✅ promote_queued_tweets() rejects oversized rows and promotes the rest of the batch")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Oversized queue row test error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 QUEUE WORKER TEST SUITE")
@@ -197,7 +464,11 @@ def main():
         ("Worker Logic", test_queue_worker_logic),
         ("Queue Processing", test_queue_processing_dry_run),
         ("Rate Limits", test_rate_limit_function),
-        ("Image Processing", test_image_processing)
+        ("Image Processing", test_image_processing),
+        ("Retry Backoff", test_retry_backoff),
+        ("Dead Letter Payload", test_dead_letter_payload),
+        ("Batch Promotion", test_batch_promotion),
+        ("Oversized Rows", test_oversized_queue_rows)
     ]
     
     results = []
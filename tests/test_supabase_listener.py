@@ -180,6 +180,355 @@ def test_listener_dry_run():
         print(f"❌ Listener logic error: {e}")
         return False
 
+def test_bounded_seen_ids():
+    """Test that the listener's seen-ID store stays bounded"""
+    print("\n🔍 Testing Bounded Seen IDs...")
+    
+    try:
+        from scripts.utils.lru import LRUSet
+        
+        seen = LRUSet(maxsize=100)
+        for i in range(10000):
+            seen.add(f"coin-{i}")
+        
+        if len(seen) != 100:
+            print(f"❌ Expected 100 IDs, found {len(seen)}")
+            return False
+        if "coin-0" in seen or "coin-9999" not in seen:
+            print("❌ Oldest IDs should be evicted first")
+            return False
+        
+        # Touching an ID keeps it alive
+        seen.add("coin-9900")
+        seen.add("coin-extra")
+        if "coin-9900" not in seen or "coin-9901" in seen:
+            print("❌ Recently touched IDs should survive eviction")
+            return False
+        
+        print(f"✅ Seen IDs bounded at {len(seen)} after 10000 inserts")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Seen IDs test error: {e}")
+        return False
+
+def test_realtime_subscription():
+    """Test realtime subscribe, reconnect and re-join against the local stand-in"""
+    print("\n🔍 Testing Realtime Subscription (local stand-in)...")
+    
+    try:
+        import time
+        import asyncio
+        from tests.realtime_standin import RealtimeStandIn
+        from scripts.utils.realtime import RealtimeChannel
+        
+        async def scenario():
+            standin = await RealtimeStandIn().start()
+            received = []
+            subscribed = []
+            
+            channel = RealtimeChannel(
+                standin.url, 'coins',
+                on_change=lambda change_type, record: received.append((change_type, record, time.perf_counter())),
+                on_subscribed=lambda: subscribed.append(time.perf_counter()),
+                log=lambda message: None,
+                reconnect_base_delay=0.05,
+                reconnect_max_delay=0.1
+            )
+            task = asyncio.create_task(channel.run_forever())
+            
+            try:
+                await standin.wait_for_joins(1)
+                while not subscribed:
+                    await asyncio.sleep(0.01)
+                
+                sent_at = time.perf_counter()
+                await standin.push('coins', 'UPDATE', {'id': 'c1', 'ticker': 'MOON', 'status': 'pending', 'image_synced': True})
+                while not received:
+                    await asyncio.sleep(0.001)
+                latency_ms = (received[0][2] - sent_at) * 1000
+                
+                # Drop the connection - channel must reconnect and re-join
+                await standin.drop_clients()
+                await standin.wait_for_joins(2)
+                while len(subscribed) < 2:
+                    await asyncio.sleep(0.01)
+                
+                await standin.push('coins', 'INSERT', {'id': 'c2', 'ticker': 'PEPE', 'status': 'pending', 'image_synced': False})
+                while len(received) < 2:
+                    await asyncio.sleep(0.001)
+                
+                return latency_ms, received, standin.joins
+            finally:
+                task.cancel()
+                await standin.stop()
+        
+        latency_ms, received, joins = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+        
+        if [r[1]['id'] for r in received] != ['c1', 'c2'] or joins != 2:
+            print(f"❌ Unexpected events {received} / joins {joins}")
+            return False
+        
+        print(f"✅ Event delivered in {latency_ms:.2f} ms")
+        print(f"✅ Reconnected and re-joined after drop ({joins} joins)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Realtime test error: {e}")
+        return False
+
+def test_launch_pacing():
+    """Test token-bucket pacing waits only the time left since the last launch"""
+    print("\n🔍 Testing Launch Pacing...")
+    
+    try:
+        from scripts.utils.pacing import LaunchPacer
+        
+        now = [0.0]
+        pacer = LaunchPacer(launches_per_hour=120, burst=1, min_gap=30, clock=lambda: now[0])
+        
+        if pacer.time_until_ready() != 0:
+            print("❌ First launch should not wait")
+            return False
+        pacer.acquire()
+        
+        # Previous launch took 5 minutes - no extra wait
+        now[0] += 300
+        if pacer.time_until_ready() != 0:
+            print("❌ Long previous launch should leave nothing to wait")
+            return False
+        pacer.acquire()
+        
+        # Quick launch - only the remainder of the gap
+        now[0] += 10
+        wait = pacer.time_until_ready()
+        if abs(wait - 20) > 0.01:
+            print(f"❌ Expected 20s left, got {wait:.2f}s")
+            return False
+        print(f"✅ Waits only the remaining {wait:.0f}s of the gap")
+        
+        # Back-to-back launches for an hour reach the cap
+        now[0] = 0.0
+        pacer = LaunchPacer(launches_per_hour=120, burst=1, min_gap=0, clock=lambda: now[0])
+        while now[0] < 3600:
+            now[0] += pacer.time_until_ready()
+            pacer.acquire()
+        if not 119 <= pacer.launches <= 121:
+            print(f"❌ Expected ~120 launches in an hour, got {pacer.launches}")
+            return False
+        print(f"✅ {pacer.launches} launches in one hour (cap 120)")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Pacing test error: {e}")
+        return False
+
+def test_executor_pool():
+    """Test the executor pool runs coins in parallel and drops failing backends"""
+    print("\n🔍 Testing Executor Pool...")
+    
+    try:
+        import time
+        from scripts.automation.executors import ExecutorPool
+        
+        specs = [
+            {'type': 'fake', 'name': 'fake-0', 'latency': 0.2, 'failure_rate': 0.0},
+            {'type': 'fake', 'name': 'fake-1', 'latency': 0.2, 'failure_rate': 0.0},
+            {'type': 'fake', 'name': 'fake-2', 'latency': 0.2, 'failure_rate': 0.0},
+            {'type': 'fake', 'name': 'broken', 'latency': 0.01, 'failure_rate': 1.0}
+        ]
+        pool = ExecutorPool(specs, max_consecutive_failures=2, log=lambda message: None).start()
+        
+        try:
+            backlog = [{'id': f'coin-{i}', 'ticker': f'T{i}'} for i in range(12)]
+            results = []
+            started = time.perf_counter()
+            
+            while len(results) < 12:
+                while backlog and pool.has_capacity():
+                    pool.submit(backlog.pop(0))
+                results.extend(pool.poll_results(timeout=1))
+                if time.perf_counter() - started > 30:
+                    print("❌ Pool did not drain the backlog")
+                    return False
+            
+            health = pool.health()
+            if health['broken']['healthy'] or health['broken']['failed'] != 2:
+                print(f"❌ Broken backend should be dropped after 2 failures: {health['broken']}")
+                return False
+            print("✅ Failing backend dropped from rotation after 2 consecutive failures")
+            
+            healthy_done = sum(health[name]['completed'] for name in ('fake-0', 'fake-1', 'fake-2'))
+            if healthy_done != 10 or not all(health[name]['healthy'] for name in ('fake-0', 'fake-1', 'fake-2')):
+                print(f"❌ Healthy backends should finish the other 10 coins: {health}")
+                return False
+            
+            # 10 coins x 0.2s on 3 backends (plus process start-up) vs 2s serially
+            if max(r['duration'] for r in results) > 1 or not all('record' in r for r in results):
+                print("❌ Unexpected result records")
+                return False
+            print(f"✅ 12 coins finished in {time.perf_counter() - started:.2f}s across 3 healthy backends")
+            
+        finally:
+            pool.close()
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Executor pool test error: {e}")
+        return False
+
+def test_executor_pool_exhausted():
+    """Test coins queued behind a pool with no healthy backends can be withdrawn"""
+    print("\n🔍 Testing Executor Pool Exhaustion...")
+    
+    try:
+        import time
+        from scripts.automation.executors import ExecutorPool, CoinExecutor
+        
+        try:
+            CoinExecutor()
+            print("❌ CoinExecutor should be abstract")
+            return False
+        except TypeError:
+            pass
+        
+        specs = [{'type': 'fake', 'name': 'broken', 'latency': 0.01, 'failure_rate': 1.0}]
+        pool = ExecutorPool(specs, max_consecutive_failures=1, log=lambda message: None).start()
+        
+        try:
+            pool.submit({'id': 'coin-0', 'ticker': 'T0'})
+            started = time.perf_counter()
+            while pool.healthy_backends():
+                pool.poll_results(timeout=0.5)
+                if time.perf_counter() - started > 30:
+                    print("❌ Broken backend was never dropped")
+                    return False
+            
+            # Submitted after the last backend went away: nobody will ever claim these
+            for i in range(1, 4):
+                pool.submit({'id': f'coin-{i}', 'ticker': f'T{i}'}, {'id': f'coin-{i}'})
+            if pool.has_capacity():
+                print("❌ A pool without healthy backends has no capacity")
+                return False
+            
+            released = pool.take_unclaimed()
+            if sorted(record['id'] for record in released) != ['coin-1', 'coin-2', 'coin-3'] or pool.in_flight:
+                print(f"❌ Unclaimed coins should be withdrawn: {released}, still in flight {pool.in_flight}")
+                return False
+        finally:
+            pool.close()
+        
+        print("✅ CoinExecutor is abstract")
+        print("✅ 3 unclaimed coins withdrawn once no backend is healthy")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Executor pool exhaustion test error: {e}")
+        return False
+
+def test_write_behind_coalescing():
+    """Test status transitions are coalesced per coin and flushed in one write"""
+    print("\n🔍 Testing Write-Behind Status Updates...")
+    
+    try:
+        from scripts.utils.write_behind import WriteBehindBuffer
+        
+        class RecordingClient:
+            """Records bulk RPC calls instead of sending them"""
+            def __init__(self):
+                self.calls = []
+            
+            def rpc(self, name, params):
+                self.calls.append((name, params['updates']))
+                return self
+            
+            def execute(self):
+                return self
+        
+        client = RecordingClient()
+        buffer = WriteBehindBuffer(client, 'coins', flush_interval=60, max_batch=100, log=lambda message: None)
+        
+        for i in range(10):
+            buffer.stage(f'coin-{i}', status='processing', updated_at='t1')
+            buffer.stage(f'coin-{i}', status='completed', updated_at='t2', processed_at='t2')
+        
+        if client.calls:
+            print("❌ Buffered updates should not be written before a flush")
+            return False
+        
+        buffer.flush()
+        if len(client.calls) != 1 or len(client.calls[0][1]) != 10:
+            print(f"❌ Expected one bulk write of 10 rows, got {client.calls}")
+            return False
+        
+        row = client.calls[0][1][0]
+        if row != {'id': 'coin-0', 'status': 'completed', 'updated_at': 't2', 'processed_at': 't2'}:
+            print(f"❌ Latest state should win: {row}")
+            return False
+        print("✅ 20 transitions for 10 coins flushed as 1 write with the latest state")
+        
+        buffer.stage('coin-x', sync=True, status='processing')
+        if len(client.calls) != 2:
+            print("❌ Sync transition should be written before returning")
+            return False
+        print("✅ Sync transition written through")
+        
+        if buffer.writes_saved_per_flush() != 9.5:
+            print(f"❌ Expected 9.5 writes saved per flush, got {buffer.writes_saved_per_flush()}")
+            return False
+        print(f"✅ {buffer.report()}")
+        
+        # A failed bulk write keeps the batch and the RPC; only a missing function falls back
+        from postgrest.exceptions import APIError
+        
+        class FailingClient(RecordingClient):
+            def __init__(self, errors):
+                super().__init__()
+                self.errors = errors
+                self.updates = []
+            def execute(self):
+                if self.errors:
+                    raise self.errors.pop(0)
+                return self
+            def table(self, name):
+                return self
+            def update(self, fields):
+                self.updates.append(fields)
+                return self
+            def eq(self, column, value):
+                return self
+        
+        client = FailingClient([APIError({'code': '57014', 'message': 'statement timeout'})])
+        buffer = WriteBehindBuffer(client, 'coins', flush_interval=60, max_batch=100, log=lambda message: None)
+        try:
+            buffer.stage('coin-y', sync=True, status='processing')
+            print("❌ Failed sync transition should raise")
+            return False
+        except APIError:
+            pass
+        if not buffer.bulk or 'coin-y' not in buffer.pending:
+            print("❌ Transient failure should keep bulk writes and the pending update")
+            return False
+        buffer.flush()
+        if len(client.calls) != 2 or client.updates:
+            print("❌ Retried flush should use the bulk RPC")
+            return False
+        
+        client.errors = [APIError({'code': 'PGRST202', 'message': 'Could not find the function'})]
+        buffer.stage('coin-z', sync=True, status='completed')
+        if buffer.bulk or client.updates != [{'status': 'completed'}]:
+            print("❌ Missing bulk function should fall back to per-row updates")
+            return False
+        print("✅ Failed bulk write raised and was retried; missing function falls back to per-row")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Write-behind test error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 SUPABASE LISTENER TEST SUITE")
@@ -194,7 +543,13 @@ def main():
         ("Listener Init", test_listener_initialization),
         ("Automation Module", test_moonshot_automation_availability),
         ("Status Logic", test_status_update_logic),
-        ("Listener Logic", test_listener_dry_run)
+        ("Listener Logic", test_listener_dry_run),
+        ("Bounded Seen IDs", test_bounded_seen_ids),
+        ("Realtime Subscription", test_realtime_subscription),
+        ("Launch Pacing", test_launch_pacing),
+        ("Executor Pool", test_executor_pool),
+        ("Pool Exhaustion", test_executor_pool_exhausted),
+        ("Write-Behind Updates", test_write_behind_coalescing)
     ]
     
     results = []
@@ -160,6 +160,59 @@ def test_twitter_bot_initialization():
         print(f"❌ Initialization Error: {e}")
         return False
 
+def test_admission_control():
+    """Test admission decisions from cached estimates (no database access)"""
+    print("\n🔍 Testing Admission Control...")
+    
+    try:
+        import time
+        from scripts.utils.admission import AdmissionController
+        
+        controller = AdmissionController(supabase=None)
+        controller.slo_seconds = 1800
+        controller.service_time = 300
+        controller.max_active = 1
+        controller.last_refresh = time.time()  # Keep estimates cached
+        
+        controller.queue_depth = 2
+        if controller.admit(followers_count=50)['action'] != 'admit':
+            print("❌ Short queue should be admitted")
+            return False
+        print(f"✅ Admitted with {controller.queue_depth} queued (~{int(controller.expected_wait())}s wait)")
+        
+        controller.queue_depth = 20
+        decision = controller.admit(followers_count=50)
+        if decision['action'] != 'reject' or not decision.get('error_message'):
+            print("❌ Long queue should be rejected with an error message")
+            return False
+        print(f"✅ Rejected: {decision['error_message']}")
+        
+        controller.action = 'defer'
+        if controller.admit(followers_count=5000)['action'] != 'admit':
+            print("❌ High-priority user should not be deferred")
+            return False
+        if controller.admit(followers_count=50)['action'] != 'defer':
+            print("❌ Low-priority user should be deferred")
+            return False
+        print("✅ Low-priority deferred, high-priority admitted")
+        
+        if controller.daily_quota(5) >= 5:
+            print("❌ Quota should shrink when over SLO")
+            return False
+        print(f"✅ Reduced quota: {controller.daily_quota(5)}/day")
+        
+        controller.observe_service_time(600)
+        if not 300 < controller.service_time < 600:
+            print("❌ EWMA should move toward new observation")
+            return False
+        print(f"✅ EWMA service time: {controller.service_time:.0f}s")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Admission control test error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 TWITTER BOT TEST SUITE")
@@ -172,7 +225,8 @@ def main():
         ("API Connection", test_twitter_api_connection),
         ("Tweet Search", test_search_tweets),
         ("Supabase", test_supabase_connection),
-        ("Bot Init", test_twitter_bot_initialization)
+        ("Bot Init", test_twitter_bot_initialization),
+        ("Admission Control", test_admission_control)
     ]
     
     results = []
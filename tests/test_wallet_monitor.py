@@ -220,6 +220,619 @@ def test_reply_dry_run():
         print(f"❌ Reply logic error: {e}")
         return False
 
+def test_wallet_subscription():
+    """Test pushed wallet signatures, failed-transaction filtering and gap-fill on reconnect"""
+    print("\n🔍 Testing Wallet Subscription (local stand-in)...")
+    
+    try:
+        import time
+        import asyncio
+        from tests.solana_ws_standin import SolanaWebsocketStandIn, RECORDED_LOGS_NOTIFICATIONS
+        from scripts.utils.solana_ws import WalletSubscription
+        
+        wallet = '9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM'
+        
+        async def scenario(mode):
+            standin = await SolanaWebsocketStandIn().start()
+            events = asyncio.Queue()
+            subscription = WalletSubscription(
+                standin.url, wallet,
+                on_signature=lambda signature, slot: events.put_nowait(('signature', signature, time.perf_counter())),
+                on_subscribed=lambda: events.put_nowait(('gap-fill', None, time.perf_counter())),
+                mode=mode, log=lambda message: None,
+                reconnect_base_delay=0.05, reconnect_max_delay=0.1
+            )
+            task = asyncio.create_task(subscription.run_forever())
+            
+            async def next_event():
+                return await asyncio.wait_for(events.get(), 5)
+            
+            try:
+                if (await next_event())[0] != 'gap-fill':
+                    return "no gap-fill after subscribing"
+                
+                if mode == 'account':
+                    await standin.push_account_change(1500000)
+                    kind, signature, _ = await next_event()
+                    if kind != 'signature' or signature is not None:
+                        return "account change should ask for a lookup"
+                    return 0.0
+                
+                sent_at = time.perf_counter()
+                await standin.replay(RECORDED_LOGS_NOTIFICATIONS)
+                first = await next_event()
+                second = await next_event()
+                latency_ms = (first[2] - sent_at) * 1000
+                
+                expected = [RECORDED_LOGS_NOTIFICATIONS[0], RECORDED_LOGS_NOTIFICATIONS[2]]
+                if [first[1], second[1]] != [n['params']['result']['value']['signature'] for n in expected]:
+                    return f"unexpected signatures (failed transaction not skipped?): {first[1]}, {second[1]}"
+                
+                # Drop: reconnect, re-subscribe and gap-fill, then keep receiving
+                await standin.drop_clients()
+                if (await next_event())[0] != 'gap-fill' or standin.subscribes < 2:
+                    return "no gap-fill after reconnect"
+                await standin.replay(RECORDED_LOGS_NOTIFICATIONS[:1])
+                if (await next_event())[1] != first[1]:
+                    return "no notifications after reconnect"
+                
+                return latency_ms
+            finally:
+                task.cancel()
+                await standin.stop()
+        
+        outcome = asyncio.run(asyncio.wait_for(scenario('logs'), timeout=20))
+        if isinstance(outcome, str):
+            print(f"❌ {outcome}")
+            return False
+        print(f"✅ Swap signature pushed {outcome:.2f} ms after the notification (was up to 30 s polling)")
+        print("✅ Failed transactions skipped, reconnect re-subscribes and gap-fills")
+        
+        outcome = asyncio.run(asyncio.wait_for(scenario('account'), timeout=20))
+        if isinstance(outcome, str):
+            print(f"❌ {outcome}")
+            return False
+        print("✅ accountSubscribe changes trigger a signature lookup")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Wallet subscription test error: {e}")
+        return False
+
+def test_signature_drain():
+    """Test a burst between polls is drained completely, oldest first, stopping at the cursor"""
+    print("\n🔍 Testing Cursor-Paginated Signature Drain...")
+    
+    try:
+        import time
+        import asyncio
+        from types import SimpleNamespace
+        from solders.signature import Signature
+        from scripts.utils.signatures import fetch_signatures_since
+        
+        wallet = '9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM'
+        now = int(time.time())
+        
+        class FakeRPC:
+            """getSignaturesForAddress over a newest-first history, with before/until/limit"""
+            def __init__(self, history):
+                self.history = history
+                self.requests = []
+            async def get_signatures_for_address(self, pubkey, before=None, until=None, limit=1000, commitment=None):
+                self.requests.append(limit)
+                signatures = [info.signature for info in self.history]
+                start = signatures.index(before) + 1 if before else 0
+                stop = signatures.index(until) if until else len(signatures)
+                return SimpleNamespace(value=self.history[start:stop][:limit])
+        
+        # 2500 transactions in one burst, newest first; 500 more from an hour ago
+        history = [SimpleNamespace(signature=Signature(i.to_bytes(64, 'big')), block_time=now - i // 100, err=None)
+                   for i in range(1, 2501)]
+        history += [SimpleNamespace(signature=Signature((5000 + i).to_bytes(64, 'big')), block_time=now - 3600, err=None)
+                    for i in range(500)]
+        rpc = FakeRPC(history)
+        
+        # Cursor 2000 signatures back: everything newer, oldest first
+        cursor = str(history[2000].signature)
+        drained, pages = asyncio.run(fetch_signatures_since(rpc, wallet, until=cursor))
+        if [info.signature for info in drained] != [info.signature for info in reversed(history[:2000])]:
+            print("❌ Drain should return every signature newer than the cursor, oldest first")
+            return False
+        if pages != 3 or set(rpc.requests) != {1000}:
+            print(f"❌ Expected 3 pages at the RPC maximum, got {pages} ({rpc.requests[:3]})")
+            return False
+        print(f"✅ Burst of {len(drained)} drained in {pages} pages (a 10-signature poll would miss {len(drained) - 10})")
+        
+        # Nothing new: a single short page
+        drained, pages = asyncio.run(fetch_signatures_since(rpc, wallet, until=str(history[0].signature)))
+        if drained or pages != 1:
+            print("❌ Caught-up cursor should cost one empty request")
+            return False
+        
+        # No cursor (startup): stop paging once pages reach past the recency window
+        rpc.requests.clear()
+        drained, pages = asyncio.run(fetch_signatures_since(rpc, wallet, page_size=100, max_age=1800))
+        if pages != 26 or drained[0].block_time != now - 3600:
+            print(f"❌ Startup drain should stop at the first page reaching old signatures ({pages} pages)")
+            return False
+        print(f"✅ Caught-up poll is one request; startup drain stops at the 30 minute window ({pages} pages)")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Signature drain test error: {e}")
+        return False
+
+def test_signature_store():
+    """Test processed signatures stay ordered, bounded and survive a restart with their classification"""
+    print("\n🔍 Testing Processed-Signature Store...")
+    
+    try:
+        import time
+        import tempfile
+        from scripts.utils.signature_store import SignatureStore
+        
+        quiet = lambda message: None
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'wallet_monitor.sqlite')
+            store = SignatureStore(path, window_seconds=3600, maxsize=100, log=quiet)
+            
+            for i in range(150):
+                store.add(f"sig{i}", {'swap': i % 50 == 0, 'ticker': f"T{i}" if i % 50 == 0 else None})
+            
+            # Oldest dropped first - the 100 most recent are all still known
+            if len(store) != 100 or 'sig49' in store or not all(f"sig{i}" in store for i in range(50, 150)):
+                print("❌ Store should keep exactly the 100 most recent signatures")
+                return False
+            print("✅ Bounded by insertion order (the old set kept an arbitrary 50)")
+            
+            # Restart: same signatures known, classification cached - no getTransaction needed
+            store.close()
+            store = SignatureStore(path, window_seconds=3600, maxsize=100, log=quiet)
+            if len(store) != 100 or store.get('sig100') != {'swap': True, 'ticker': 'T100'}:
+                print("❌ Signatures and classifications should survive a restart")
+                return False
+            if store.get('sig101') != {'swap': False, 'ticker': None} or store.hits != 2:
+                print("❌ Cached lookups should count as repeats")
+                return False
+            print("✅ Restart restores signatures with their classification")
+            store.close()
+            
+            # Time window: entries older than the window expire, on disk too
+            store = SignatureStore(path, window_seconds=0.2, maxsize=100, log=quiet)
+            store.add('fresh-1', {'swap': False})
+            time.sleep(0.3)
+            store.add('fresh-2', {'swap': False})
+            if 'fresh-1' in store or 'fresh-2' not in store:
+                print("❌ Signatures past the window should expire")
+                return False
+            store.close()
+            
+            store = SignatureStore(path, window_seconds=0.2, maxsize=100, log=quiet)
+            if len(store) != 1:
+                print(f"❌ Expired signatures should be gone after a restart ({len(store)} left)")
+                return False
+            store.close()
+            print("✅ Signatures expire after the time window")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Signature store test error: {e}")
+        return False
+
+def test_transaction_fetching():
+    """Test concurrent batched getTransaction against serial calls, with 429/5xx retries"""
+    print("\n🔍 Testing Transaction Fetching (local RPC stand-in)...")
+    
+    try:
+        import time
+        import asyncio
+        from tests.rpc_standin import RPCStandIn, recorded_transactions
+        from scripts.utils.rpc import TransactionFetcher
+        
+        quiet = lambda message: None
+        transactions = recorded_transactions(40)
+        signatures = list(transactions)
+        
+        async def collect(fetcher, signatures):
+            return {signature: transaction async for signature, transaction in fetcher.fetch(signatures)}
+        
+        async def throughput():
+            standin = RPCStandIn(transactions, latency=0.02).start()
+            try:
+                # Old behaviour: one round trip after another
+                serial = TransactionFetcher(standin.url, concurrency=1, batch_size=1, log=quiet)
+                started = time.perf_counter()
+                serial_results = await collect(serial, signatures)
+                serial_seconds = time.perf_counter() - started
+                await serial.close()
+                
+                fetcher = TransactionFetcher(standin.url, concurrency=4, batch_size=5, log=quiet)
+                requests_before = standin.requests
+                started = time.perf_counter()
+                arrivals = []
+                results = {}
+                async for signature, transaction in fetcher.fetch(signatures):
+                    arrivals.append(time.perf_counter() - started)
+                    results[signature] = transaction
+                batched_seconds = time.perf_counter() - started
+                
+                if results != serial_results or results != transactions:
+                    return "Batched fetch should return the same transactions"
+                if standin.requests - requests_before != 8 or standin.max_concurrent < 2:
+                    return f"Expected 8 concurrent batch requests, got {standin.requests - requests_before}"
+                
+                # Unknown signature: None, not an error
+                if await fetcher.fetch_one('1' * 88) is not None:
+                    return "Unknown signature should come back as None"
+                await fetcher.close()
+                return serial_seconds, batched_seconds, arrivals[0]
+            finally:
+                standin.stop()
+        
+        async def faults():
+            # Rate limited, then a provider hiccup: retried transparently
+            standin = RPCStandIn(transactions, faults=[429, 503], retry_after=0).start()
+            try:
+                fetcher = TransactionFetcher(standin.url, concurrency=1, batch_size=40, log=quiet,
+                                             retry_base_delay=0.01, retry_max_delay=0.05)
+                results = await collect(fetcher, signatures)
+                if results != transactions or fetcher.retries != 2:
+                    return f"429/503 should be retried ({fetcher.retries} retries)"
+                
+                # Still failing after max_retries: signatures come back as None for the next poll
+                standin.faults = [500] * 10
+                fetcher.max_retries = 2
+                results = await collect(fetcher, signatures[:3])
+                if list(results.values()) != [None, None, None]:
+                    return "Exhausted retries should yield None"
+                await fetcher.close()
+            finally:
+                standin.stop()
+        
+        outcome = asyncio.run(asyncio.wait_for(throughput(), timeout=30))
+        if isinstance(outcome, str):
+            print(f"❌ {outcome}")
+            return False
+        serial_seconds, batched_seconds, first = outcome
+        print(f"✅ {len(signatures)} transactions: serial {serial_seconds:.2f}s, "
+              f"batched+concurrent {batched_seconds:.2f}s ({serial_seconds / batched_seconds:.1f}x), "
+              f"first result after {first * 1000:.0f} ms")
+        
+        outcome = asyncio.run(asyncio.wait_for(faults(), timeout=30))
+        if outcome:
+            print(f"❌ {outcome}")
+            return False
+        print("✅ 429/503 retried with backoff; persistent 5xx leaves signatures for the next poll")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Transaction fetching test error: {e}")
+        return False
+
+def test_swap_classifier():
+    """Test the single-pass classifier on recorded wallet activity"""
+    print("\n🔍 Testing Swap Classifier (recorded transactions)...")
+    
+    try:
+        import copy
+        from tests.rpc_standin import recorded_wallet_activity, RECORDED_SWAP_TRANSACTION, WALLET, MOON_MINT
+        from scripts.utils.swap_classifier import classify_transaction, SwapClassification
+        
+        # Swap, 25 USDC swap, non-moon token, no Meteora
+        expected = [(True, MOON_MINT, 'FROG'), (False, None, None), (True, None, None), (False, None, None)]
+        for i, transaction in enumerate(recorded_wallet_activity(8).values()):
+            swap = classify_transaction(transaction, WALLET)
+            if (swap.is_swap, swap.moon_mint, swap.ticker) != expected[i % 4]:
+                print(f"❌ Transaction {i}: {swap}, expected {expected[i % 4]}")
+                return False
+        
+        swap = classify_transaction(RECORDED_SWAP_TRANSACTION, WALLET)
+        if swap.usdc_amount != 5.0 or swap.moon_amount != 31250000.0 or swap.block_time != 1760850000:
+            print(f"❌ Wrong swap details: {swap}")
+            return False
+        if swap.as_dict() != {'swap': True, 'usdc_amount': 5.0, 'mint': MOON_MINT, 'ticker': 'FROG'}:
+            print(f"❌ Wrong stored classification: {swap.as_dict()}")
+            return False
+        if hasattr(swap, '__dict__'):
+            print("❌ SwapClassification should use __slots__")
+            return False
+        
+        # Balance delta, not the post balance: a wallet already holding the token
+        topped_up = copy.deepcopy(RECORDED_SWAP_TRANSACTION)
+        pre = copy.deepcopy(topped_up['meta']['postTokenBalances'][1])
+        pre['uiTokenAmount']['uiAmount'] = 1000000.0
+        topped_up['meta']['preTokenBalances'] = [pre]
+        if classify_transaction(topped_up, WALLET).moon_amount != 30250000.0:
+            print("❌ Moon amount should be the balance delta")
+            return False
+        
+        # No ticker in the logs: a metadata instruction, then None (Helius fallback)
+        topped_up['meta']['logMessages'] = []
+        if classify_transaction(topped_up, WALLET).ticker is not None:
+            print("❌ Ticker should be left for the Helius lookup")
+            return False
+        topped_up['transaction']['message']['instructions'].append(
+            {'program': 'spl-token-metadata', 'parsed': {'type': 'createMetadataAccounts', 'info': {'symbol': 'frog'}}})
+        if classify_transaction(topped_up, WALLET).ticker != 'FROG':
+            print("❌ Ticker should come from the metadata instruction")
+            return False
+        
+        # Not the monitored wallet, or an empty result
+        if classify_transaction(RECORDED_SWAP_TRANSACTION, MOON_MINT).moon_mint or classify_transaction({}, WALLET).is_swap:
+            print("❌ Other wallets' balances should be ignored")
+            return False
+        
+        print("✅ Swaps, other amounts, non-moon tokens and non-Meteora transactions classified correctly")
+        print("✅ Moon amount is the balance delta; ticker from logs, metadata, else Helius")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Swap classifier test error: {e}")
+        return False
+
+def test_token_metadata():
+    """Test Helius metadata lookups are batched, coalesced and cached in memory and on disk"""
+    print("\n🔍 Testing Token Metadata Lookups (local Helius stand-in)...")
+    
+    try:
+        import time
+        import asyncio
+        import tempfile
+        from tests.rpc_standin import RPCStandIn
+        from scripts.utils.token_metadata import TokenMetadataService, helius_metadata_url
+        
+        quiet = lambda message: None
+        symbols = {f"Mint{i}moon": f"COIN{i}" for i in range(5)}
+        mints = list(symbols) * 4  # Every mint looked up four times at once
+        
+        if helius_metadata_url("https://mainnet.helius-rpc.com/?api-key=abc") != \
+                "https://api.helius.xyz/v0/token-metadata?api-key=abc" or helius_metadata_url("https://rpc.example"):
+            print("❌ Metadata URL should come from the Helius API key")
+            return False
+        
+        async def lookup_all(service):
+            found = await asyncio.gather(*(service.lookup(mint) for mint in symbols))
+            return dict(zip(symbols, found))
+        
+        async def run(tmp):
+            path = os.path.join(tmp, 'wallet_monitor.sqlite')
+            standin = RPCStandIn({}, latency=0.05, metadata=dict(symbols)).start()
+            try:
+                service = TokenMetadataService(standin.metadata_url, path, log=quiet)
+                results = await asyncio.gather(*(service.lookup(mint) for mint in mints + ['Unknownmoon']))
+                if results != [symbols[mint] for mint in mints] + [None]:
+                    return f"Wrong symbols: {results}"
+                if len(standin.metadata_requests) != 1 or len(standin.metadata_requests[0]) != 6:
+                    return f"Expected one request for 6 mints, got {standin.metadata_requests}"
+                if service.coalesced != 15:
+                    return f"Expected 15 coalesced lookups, got {service.coalesced}"
+                
+                # Cached: no request; the unknown mint is asked for again
+                if await lookup_all(service) != symbols or len(standin.metadata_requests) != 1:
+                    return "Known mints should be served from memory"
+                standin.metadata['Unknownmoon'] = 'LATE'
+                if await service.lookup('Unknownmoon') != 'LATE':
+                    return "Misses shouldn't be cached"
+                report = service.report()
+                await service.close()
+                
+                # Restart: served from the table
+                service = TokenMetadataService(standin.metadata_url, path, log=quiet)
+                if await lookup_all(service) != symbols or service.stored_hits != 5:
+                    return "Symbols should survive a restart"
+                if len(standin.metadata_requests) != 2:
+                    return "Restart should not look symbols up again"
+                await service.close()
+                
+                # Expired, and a failing request: None now, fetched again later
+                service = TokenMetadataService(standin.metadata_url, path, ttl=0.01, log=quiet)
+                await asyncio.sleep(0.02)
+                standin.faults = [500]
+                if await service.lookup('Mint0moon') is not None or service.failures != 1:
+                    return "A failed request should answer None"
+                if await service.lookup('Mint0moon') != 'COIN0' or len(standin.metadata_requests) != 3:
+                    return "Expired symbol should be fetched again"
+                await service.close()
+                
+                # Closed with a lookup still waiting for its batch: answered None, not left hanging
+                service = TokenMetadataService(standin.metadata_url, path, batch_window=10, log=quiet)
+                waiting = asyncio.create_task(service.lookup('Waitingmoon'))
+                await asyncio.sleep(0)
+                await service.close()
+                if await asyncio.wait_for(waiting, 1) is not None:
+                    return "A lookup waiting on close should get None"
+                return report
+            finally:
+                standin.stop()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            outcome = asyncio.run(asyncio.wait_for(run(tmp), timeout=30))
+        if not outcome.startswith("🏷️"):
+            print(f"❌ {outcome}")
+            return False
+        
+        print(f"✅ {len(mints) + 1} concurrent lookups sent as one request for 6 mints")
+        print(f"✅ {outcome}")
+        print("✅ Symbols restored from disk after restart; expired and failed lookups retried")
+        print("✅ Lookups still waiting when the service closes get None")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Token metadata test error: {e}")
+        return False
+
+def test_concurrent_swap_handling():
+    """Test swaps found in one poll are classified, looked up and replied to concurrently"""
+    print("\n🔍 Testing Concurrent Swap Handling (async monitor)...")
+    
+    try:
+        import time
+        import asyncio
+        import tempfile
+        import threading
+        from types import SimpleNamespace
+        from solders.signature import Signature
+        from tests.rpc_standin import RPCStandIn, recorded_transactions, WALLET
+        from scripts.utils.rpc import TransactionFetcher
+        from scripts.utils.signature_store import SignatureStore
+        from scripts.services import wallet_monitor_reply_bot as monitor
+        
+        quiet = lambda message: None
+        swaps = 5
+        transactions = recorded_transactions(swaps)
+        for i, transaction in enumerate(transactions.values()):
+            transaction['meta']['logMessages'][2] = f"Program log: Symbol: COIN{i}"
+        
+        class FakeSolana:
+            async def get_signatures_for_address(self, pubkey, before=None, until=None, limit=1000, commitment=None):
+                newest_first = list(reversed(transactions))
+                if until:
+                    newest_first = newest_first[:newest_first.index(str(until))]
+                return SimpleNamespace(value=[SimpleNamespace(signature=Signature.from_string(sig), block_time=int(time.time()))
+                                              for sig in newest_first[:limit]])
+        
+        class FakeQuery:
+            """Supabase query builder with 50 ms per round trip"""
+            def __init__(self, db, table):
+                self.db, self.table, self.action, self.filters = db, table, 'select', {}
+            def select(self, *args):
+                return self
+            def order(self, *args, **kwargs):
+                return self
+            def limit(self, *args):
+                return self
+            def eq(self, column, value):
+                self.filters[column] = value
+                return self
+            def insert(self, data):
+                self.action, self.data = 'insert', data
+                return self
+            def update(self, data):
+                self.action, self.data = 'update', data
+                return self
+            async def execute(self):
+                await asyncio.sleep(0.05)
+                if self.table == 'coins':
+                    ticker = self.filters['ticker']
+                    return SimpleNamespace(data=[{'id': ticker, 'ticker': ticker, 'name': ticker, 'status': 'launched',
+                                                  'twitter_user': 'tester', 'tweet_id': f"tweet-{ticker}"}])
+                if self.action == 'insert':
+                    self.db.queue.append(self.data)
+                    return SimpleNamespace(data=[{'id': len(self.db.queue)}])
+                if self.action == 'update':
+                    self.db.updates.append(self.data['status'])
+                    return SimpleNamespace(data=[])
+                return SimpleNamespace(data=[row for row in self.db.queue if row['tweet_id'] == self.filters['tweet_id']])
+        
+        class FakeSupabase:
+            def __init__(self):
+                self.queue, self.updates = [], []
+            def table(self, name):
+                return FakeQuery(self, name)
+        
+        class FakeTwitter:
+            """tweepy.Client stand-in: blocks 200 ms per tweet, like the real HTTP call"""
+            active = 0
+            max_active = 0
+            lock = threading.Lock()
+            def __init__(self):
+                self.sent = []
+            def create_tweet(self, text, in_reply_to_tweet_id):
+                with FakeTwitter.lock:
+                    FakeTwitter.active += 1
+                    FakeTwitter.max_active = max(FakeTwitter.max_active, FakeTwitter.active)
+                time.sleep(0.2)
+                with FakeTwitter.lock:
+                    FakeTwitter.active -= 1
+                self.sent.append(in_reply_to_tweet_id)
+                return SimpleNamespace(data={'id': f"reply-{in_reply_to_tweet_id}"})
+        
+        accounts = [{"name": f"account{i}", "client": FakeTwitter(), "daily_limit": 100, "daily_count": 0,
+                     "last_reset": datetime.now().date(), "last_tweet_time": None} for i in range(swaps)]
+        
+        async def scenario(tmp):
+            standin = RPCStandIn(transactions, latency=0.02).start()
+            monitor.transaction_fetcher = TransactionFetcher(standin.url, log=quiet)
+            monitor.swap_slots = asyncio.Semaphore(monitor.WALLET_MAX_CONCURRENT_SWAPS)
+            monitor.poll_lock = asyncio.Lock()
+            monitor.solana_client = FakeSolana()
+            monitor.supabase = FakeSupabase()
+            monitor.signature_store = SignatureStore(os.path.join(tmp, 'wallet_monitor.sqlite'), log=quiet)
+            
+            # The event loop must keep ticking while tweets are sent
+            gaps = []
+            async def heartbeat():
+                while True:
+                    before = time.perf_counter()
+                    await asyncio.sleep(0.01)
+                    gaps.append(time.perf_counter() - before)
+            ticker = asyncio.create_task(heartbeat())
+            
+            try:
+                started = time.perf_counter()
+                await monitor.poll_signatures()
+                elapsed = time.perf_counter() - started
+                
+                # Second poll: everything known, nothing sent twice
+                await monitor.poll_signatures()
+                
+                # A pushed signature the node can't return yet asks for a follow-up poll
+                events = asyncio.Queue()
+                await monitor.process_pushed_signature('1' * 88, time.monotonic(), events)
+                if events.qsize() != 1 or events.get_nowait()[0] is not None:
+                    raise AssertionError("unfetchable pushed signature should queue a follow-up poll")
+                return elapsed, max(gaps)
+            finally:
+                ticker.cancel()
+                await monitor.transaction_fetcher.close()
+                monitor.signature_store.close()
+                standin.stop()
+        
+        saved = (monitor.WALLET_ADDRESS, list(monitor.TWITTER_ACCOUNTS), monitor.transaction_fetcher,
+                 monitor.solana_client, monitor.supabase, monitor.signature_store, monitor.last_processed_signature,
+                 monitor.TX_FETCH_RETRY_DELAY, monitor.TX_FOLLOW_UP_POLL_DELAY, monitor.swap_slots, monitor.poll_lock)
+        monitor.WALLET_ADDRESS = WALLET
+        monitor.TX_FETCH_RETRY_DELAY = monitor.TX_FOLLOW_UP_POLL_DELAY = 0.01
+        monitor.TWITTER_ACCOUNTS[:] = accounts
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                elapsed, max_gap = asyncio.run(asyncio.wait_for(scenario(tmp), timeout=30))
+            supabase = monitor.supabase
+        finally:
+            (monitor.WALLET_ADDRESS, accounts_before, monitor.transaction_fetcher, monitor.solana_client,
+             monitor.supabase, monitor.signature_store, monitor.last_processed_signature,
+             monitor.TX_FETCH_RETRY_DELAY, monitor.TX_FOLLOW_UP_POLL_DELAY, monitor.swap_slots, monitor.poll_lock) = saved
+            monitor.TWITTER_ACCOUNTS[:] = accounts_before
+        
+        sent = sorted(tweet for account in accounts for tweet in account["client"].sent)
+        if sent != sorted(f"tweet-COIN{i}" for i in range(swaps)) or supabase.updates != ['sent'] * swaps:
+            print(f"❌ Expected one reply per swap, got {sent}")
+            return False
+        
+        # Serially each swap costs 4 DB round trips (200 ms) plus a 200 ms tweet
+        serial_estimate = swaps * 0.4
+        if elapsed > serial_estimate / 2 or FakeTwitter.max_active < 2:
+            print(f"❌ Swaps should overlap: {elapsed:.2f}s for {swaps} (serial ~{serial_estimate:.1f}s)")
+            return False
+        if max_gap > 0.1:
+            print(f"❌ Event loop blocked for {max_gap * 1000:.0f} ms")
+            return False
+        
+        print(f"✅ {swaps} swaps replied in {elapsed:.2f}s (serial ~{serial_estimate:.1f}s), "
+              f"{FakeTwitter.max_active} tweets in flight at once")
+        print(f"✅ Event loop never blocked more than {max_gap * 1000:.0f} ms; second poll sent nothing")
+        print("✅ Pushed signature the node couldn't return queued a follow-up poll")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Concurrent swap test error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 WALLET MONITOR REPLY BOT TEST SUITE")
@@ -234,7 +847,14 @@ def main():
         ("Twitter Accounts", test_twitter_accounts),
         ("Supabase Tables", test_supabase_tables),
         ("Monitor Init", test_wallet_monitor_initialization),
-        ("Reply Logic", test_reply_dry_run)
+        ("Reply Logic", test_reply_dry_run),
+        ("Wallet Subscription", test_wallet_subscription),
+        ("Signature Drain", test_signature_drain),
+        ("Signature Store", test_signature_store),
+        ("Transaction Fetching", test_transaction_fetching),
+        ("Swap Classifier", test_swap_classifier),
+        ("Token Metadata", test_token_metadata),
+        ("Concurrent Swaps", test_concurrent_swap_handling)
     ]
     
     results = []